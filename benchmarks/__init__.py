@@ -0,0 +1,8 @@
+"""
+Microbenchmarks de SincPro Python Compiler
+
+No forman parte del paquete distribuido; se ejecutan como módulos:
+
+    python -m benchmarks.bench_patterns
+    python -m benchmarks.bench_build run --save baseline.json
+"""
@@ -0,0 +1,293 @@
+"""
+Benchmark de extremo a extremo con baseline de regresión
+
+Genera un proyecto sintético y mide archivos/s y MB/s de compilar, comprimir,
+encriptar, descomprimir y desencriptar (mejor tiempo de varias repeticiones).
+`run --save` guarda los resultados como baseline JSON; `compare` vuelve a medir
+con la misma forma de proyecto (o lee otra medición guardada) y termina con
+código 1 si alguna métrica es más lenta que el baseline más allá del umbral.
+
+    python -m benchmarks.bench_build run --layout odoo --files 2000 --save base.json
+    python -m benchmarks.bench_build compare base.json [--threshold 10]
+"""
+
+import argparse
+import json
+import logging
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from sincpro_py_compiler.infrastructure.compression_service import ZipCompressionService
+from sincpro_py_compiler.infrastructure.encryption_service import CRYPTO_AVAILABLE
+from sincpro_py_compiler.infrastructure.python_compiler import PythonCompiler
+from sincpro_py_compiler.infrastructure.tree_walker import iter_files
+
+from .project_generator import (
+    ProjectSpec,
+    add_spec_arguments,
+    generate_project,
+    spec_from_args,
+)
+
+BASELINE_VERSION = 1
+PASSWORD = "benchmark"
+# Métricas de throughput comparadas contra el baseline
+THROUGHPUTS = ("files_per_sec", "mb_per_sec")
+
+
+class Measurement(NamedTuple):
+    """Mejor tiempo de una operación y el volumen que procesó"""
+
+    seconds: float
+    files: int
+    total_bytes: int
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "seconds": self.seconds,
+            "files": self.files,
+            "bytes": self.total_bytes,
+            "files_per_sec": self.files / self.seconds,
+            "mb_per_sec": self.total_bytes / 1e6 / self.seconds,
+        }
+
+
+class Regression(NamedTuple):
+    operation: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """Variación porcentual (negativa = más lento)"""
+        return (self.current / self.baseline - 1) * 100
+
+
+def tree_size(root: Path) -> Measurement:
+    """Archivos y bytes de un árbol, con tiempo cero"""
+    files = 0
+    total = 0
+    for entry in iter_files(root):
+        files += 1
+        total += entry.stat().st_size
+    return Measurement(0.0, files, total)
+
+
+def best_of(repeat: int, setup: Callable[[], None], run: Callable[[], bool]) -> float:
+    """Mejor tiempo de `repeat` ejecuciones; `setup` no se mide"""
+    timings = []
+    for _ in range(repeat):
+        setup()
+        started = time.perf_counter()
+        if not run():
+            raise RuntimeError("La operación medida falló")
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def run_benchmarks(
+    spec: ProjectSpec, repeat: int = 3, jobs: int = 1, work_dir: Optional[Path] = None
+) -> Dict[str, Measurement]:
+    """Genera el proyecto y mide cada operación"""
+    root = Path(tempfile.mkdtemp(prefix="sincpro_bench_build_", dir=work_dir))
+    source = root / "src"
+    compiled = root / "compiled"
+    extracted = root / "extracted"
+    results: Dict[str, Measurement] = {}
+
+    def clean(path: Path) -> Callable[[], None]:
+        return lambda: shutil.rmtree(path, ignore_errors=True)
+
+    try:
+        generate_project(source, spec)
+        compiler = PythonCompiler()
+        try:
+            seconds = best_of(
+                repeat,
+                clean(compiled),
+                lambda: compiler.compile_project(str(source), str(compiled), jobs=jobs),
+            )
+        finally:
+            compiler.shutdown_worker_pool()
+        results["compile"] = tree_size(source)._replace(seconds=seconds)
+        output = tree_size(compiled)
+
+        zip_file = root / "build.zip"
+        compression = ZipCompressionService()
+        seconds = best_of(
+            repeat,
+            lambda: zip_file.unlink(missing_ok=True),
+            lambda: compression.compress_directory(compiled, zip_file, PASSWORD),
+        )
+        results["compress"] = output._replace(seconds=seconds)
+        seconds = best_of(
+            repeat,
+            clean(extracted),
+            lambda: compression.decompress_file(zip_file, extracted, PASSWORD),
+        )
+        results["decompress"] = output._replace(seconds=seconds)
+
+        if CRYPTO_AVAILABLE:
+            from sincpro_py_compiler.infrastructure.encryption_service import (
+                SimpleEncryptionService,
+            )
+
+            enc_file = root / "build.enc"
+            encryption = SimpleEncryptionService()
+            seconds = best_of(
+                repeat,
+                lambda: enc_file.unlink(missing_ok=True),
+                lambda: encryption.encrypt_directory(compiled, enc_file, PASSWORD),
+            )
+            results["encrypt"] = output._replace(seconds=seconds)
+            seconds = best_of(
+                repeat,
+                clean(extracted),
+                lambda: encryption.decrypt_file(enc_file, extracted, PASSWORD),
+            )
+            results["decrypt"] = output._replace(seconds=seconds)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+def to_baseline(spec: ProjectSpec, jobs: int, results: Dict[str, Measurement]) -> Dict:
+    return {
+        "version": BASELINE_VERSION,
+        "spec": spec._asdict(),
+        "jobs": jobs,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "metrics": {operation: m.to_dict() for operation, m in results.items()},
+    }
+
+
+def find_regressions(baseline: Dict, current: Dict, threshold: float) -> List[Regression]:
+    """Métricas de throughput que cayeron más de `threshold` por ciento"""
+    regressions = []
+    for operation, before in baseline["metrics"].items():
+        after = current["metrics"].get(operation)
+        if after is None:
+            continue
+        for metric in THROUGHPUTS:
+            if after[metric] < before[metric] * (1 - threshold / 100):
+                regressions.append(
+                    Regression(operation, metric, before[metric], after[metric])
+                )
+    return regressions
+
+
+def print_results(data: Dict, baseline: Optional[Dict] = None) -> None:
+    print(
+        f"  {'operación':<12}{'tiempo':>12}{'archivos/s':>14}{'MB/s':>10}"
+        + (f"{'vs baseline':>14}" if baseline else "")
+    )
+    for operation, metric in data["metrics"].items():
+        row = (
+            f"  {operation:<12}{metric['seconds'] * 1000:>9.0f} ms"
+            f"{metric['files_per_sec']:>14.0f}{metric['mb_per_sec']:>10.1f}"
+        )
+        before = baseline["metrics"].get(operation) if baseline else None
+        if before:
+            change = (metric["mb_per_sec"] / before["mb_per_sec"] - 1) * 100
+            row += f"{change:>+13.1f}%"
+        print(row)
+
+
+def _measure(args: argparse.Namespace, spec: ProjectSpec, jobs: int) -> Dict:
+    stats_root = Path(tempfile.mkdtemp(prefix="sincpro_bench_spec_"))
+    try:
+        stats = generate_project(stats_root, spec)
+    finally:
+        shutil.rmtree(stats_root)
+    print(
+        f"Proyecto {spec.layout}: {stats.files} archivos ({stats.modules} módulos, "
+        f"{stats.assets} assets), {stats.total_bytes / 1e6:.1f} MB; "
+        f"{args.repeat} repeticiones, jobs={jobs}"
+    )
+    results = run_benchmarks(spec, repeat=args.repeat, jobs=jobs, work_dir=args.work_dir)
+    return to_baseline(spec, jobs, results)
+
+
+def command_run(args: argparse.Namespace) -> int:
+    data = _measure(args, spec_from_args(args), args.jobs)
+    print_results(data)
+    if args.save:
+        args.save.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline guardado en {args.save}")
+    return 0
+
+
+def command_compare(args: argparse.Namespace) -> int:
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    if baseline.get("version") != BASELINE_VERSION:
+        print(f"❌ Versión de baseline no soportada: {baseline.get('version')}")
+        return 2
+    if args.current:
+        current = json.loads(args.current.read_text(encoding="utf-8"))
+        if current["spec"] != baseline["spec"]:
+            print("⚠️  Las mediciones usan proyectos distintos; la comparación no es fiable")
+    else:
+        # Medir de nuevo con la misma forma de proyecto que el baseline
+        current = _measure(args, ProjectSpec(**baseline["spec"]), baseline["jobs"])
+    print_results(current, baseline)
+
+    regressions = find_regressions(baseline, current, args.threshold)
+    for regression in regressions:
+        print(
+            f"❌ {regression.operation} {regression.metric}: {regression.baseline:.1f} -> "
+            f"{regression.current:.1f} ({regression.change:+.1f}%)"
+        )
+    if regressions:
+        print(f"{len(regressions)} métricas más lentas que el umbral de {args.threshold:g}%")
+        return 1
+    print(f"✅ Sin regresiones mayores a {args.threshold:g}%")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Medir y opcionalmente guardar baseline")
+    add_spec_arguments(run_parser)
+    run_parser.add_argument("-j", "--jobs", type=int, default=1)
+    run_parser.add_argument(
+        "--save", type=Path, help="Archivo JSON donde guardar el baseline"
+    )
+
+    compare_parser = subparsers.add_parser(
+        "compare", help="Comparar contra un baseline; código 1 si hay regresiones"
+    )
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument(
+        "current", type=Path, nargs="?", help="Medición guardada (default: medir de nuevo)"
+    )
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="Caída de throughput tolerada en por ciento (default: 10)",
+    )
+
+    for subparser in (run_parser, compare_parser):
+        subparser.add_argument("--repeat", type=int, default=3)
+        subparser.add_argument(
+            "--work-dir", type=Path, help="Directorio temporal (para medir otro disco)"
+        )
+    args = parser.parse_args()
+
+    # Los servicios registran cada operación; solo interesan los errores
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s - %(message)s")
+    commands = {"run": command_run, "compare": command_compare}
+    sys.exit(commands[args.command](args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Benchmark del contenedor .enc por bloques con distinto número de hilos
+
+Mide MB/s de sellar y abrir un contenido en memoria con ChunkEncryptor y
+ChunkDecryptor (sin tar ni gzip, que son de un solo hilo) para cada valor de
+--threads, y la aceleración respecto del primero. Con `--files` mide además
+encrypt_directory / decrypt_file completos sobre un proyecto sintético.
+
+    python -m benchmarks.bench_crypto [--mb 256] [--threads 1 2 4 8] [--files 2000]
+"""
+
+import argparse
+import io
+import logging
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple
+
+from sincpro_py_compiler.infrastructure.encryption_service import CRYPTO_AVAILABLE
+
+from .project_generator import ProjectSpec, generate_project
+
+
+class Throughput(NamedTuple):
+    """MB/s de encriptar y desencriptar con un número de hilos"""
+
+    threads: int
+    encrypt_mb_s: float
+    decrypt_mb_s: float
+
+
+class _NullSink:
+    """Destino que descarta lo escrito: mide solo el cifrado"""
+
+    def write(self, data: bytes) -> int:
+        return len(data)
+
+
+def best_seconds(repeat: int, run: Callable[[], None]) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def measure_container(
+    data: bytes, threads_list: List[int], repeat: int = 3, chunk_size: int = 0
+) -> List[Throughput]:
+    """Sella y abre `data` en memoria con cada número de hilos"""
+    from sincpro_py_compiler.infrastructure.encrypted_stream import (
+        CHUNK_SIZE,
+        ChunkDecryptor,
+        ChunkEncryptor,
+        read_header,
+    )
+
+    key = os.urandom(32)
+    chunk_size = chunk_size or CHUNK_SIZE
+    write_size = 64 * 1024  # Lo que escribe tarfile en cada llamada
+    results = []
+    for threads in threads_list:
+
+        def encrypt(sink) -> None:
+            encryptor = ChunkEncryptor(sink, key, {}, chunk_size=chunk_size, threads=threads)
+            view = memoryview(data)
+            for offset in range(0, len(data), write_size):
+                encryptor.write(view[offset : offset + write_size])
+            encryptor.close()
+
+        sealed = io.BytesIO()
+        encrypt(sealed)
+
+        def decrypt() -> None:
+            stream = io.BytesIO(sealed.getvalue())
+            metadata, header = read_header(stream)
+            decryptor = ChunkDecryptor(stream, key, metadata, header, threads=threads)
+            try:
+                total = 0
+                while block := decryptor.read(write_size):
+                    total += len(block)
+                decryptor.verify_end()
+            finally:
+                decryptor.close()
+            if total != len(data):
+                raise RuntimeError("El contenido desencriptado no coincide")
+
+        megabytes = len(data) / 1e6
+        results.append(
+            Throughput(
+                threads,
+                megabytes / best_seconds(repeat, lambda: encrypt(_NullSink())),
+                megabytes / best_seconds(repeat, decrypt),
+            )
+        )
+    return results
+
+
+def measure_directory(
+    spec: ProjectSpec, threads_list: List[int], repeat: int = 3
+) -> Dict[int, Throughput]:
+    """encrypt_directory / decrypt_file completos (incluye tar y gzip)"""
+    from sincpro_py_compiler.infrastructure.encryption_service import SimpleEncryptionService
+
+    root = Path(tempfile.mkdtemp(prefix="sincpro_bench_crypto_"))
+    results = {}
+    try:
+        stats = generate_project(root / "src", spec)
+        megabytes = stats.total_bytes / 1e6
+        enc_file = root / "build.enc"
+        for threads in threads_list:
+            service = SimpleEncryptionService(crypto_threads=threads)
+
+            def encrypt() -> None:
+                if not service.encrypt_directory(root / "src", enc_file, "benchmark"):
+                    raise RuntimeError("La encriptación falló")
+
+            def decrypt() -> None:
+                shutil.rmtree(root / "out", ignore_errors=True)
+                if not service.decrypt_file(enc_file, root / "out", "benchmark"):
+                    raise RuntimeError("La desencriptación falló")
+
+            results[threads] = Throughput(
+                threads,
+                megabytes / best_seconds(repeat, encrypt),
+                megabytes / best_seconds(repeat, decrypt),
+            )
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+def print_table(title: str, rows: List[Throughput]) -> None:
+    print(title)
+    print(f"  {'hilos':<8}{'encriptar MB/s':>16}{'x':>7}{'desencriptar MB/s':>20}{'x':>7}")
+    base = rows[0]
+    for row in rows:
+        print(
+            f"  {row.threads:<8}{row.encrypt_mb_s:>16.0f}"
+            f"{row.encrypt_mb_s / base.encrypt_mb_s:>7.2f}"
+            f"{row.decrypt_mb_s:>20.0f}{row.decrypt_mb_s / base.decrypt_mb_s:>7.2f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mb", type=int, default=256, help="Tamaño del contenido en MB")
+    parser.add_argument(
+        "--threads",
+        type=int,
+        nargs="+",
+        default=sorted({1, 2, 4, os.cpu_count() or 1}),
+    )
+    parser.add_argument(
+        "--files", type=int, default=0, help="Medir también un proyecto de N archivos"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if not CRYPTO_AVAILABLE:
+        parser.error("Se requiere cryptography: pip install cryptography")
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s - %(message)s")
+
+    print(f"{os.cpu_count()} CPUs")
+    data = os.urandom(args.mb * 1024 * 1024)
+    print_table(
+        f"Contenedor en memoria ({args.mb} MB)",
+        measure_container(data, args.threads, args.repeat),
+    )
+    if args.files:
+        spec = ProjectSpec(files=args.files)
+        results = measure_directory(spec, args.threads, args.repeat)
+        print_table(
+            f"encrypt_directory / decrypt_file ({args.files} archivos, con tar y gzip)",
+            [results[threads] for threads in args.threads],
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark de arranque en frío: importar desde el archivo protegido vs extraerlo
+
+Genera un proyecto Odoo sintético, lo compila a un .enc (o .zip) y mide, en
+un proceso nuevo por repetición, el tiempo hasta tener importados todos los
+módulos de una fracción de los addons:
+
+- extraer: decrypt_file de todo el archivo a un directorio temporal + import
+- archivo: install_archive (clave e índice) + import de solo esos módulos
+
+    python -m benchmarks.bench_import [--files 2000] [--fraction 0.1] [--method encrypt]
+"""
+
+import argparse
+import json
+import logging
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+from .project_generator import ProjectSpec, generate_project
+
+# Código que corre en el proceso hijo; imprime los segundos en JSON
+_CHILD = """
+import importlib, json, shutil, sys, tempfile, time
+from pathlib import Path
+archive, password, mode, modules = sys.argv[1], sys.argv[2], sys.argv[3], sys.argv[4:]
+started = time.perf_counter()
+if mode == "archivo":
+    from sincpro_py_compiler.infrastructure.archive_importer import install_archive
+    install_archive(archive, password)
+else:
+    from sincpro_py_compiler.infrastructure.security_manager import SecurityManager
+    target = Path(tempfile.mkdtemp(prefix="sincpro_bench_import_"))
+    if not SecurityManager().unprotect_code(Path(archive), target, password):
+        raise SystemExit("No se pudo extraer el archivo")
+    sys.path.insert(0, str(target))
+for name in modules:
+    importlib.import_module(name)
+print(json.dumps(time.perf_counter() - started))
+if mode == "extraer":
+    shutil.rmtree(target)
+"""
+
+MODES = ("extraer", "archivo")
+
+
+def select_modules(source_dir: Path, fraction: float) -> List[str]:
+    """Módulos (con notación de punto) de la primera fracción de los addons"""
+    addons = sorted(p for p in (source_dir / "addons").iterdir() if p.is_dir())
+    selected = addons[: max(1, round(len(addons) * fraction))]
+    modules = []
+    for addon in selected:
+        for path in sorted(addon.rglob("*.py")):
+            parts = path.relative_to(source_dir).with_suffix("").parts
+            if parts[-1] == "__init__":
+                parts = parts[:-1]
+            modules.append(".".join(parts))
+    return modules
+
+
+def measure_cold_start(
+    archive: Path, password: str, modules: List[str], repeat: int = 3
+) -> Dict[str, float]:
+    """Mejor tiempo (segundos) de cada modo, cada repetición en un proceso nuevo"""
+    results = {}
+    for mode in MODES:
+        timings = []
+        for _ in range(repeat):
+            process = subprocess.run(
+                [sys.executable, "-c", _CHILD, str(archive), password, mode, *modules],
+                capture_output=True,
+                text=True,
+            )
+            if process.returncode != 0:
+                raise RuntimeError(f"El proceso '{mode}' falló:\n{process.stderr}")
+            timings.append(json.loads(process.stdout.strip().splitlines()[-1]))
+        results[mode] = min(timings)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument(
+        "--fraction", type=float, default=0.1, help="Fracción de addons a importar"
+    )
+    parser.add_argument("--method", choices=["encrypt", "compress"], default="encrypt")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s - %(message)s")
+
+    from sincpro_py_compiler.infrastructure.python_compiler import PythonCompiler
+
+    root = Path(tempfile.mkdtemp(prefix="sincpro_bench_import_"))
+    compiler = PythonCompiler()
+    try:
+        generate_project(root / "src", ProjectSpec(files=args.files, layout="odoo"))
+        result = compiler.compile_project_to_archive(
+            str(root / "src"), str(root / "dist"), "benchmark", args.method
+        )
+        if not result:
+            raise SystemExit(f"El build falló: {result.error}")
+        modules = select_modules(root / "src", args.fraction)
+        timings = measure_cold_start(
+            Path(result.output_dir), "benchmark", modules, args.repeat
+        )
+    finally:
+        compiler.shutdown_worker_pool()
+        shutil.rmtree(root, ignore_errors=True)
+
+    print(
+        f"{args.files} archivos ({result.counts.get('compiled', 0)} compilados), "
+        f"importando {len(modules)} módulos ({args.fraction:.0%} de los addons)"
+    )
+    for mode in MODES:
+        print(
+            f"  {mode:<10}{timings[mode] * 1000:>10.1f} ms"
+            f"{timings['extraer'] / timings[mode]:>8.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
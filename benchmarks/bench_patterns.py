@@ -0,0 +1,105 @@
+"""
+Microbenchmark del matcher de patrones de exclusión y copia fiel
+
+Compara el matcher precompilado con la evaluación patrón por patrón sobre la
+ruta absoluta (implementación anterior), con 100+ patrones y rutas de un
+proyecto sintético.
+
+    python -m benchmarks.bench_patterns [--patterns 150] [--paths 20000]
+"""
+
+import argparse
+import random
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from sincpro_py_compiler.infrastructure.compiler_service import CompilerService
+from sincpro_py_compiler.infrastructure.pattern_matcher import PatternMatcher
+
+ROOT = Path("/home/dev/proyectos/cliente")
+
+
+def legacy_should_exclude(file_path: Path, exclude_patterns: List[str]) -> bool:
+    """Evaluación lineal sobre la ruta absoluta, como antes del matcher"""
+    file_str = str(file_path)
+    for pattern in exclude_patterns:
+        if pattern.endswith("/"):
+            if f"/{pattern}" in file_str or file_str.startswith(pattern):
+                return True
+        elif "*" in pattern:
+            if pattern.startswith("*."):
+                if file_str.endswith(pattern[1:]):
+                    return True
+        else:
+            if file_path.name == pattern or file_str.endswith(f"/{pattern}"):
+                return True
+    return False
+
+
+def generate_patterns(count: int, rng: random.Random) -> List[str]:
+    """Patrones de un template más reglas personalizadas hasta `count`"""
+    patterns = list(CompilerService().get_exclude_patterns("django"))
+    kinds = [
+        lambda i: f"*.ext{i}",
+        lambda i: f"generado_{i}/",
+        lambda i: f"config/secreto_{i}.py",
+        lambda i: f"temporal_{i}.txt",
+        lambda i: f"modulo_{i}/datos/",
+    ]
+    while len(patterns) < count:
+        patterns.append(rng.choice(kinds)(len(patterns)))
+    return patterns
+
+
+def generate_paths(count: int, rng: random.Random) -> List[Path]:
+    """Rutas con la forma de un proyecto real (paquetes, datos, algún excluido)"""
+    packages = [f"app_{i}" for i in range(40)] + ["static", "migrations", "venv"]
+    names = ["models.py", "views.py", "urls.py", "logo.png", "data.json", "run.log"]
+    paths = []
+    for _ in range(count):
+        depth = rng.randint(1, 5)
+        parts = [rng.choice(packages) for _ in range(depth)]
+        paths.append(ROOT.joinpath(*parts, rng.choice(names)))
+    return paths
+
+
+def measure(label: str, function: Callable[[Path], bool], paths: List[Path]) -> float:
+    started = time.perf_counter()
+    for path in paths:
+        function(path)
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<28} {elapsed * 1e9 / len(paths):>10.0f} ns/ruta")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--patterns", type=int, default=150)
+    parser.add_argument("--paths", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    patterns = generate_patterns(args.patterns, rng)
+    paths = generate_paths(args.paths, rng)
+    service = CompilerService()
+
+    started = time.perf_counter()
+    matcher = PatternMatcher(patterns)
+    compile_ms = (time.perf_counter() - started) * 1000
+
+    print(f"{len(patterns)} patrones, {len(paths)} rutas (compilación: {compile_ms:.2f} ms)")
+    legacy = measure(
+        "lineal (ruta absoluta)", lambda p: legacy_should_exclude(p, patterns), paths
+    )
+    matched = measure(
+        "matcher (ruta relativa)",
+        lambda p: service.should_exclude(p, matcher, root=ROOT),
+        paths,
+    )
+    print(f"  aceleración: {legacy / matched:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark del recorrido de directorios con latencia de syscall inyectada
+
+Simula un sistema de archivos de red (NFS) agregando una espera fija a cada
+llamada a os.scandir y compara el recorrido secuencial con el recorrido con
+hilos, sobre un árbol sintético.
+
+    python -m benchmarks.bench_walk [--dirs 400] [--latency-ms 0 1 5] [--threads 1 4 16]
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterator, List
+
+from sincpro_py_compiler.infrastructure.tree_walker import iter_files
+
+
+def generate_tree(root: Path, dirs: int, files_per_dir: int, rng: random.Random) -> None:
+    """Árbol con `dirs` directorios anidados al azar y algunos archivos en cada uno"""
+    created: List[Path] = [root]
+    for i in range(dirs):
+        directory = rng.choice(created) / f"paquete_{i}"
+        directory.mkdir()
+        created.append(directory)
+    for directory in created:
+        for j in range(files_per_dir):
+            (directory / f"modulo_{j}.py").write_text("")
+
+
+@contextlib.contextmanager
+def injected_latency(seconds: float) -> Iterator[None]:
+    """Agrega `seconds` de espera a cada os.scandir mientras dura el bloque"""
+    original = os.scandir
+
+    def slow_scandir(path="."):  # type: ignore[no-untyped-def]
+        time.sleep(seconds)
+        return original(path)
+
+    os.scandir = slow_scandir  # type: ignore[assignment]
+    try:
+        yield
+    finally:
+        os.scandir = original  # type: ignore[assignment]
+
+
+def measure(root: Path, threads: int) -> float:
+    started = time.perf_counter()
+    for _ in iter_files(root, threads=threads):
+        pass
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dirs", type=int, default=400)
+    parser.add_argument("--files-per-dir", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, nargs="+", default=[0, 1, 5])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp(prefix="sincpro_bench_walk_"))
+    try:
+        generate_tree(root, args.dirs, args.files_per_dir, random.Random(args.seed))
+        expected = [entry.relative_path for entry in iter_files(root)]
+        print(f"{args.dirs + 1} directorios, {len(expected)} archivos")
+
+        print(f"  {'latencia':<10}" + "".join(f"{f'{t} hilo(s)':>20}" for t in args.threads))
+        for latency in args.latency_ms:
+            with injected_latency(latency / 1000):
+                # El orden debe ser idéntico con cualquier número de hilos
+                for threads in args.threads:
+                    walked = [
+                        entry.relative_path for entry in iter_files(root, threads=threads)
+                    ]
+                    assert walked == expected
+                timings = [measure(root, threads) for threads in args.threads]
+            cells = [f"{t * 1000:.0f} ms ({timings[0] / t:.1f}x)" for t in timings]
+            print(f"  {f'{latency:g} ms':<10}" + "".join(f"{cell:>20}" for cell in cells))
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
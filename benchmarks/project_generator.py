@@ -0,0 +1,268 @@
+"""
+Generador de proyectos sintéticos para los benchmarks
+
+Crea árboles con la forma de un proyecto real: módulos Python con clases y
+funciones de tamaño configurable y una mezcla de assets (texto compresible y
+binarios aleatorios). Además del layout genérico produce addons de Odoo y
+proyectos Django. El árbol es determinista para una misma semilla.
+
+    python -m benchmarks.project_generator ./proyecto --layout odoo --files 2000
+"""
+
+import argparse
+import random
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+LAYOUTS = ("generic", "odoo", "django")
+
+# Extensiones de assets binarios (contenido aleatorio, no compresible)
+BINARY_EXTENSIONS = {"png", "jpg", "woff2", "ico"}
+
+
+class ProjectSpec(NamedTuple):
+    """Forma del proyecto a generar"""
+
+    files: int = 500
+    depth: int = 3
+    module_lines: int = 80
+    asset_ratio: float = 0.3
+    asset_kb: int = 8
+    layout: str = "generic"
+    seed: int = 7
+
+
+class ProjectStats(NamedTuple):
+    """Resultado de generar un proyecto"""
+
+    files: int
+    modules: int
+    assets: int
+    total_bytes: int
+
+
+def module_source(index: int, lines: int, rng: random.Random) -> str:
+    """Módulo Python de unas `lines` líneas con clases, funciones y constantes"""
+    out = [
+        f'"""Módulo sintético {index}"""',
+        "",
+        "import os",
+        "from typing import Dict, List",
+        "",
+        f"LIMITE_{index} = {rng.randint(1, 10_000)}",
+        "",
+    ]
+    block = 0
+    while len(out) < lines:
+        if block % 3 == 0:
+            out += [
+                "",
+                f"class Modelo{index}_{block}:",
+                f'    """Modelo {block} del módulo {index}"""',
+                "",
+                "    def __init__(self, valores: List[int]):",
+                "        self.valores = valores",
+                f"        self.nombre = 'modelo_{index}_{block}'",
+                "",
+                "    def total(self) -> int:",
+                "        return sum(v for v in self.valores if v > 0)",
+                "",
+                "    def indice(self) -> Dict[str, int]:",
+                "        return {str(i): v for i, v in enumerate(self.valores)}",
+            ]
+        else:
+            operation = rng.choice(["+", "-", "*", "//"])
+            out += [
+                "",
+                f"def calcular_{index}_{block}(x: int, y: int = {rng.randint(1, 99)}) -> int:",
+                f'    """Operación {block}"""',
+                f"    if x > LIMITE_{index}:",
+                f"        return x {operation} y",
+                "    resultado = 0",
+                "    for i in range(x):",
+                "        resultado += i % (y or 1)",
+                "    return resultado + len(os.sep)",
+            ]
+        block += 1
+    return "\n".join(out[:lines]) + "\n"
+
+
+def asset_content(extension: str, size: int, rng: random.Random) -> bytes:
+    """Contenido de un asset: bytes aleatorios si es binario, texto repetitivo si no"""
+    if extension in BINARY_EXTENSIONS:
+        return rng.randbytes(size)
+    words = ["registro", "campo", "valor", "vista", "estilo", "traducción", "dato"]
+    text = []
+    length = 0
+    while length < size:
+        line = " ".join(rng.choice(words) for _ in range(8)) + "\n"
+        text.append(line)
+        length += len(line)
+    return "".join(text).encode("utf-8")[:size]
+
+
+def _nested(rng: random.Random, depth: int, prefix: str) -> str:
+    """Ruta de 0 a `depth` subpaquetes"""
+    return "".join(f"{prefix}_{rng.randrange(4)}/" for _ in range(rng.randint(0, depth)))
+
+
+def _generic_paths(rng: random.Random, spec: ProjectSpec, index: int) -> Tuple[str, str]:
+    package = "app/" + _nested(rng, max(spec.depth - 1, 0), "paquete")
+    module = f"{package}modulo_{index}.py"
+    extension = rng.choice(["json", "txt", "csv", "png", "jpg"])
+    asset = f"{package}recursos/recurso_{index}.{extension}"
+    return module, asset
+
+
+def _odoo_paths(rng: random.Random, spec: ProjectSpec, index: int) -> Tuple[str, str]:
+    addon = f"addons/addon_{rng.randrange(max(spec.files // 60, 1))}/"
+    folder = rng.choice(["models", "models", "wizard", "controllers", "report"])
+    module = f"{addon}{folder}/{_nested(rng, max(spec.depth - 2, 0), 'sub')}m_{index}.py"
+    asset = addon + rng.choice(
+        [
+            f"views/vista_{index}.xml",
+            f"data/datos_{index}.xml",
+            f"security/acceso_{index}.csv",
+            f"static/src/js/widget_{index}.js",
+            f"static/src/scss/estilo_{index}.scss",
+            f"static/description/imagen_{index}.png",
+            f"i18n/es_{index}.po",
+        ]
+    )
+    return module, asset
+
+
+def _django_paths(rng: random.Random, spec: ProjectSpec, index: int) -> Tuple[str, str]:
+    app_name = f"app_{rng.randrange(max(spec.files // 50, 1))}"
+    app = f"apps/{app_name}/"
+    module = app + rng.choice(
+        [
+            f"{_nested(rng, max(spec.depth - 2, 0), 'sub')}modulo_{index}.py",
+            f"views/vista_{index}.py",
+            f"migrations/{index:04d}_auto.py",
+            f"tests/test_{index}.py",
+        ]
+    )
+    asset = app + rng.choice(
+        [
+            f"templates/{app_name}/pagina_{index}.html",
+            f"static/{app_name}/css/estilo_{index}.css",
+            f"static/{app_name}/js/script_{index}.js",
+            f"static/{app_name}/img/imagen_{index}.png",
+            f"fixtures/datos_{index}.json",
+        ]
+    )
+    return module, asset
+
+
+_PATHS: Dict[str, Callable[[random.Random, ProjectSpec, int], Tuple[str, str]]] = {
+    "generic": _generic_paths,
+    "odoo": _odoo_paths,
+    "django": _django_paths,
+}
+
+
+def _fixed_files(spec: ProjectSpec, packages: List[str]) -> Dict[str, str]:
+    """Archivos propios del layout: manifests, settings, __init__.py"""
+    files = {f"{package}/__init__.py": "" for package in packages}
+    if spec.layout == "odoo":
+        for addon in {p.split("/")[1] for p in packages if p.startswith("addons/")}:
+            files[f"addons/{addon}/__manifest__.py"] = (
+                f'{{"name": "{addon}", "version": "17.0.1.0.0", "depends": ["base"]}}\n'
+            )
+            files[f"addons/{addon}/__init__.py"] = "from . import models\n"
+    elif spec.layout == "django":
+        files["manage.py"] = "import sys\n\nif __name__ == '__main__':\n    print(sys.argv)\n"
+        files["config/__init__.py"] = ""
+        files["config/settings.py"] = "DEBUG = False\nINSTALLED_APPS = []\n"
+        files["config/urls.py"] = "urlpatterns = []\n"
+        files["config/wsgi.py"] = "application = None\n"
+    return files
+
+
+def generate_project(root: Path, spec: ProjectSpec) -> ProjectStats:
+    """Genera en `root` un proyecto con la forma de `spec`"""
+    if spec.layout not in LAYOUTS:
+        raise ValueError(f"Layout no válido: {spec.layout} (opciones: {', '.join(LAYOUTS)})")
+    rng = random.Random(spec.seed)
+    paths = _PATHS[spec.layout]
+    written: Dict[str, bytes] = {}
+    modules = 0
+
+    for index in range(spec.files):
+        module, asset = paths(rng, spec, index)
+        if rng.random() < spec.asset_ratio:
+            extension = asset.rsplit(".", 1)[-1]
+            written[asset] = asset_content(extension, spec.asset_kb * 1024, rng)
+        else:
+            written[module] = module_source(index, spec.module_lines, rng).encode("utf-8")
+            modules += 1
+
+    # Cada directorio con módulos es un paquete
+    packages = sorted(
+        {path.rsplit("/", 1)[0] for path in written if path.endswith(".py") and "/" in path}
+    )
+    for path, text in _fixed_files(spec, packages).items():
+        written.setdefault(path, text.encode("utf-8"))
+
+    for path, content in written.items():
+        target = root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content)
+
+    return ProjectStats(
+        files=len(written),
+        modules=modules,
+        assets=sum(1 for path in written if not path.endswith(".py")),
+        total_bytes=sum(len(content) for content in written.values()),
+    )
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser) -> None:
+    """Argumentos de línea de comandos que definen un ProjectSpec"""
+    defaults = ProjectSpec()
+    parser.add_argument("--layout", choices=LAYOUTS, default=defaults.layout)
+    parser.add_argument("--files", type=int, default=defaults.files)
+    parser.add_argument("--depth", type=int, default=defaults.depth)
+    parser.add_argument(
+        "--module-lines", type=int, default=defaults.module_lines, help="Líneas por módulo"
+    )
+    parser.add_argument(
+        "--asset-ratio",
+        type=float,
+        default=defaults.asset_ratio,
+        help="Fracción de archivos que son assets (0-1)",
+    )
+    parser.add_argument(
+        "--asset-kb", type=int, default=defaults.asset_kb, help="Tamaño de cada asset en KB"
+    )
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def spec_from_args(args: argparse.Namespace) -> ProjectSpec:
+    return ProjectSpec(
+        files=args.files,
+        depth=args.depth,
+        module_lines=args.module_lines,
+        asset_ratio=args.asset_ratio,
+        asset_kb=args.asset_kb,
+        layout=args.layout,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("root", type=Path, help="Directorio donde crear el proyecto")
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+
+    stats = generate_project(args.root, spec_from_args(args))
+    print(
+        f"{stats.files} archivos ({stats.modules} módulos, {stats.assets} assets), "
+        f"{stats.total_bytes / 1e6:.1f} MB en {args.root}"
+    )
+
+
+if __name__ == "__main__":
+    main()
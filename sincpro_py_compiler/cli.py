@@ -3,6 +3,8 @@
 CLI para SincPro Python Compiler - Arquitectura limpia
 """
 
+from .infrastructure.compiler_service import CompilerService
+from .infrastructure.file_manager import FileManager
 from .infrastructure.python_compiler import PythonCompiler
 
 
@@ -32,6 +34,126 @@ def main():
         action="store_true",
         help=argparse.SUPPRESS,  # Ocultar esta opción hasta que esté completamente implementada
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Procesos para compilar en paralelo (0 = todos los CPUs, default: 1)",
+    )
+    parser.add_argument(
+        "--walk-threads",
+        type=int,
+        default=1,
+        help="Hilos para listar directorios en paralelo; acelera el recorrido en "
+        "sistemas de archivos de red como NFS (default: 1)",
+    )
+    parser.add_argument(
+        "--link-mode",
+        choices=["copy", "hardlink", "reflink", "auto"],
+        default="copy",
+        help="Cómo transferir los archivos que no se compilan: copy (copia en el kernel), "
+        "reflink (clon CoW en btrfs/XFS), hardlink (comparte inodo con la fuente) o auto "
+        "(reflink si es posible) (default: copy)",
+    )
+    parser.add_argument(
+        "--pyc-mode",
+        choices=["timestamp", "checked-hash", "unchecked-hash"],
+        help="Invalidación de los .pyc (PEP 552). unchecked-hash evita el stat de la "
+        "fuente al importar (default: timestamp, o checked-hash con SOURCE_DATE_EPOCH)",
+    )
+    parser.add_argument(
+        "--optimize",
+        type=int,
+        choices=[-1, 0, 1, 2],
+        default=-1,
+        help="Nivel de optimización: 0 ninguno, 1 elimina asserts, 2 además docstrings "
+        "(default: -1, el del intérprete, igual que la API y el daemon)",
+    )
+    parser.add_argument(
+        "--python",
+        nargs="+",
+        metavar="EXE",
+        help="Intérpretes destino (p. ej. python3.10 python3.12); cada uno compila en "
+        "un subdirectorio de salida por versión",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Recompilar solo lo que cambió desde el build anterior en el mismo directorio de salida",
+    )
+    parser.add_argument(
+        "--sync",
+        nargs="?",
+        const="mtime",
+        choices=["mtime", "checksum"],
+        help="Sincronizar la salida al estilo rsync: no copiar archivos idénticos "
+        "(por tamaño y mtime, o por hash con 'checksum') y eliminar los que ya no "
+        "tienen fuente",
+    )
+    parser.add_argument(
+        "--staged",
+        action="store_true",
+        help="Construir en un directorio de staging con journal (un build interrumpido "
+        "se reanuda) y publicarlo con un rename atómico al terminar",
+    )
+    parser.add_argument(
+        "--trace-out",
+        metavar="FILE",
+        help="Escribir una traza del build en formato Chrome trace (JSON) con cada fase "
+        "y la duración de cada archivo; se abre en chrome://tracing o ui.perfetto.dev",
+    )
+    parser.add_argument(
+        "--trace-top",
+        type=int,
+        default=10,
+        metavar="N",
+        help="Archivos más lentos a listar al terminar con --trace-out (default: 10)",
+    )
+    parser.add_argument(
+        "--report-out",
+        metavar="FILE",
+        help="Escribir el reporte del build en JSON: contadores y bytes por categoría, "
+        "errores, tiempos por fase, throughput y memoria",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reutilizar bytecode de la caché compartida de la máquina",
+    )
+    parser.add_argument(
+        "--cache-dir", help="Directorio de la caché de bytecode (implica --cache)"
+    )
+    parser.add_argument(
+        "--cache-max-size",
+        type=int,
+        default=1024,
+        help="Tamaño máximo de la caché en MB (default: 1024)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Tras compilar, observar el proyecto y recompilar solo lo que cambie",
+    )
+    parser.add_argument(
+        "--watch-polling",
+        action="store_true",
+        help="Usar sondeo en lugar de inotify para --watch",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Iniciar un daemon de compilación persistente en un socket Unix",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Enviar la compilación (y protección) al daemon iniciado con --serve",
+    )
+    parser.add_argument(
+        "--socket",
+        help="Socket Unix del daemon (default: $XDG_RUNTIME_DIR/sincpro-compile.sock)",
+    )
     parser.add_argument(
         "--list-templates", action="store_true", help="Mostrar templates disponibles y salir"
     )
@@ -49,6 +171,41 @@ def main():
     parser.add_argument(
         "--password", help="Contraseña/licencia para proteger el código compilado"
     )
+    parser.add_argument(
+        "--crypto-threads",
+        type=int,
+        default=1,
+        help="Con --encrypt, hilos que encriptan bloques en paralelo "
+        "(0 = todos los CPUs, default: 1)",
+    )
+    parser.add_argument(
+        "--kdf",
+        choices=["pbkdf2", "scrypt"],
+        help="Con --encrypt, KDF que deriva la clave de la contraseña (default: pbkdf2)",
+    )
+    parser.add_argument(
+        "--kdf-cost",
+        type=int,
+        help="Iteraciones de PBKDF2 o N de scrypt (potencia de 2); "
+        "ver --calibrate-kdf (default: 100000 / 32768)",
+    )
+    parser.add_argument(
+        "--keyring",
+        help="Archivo donde guardar las claves derivadas para no volver a derivarlas "
+        "(da acceso a los .enc sin contraseña: protegerlo como a la licencia)",
+    )
+    parser.add_argument(
+        "--calibrate-kdf",
+        type=float,
+        metavar="MS",
+        help="Medir el costo de --kdf que tarda MS milisegundos en esta máquina y salir",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Con --compress o --encrypt, compilar directo dentro del archivo protegido "
+        "sin escribir el directorio de salida intermedio",
+    )
     parser.add_argument(
         "--copy-faithful-file",
         help="Archivo con patrones de copia fiel (uno por línea)",
@@ -64,8 +221,32 @@ def main():
     else:
         logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
 
+    # Caché de bytecode compartida (opcional)
+    compile_cache = None
+    if args.cache or args.cache_dir:
+        from pathlib import Path
+
+        from .infrastructure.compile_cache import CompileCache
+
+        compile_cache = CompileCache(
+            cache_dir=Path(args.cache_dir) if args.cache_dir else None,
+            max_size=args.cache_max_size * 1024 * 1024,
+        )
+
+    # Traza del build (opcional)
+    tracer = None
+    if args.trace_out:
+        from .infrastructure.build_tracer import BuildTracer
+
+        tracer = BuildTracer()
+
     # Crear instancia del compilador (arquitectura actual)
-    compiler = PythonCompiler()
+    compiler = PythonCompiler(
+        compiler_service=CompilerService(optimize=args.optimize, pyc_mode=args.pyc_mode),
+        file_manager=FileManager(link_mode=args.link_mode),
+        compile_cache=compile_cache,
+        tracer=tracer,
+    )
 
     # Mostrar templates si se solicita
     if args.list_templates:
@@ -75,6 +256,24 @@ def main():
             print(f"  - {template}")
         return
 
+    if args.calibrate_kdf is not None:
+        _calibrate_kdf(args, parser)
+        return
+
+    if args.jobs < 0:
+        parser.error("--jobs debe ser 0 (todos los CPUs) o un número positivo")
+
+    if args.serve:
+        from .infrastructure.compile_daemon import CompileDaemon
+
+        daemon = CompileDaemon(socket_path=args.socket, compiler=compiler, jobs=args.jobs)
+        try:
+            daemon.serve_forever()
+        except (OSError, RuntimeError) as e:
+            print(f"❌ No se pudo iniciar el daemon: {e}")
+            exit(1)
+        return
+
     # Validar que se haya proporcionado el directorio fuente
     if not args.source:
         parser.error("Se requiere especificar el directorio fuente")
@@ -88,20 +287,101 @@ def main():
     if use_security and not args.password:
         parser.error("Se requiere --password cuando se usa --compress o --encrypt")
 
+    if args.walk_threads < 1:
+        parser.error("--walk-threads debe ser un número positivo")
+    if args.crypto_threads < 0:
+        parser.error("--crypto-threads debe ser 0 (todos los CPUs) o un número positivo")
+    if (args.kdf or args.kdf_cost is not None or args.keyring) and not args.encrypt:
+        parser.error("--kdf, --kdf-cost y --keyring requieren --encrypt")
+    try:
+        _kdf_params(args)
+    except ValueError as e:
+        parser.error(str(e))
+
     # Directorio de salida por defecto
     output_dir = args.output or "./compiled"
 
+    if args.trace_top < 0:
+        parser.error("--trace-top debe ser 0 o un número positivo")
+    if args.trace_out and (args.daemon or args.watch):
+        parser.error("--trace-out no se puede combinar con --daemon ni --watch")
+
+    if args.staged and (args.python or args.incremental or args.sync):
+        parser.error(
+            "--staged es un build completo: no se puede combinar con --python, "
+            "--incremental ni --sync"
+        )
+
+    if args.stream:
+        if not use_security:
+            parser.error("--stream requiere --compress o --encrypt")
+        if args.daemon or args.watch or args.python or args.staged:
+            parser.error(
+                "--stream no se puede combinar con --daemon, --watch, --python ni --staged"
+            )
+        if args.incremental or args.sync or args.remove_py:
+            parser.error("--stream genera el archivo completo: sin --incremental ni --sync")
+        _run_streamed(compiler, args, output_dir, tracer)
+        return
+
+    if args.daemon:
+        if args.watch:
+            parser.error("--daemon no se puede combinar con --watch")
+        _run_with_daemon(args, output_dir, use_security)
+        return
+
+    if args.watch:
+        if use_security or args.python or args.staged:
+            parser.error(
+                "--watch no se puede combinar con --compress, --encrypt, --python ni --staged"
+            )
+        success = compiler.watch_project(
+            source_dir=args.source,
+            output_dir=output_dir,
+            template=args.template,
+            exclude_file=args.exclude_file,
+            copy_faithful_file=args.copy_faithful_file,
+            jobs=args.jobs,
+            incremental=args.incremental,
+            walk_threads=args.walk_threads,
+            sync=args.sync,
+            polling=args.watch_polling,
+        )
+        if not success:
+            print("❌ Error en la compilación")
+            exit(1)
+        return
+
+    # Resolver intérpretes destino una sola vez
+    targets = None
+    if args.python:
+        from .infrastructure.interpreter_matrix import resolve_interpreters
+
+        try:
+            targets = resolve_interpreters(args.python)
+        except ValueError as e:
+            parser.error(str(e))
+
     # Ejecutar compilación
-    success = compiler.compile_project(
+    result = compiler.compile_project(
         source_dir=args.source,
         output_dir=output_dir,
         template=args.template,
         exclude_file=args.exclude_file,
         remove_py=args.remove_py,
         copy_faithful_file=args.copy_faithful_file,
+        jobs=args.jobs,
+        incremental=args.incremental,
+        python_targets=targets,
+        walk_threads=args.walk_threads,
+        sync=args.sync,
+        staged=args.staged,
     )
+    _show_report(result.to_dict(), args.report_out)
 
-    if not success:
+    if not result:
+        if tracer is not None:
+            _write_trace(tracer, args)
         print("❌ Error en la compilación")
         exit(1)
 
@@ -111,41 +391,242 @@ def main():
 
         from .infrastructure.security_manager import SecurityManager
 
-        security_manager = SecurityManager()
-
-        # Determinar método y archivo de salida
-        if args.compress:
-            method = "compress"
-            protected_file = Path(output_dir).parent / f"{Path(output_dir).name}.zip"
-        else:  # encrypt
-            method = "encrypt"
-            protected_file = Path(output_dir).parent / f"{Path(output_dir).name}.enc"
+        security_manager = SecurityManager(
+            tracer=tracer,
+            crypto_threads=args.crypto_threads,
+            kdf=_kdf_params(args),
+            keyring=Path(args.keyring) if args.keyring else None,
+        )
 
+        method = "compress" if args.compress else "encrypt"
         print(f"🔒 Aplicando protección ({method})...")
 
-        security_success = security_manager.protect_compiled_code(
-            compiled_dir=Path(output_dir),
-            output_file=protected_file,
-            password=args.password,
-            method=method,
-        )
-
-        if security_success:
+        for compiled_dir, protected_file in _protect_jobs(args, Path(output_dir), targets):
+            security_success = security_manager.protect_compiled_code(
+                compiled_dir=compiled_dir,
+                output_file=protected_file,
+                password=args.password,
+                method=method,
+            )
+            if not security_success:
+                if tracer is not None:
+                    _write_trace(tracer, args)
+                print("❌ Error aplicando protección")
+                exit(1)
             print(f"🎉 Código protegido exitosamente: {protected_file}")
 
-            # Opcional: eliminar directorio no protegido
-            import shutil
+        _remove_unprotected_output(output_dir)
+    else:
+        print("🎉 Compilación exitosa!")
+
+    if tracer is not None:
+        _write_trace(tracer, args)
+
+
+def _write_trace(tracer, args):
+    """Escribe la traza y lista los archivos más lentos del build"""
+    from pathlib import Path
+
+    try:
+        tracer.write(Path(args.trace_out))
+    except OSError as e:
+        print(f"⚠️  No se pudo escribir la traza: {e}")
+        return
+    print(f"⏱️  Traza escrita en {args.trace_out}")
+    slowest = tracer.slowest_files(args.trace_top)
+    if slowest:
+        print(f"🐢 {len(slowest)} archivos más lentos:")
+        for slow in slowest:
+            print(f"  {slow.duration_ms:8.2f} ms  {slow.category:<7}  {slow.path}")
+
+
+def _run_streamed(compiler, args, output_dir, tracer):
+    """Compila directo al archivo protegido, sin directorio intermedio"""
+    from pathlib import Path
+
+    method = "compress" if args.compress else "encrypt"
+    protected_file = _protect_jobs(args, Path(output_dir), None)[0][1]
+    print(f"🔒 Compilando directo al archivo protegido ({method})...")
+    result = compiler.compile_project_to_archive(
+        source_dir=args.source,
+        archive_file=str(protected_file),
+        password=args.password,
+        method=method,
+        template=args.template,
+        exclude_file=args.exclude_file,
+        copy_faithful_file=args.copy_faithful_file,
+        jobs=args.jobs,
+        walk_threads=args.walk_threads,
+        crypto_threads=args.crypto_threads,
+        kdf=_kdf_params(args),
+        keyring=Path(args.keyring) if args.keyring else None,
+    )
+    _show_report(result.to_dict(), args.report_out)
+    if tracer is not None:
+        _write_trace(tracer, args)
+    if not result:
+        print("❌ Error en la compilación")
+        exit(1)
+    print(f"🎉 Código protegido exitosamente: {result.output_dir}")
+
 
-            try:
-                shutil.rmtree(output_dir)
-                print(f"📁 Directorio temporal eliminado: {output_dir}")
-            except Exception as e:
-                print(f"⚠️  No se pudo eliminar directorio temporal: {e}")
-        else:
+def _show_report(report, report_out):
+    """Muestra el resumen del build y escribe el reporte JSON si se pidió"""
+    from pathlib import Path
+
+    from .infrastructure.build_report import format_summary, write_report
+
+    if report is None:
+        return
+    if report["success"]:
+        print(f"📊 {format_summary(report)}")
+    for failed in report["failed_files"]:
+        print(f"  ⚠️  {failed['path']} ({failed['stage']}): {failed['error']}")
+    if report_out:
+        write_report(report, Path(report_out))
+        print(f"📄 Reporte escrito en {report_out}")
+
+
+def _kdf_params(args):
+    """KdfParams de --kdf/--kdf-cost, o None para el default del servicio"""
+    from .infrastructure.key_derivation import DEFAULT_COSTS, KdfParams
+
+    if not args.kdf and args.kdf_cost is None:
+        return None
+    name = "scrypt" if args.kdf == "scrypt" else "pbkdf2-sha256"
+    params = KdfParams(
+        name, args.kdf_cost if args.kdf_cost is not None else DEFAULT_COSTS[name]
+    )
+    params.validate()
+    return params
+
+
+def _calibrate_kdf(args, parser):
+    """Muestra el costo de KDF que tarda --calibrate-kdf milisegundos"""
+    import time
+
+    from .infrastructure.encryption_service import CRYPTO_AVAILABLE
+    from .infrastructure.key_derivation import calibrate, derive_key
+
+    if not CRYPTO_AVAILABLE:
+        parser.error("Se requiere cryptography: pip install cryptography")
+    if args.calibrate_kdf <= 0:
+        parser.error("--calibrate-kdf debe ser un número positivo de milisegundos")
+
+    name = "scrypt" if args.kdf == "scrypt" else "pbkdf2-sha256"
+    print(f"⏱️  Calibrando {name} para ~{args.calibrate_kdf:.0f} ms...")
+    params = calibrate(name, args.calibrate_kdf)
+    started = time.perf_counter()
+    derive_key("calibracion", b"\0" * 16, params)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"🔑 {params}: {elapsed_ms:.0f} ms por derivación")
+    print(f"   Usar: --encrypt --kdf {args.kdf or 'pbkdf2'} --kdf-cost {params.cost}")
+
+
+def _protect_jobs(args, output_path, targets):
+    """Pares (directorio compilado, archivo protegido), uno por intérprete destino"""
+    extension = ".zip" if args.compress else ".enc"
+    if targets:
+        return [
+            (
+                output_path / target.cache_tag,
+                output_path.parent / f"{output_path.name}-{target.cache_tag}{extension}",
+            )
+            for target in targets
+        ]
+    return [(output_path, output_path.parent / f"{output_path.name}{extension}")]
+
+
+def _remove_unprotected_output(output_dir):
+    """Elimina el directorio compilado sin proteger"""
+    import shutil
+
+    try:
+        shutil.rmtree(output_dir)
+        print(f"📁 Directorio temporal eliminado: {output_dir}")
+    except Exception as e:
+        print(f"⚠️  No se pudo eliminar directorio temporal: {e}")
+
+
+def _run_with_daemon(args, output_dir, use_security):
+    """Envía la compilación y la protección al daemon y muestra su progreso"""
+    from pathlib import Path
+
+    from .infrastructure.compile_daemon import DaemonClient
+
+    client = DaemonClient(args.socket)
+
+    def show(level, message):
+        print(message)
+
+    # El daemon tiene otro directorio de trabajo: enviar rutas absolutas
+    def absolute(path):
+        return str(Path(path).resolve()) if path else None
+
+    compile_args = {
+        "source_dir": absolute(args.source),
+        "output_dir": absolute(output_dir),
+        "template": args.template,
+        "exclude_file": absolute(args.exclude_file),
+        "remove_py": args.remove_py,
+        "copy_faithful_file": absolute(args.copy_faithful_file),
+        "jobs": args.jobs,
+        "incremental": args.incremental,
+        "walk_threads": args.walk_threads,
+        "sync": args.sync,
+        "staged": args.staged,
+        "optimize": args.optimize,
+        "pyc_mode": args.pyc_mode,
+        "link_mode": args.link_mode,
+    }
+    if args.python:
+        compile_args["python_targets"] = args.python
+
+    try:
+        result = client.request("compile", compile_args, on_log=show)
+    except OSError as e:
+        print(f"❌ No se pudo conectar con el daemon en {client.socket_path}: {e}")
+        exit(1)
+    _show_report(result.get("report"), args.report_out)
+    if not result.get("success"):
+        print(f"❌ Error en la compilación {result.get('error', '')}".rstrip())
+        exit(1)
+
+    if not use_security:
+        print("🎉 Compilación exitosa!")
+        return
+
+    targets = None
+    if args.python:
+        from .infrastructure.interpreter_matrix import resolve_interpreters
+
+        targets = resolve_interpreters(args.python)
+
+    method = "compress" if args.compress else "encrypt"
+    kdf = _kdf_params(args)
+    print(f"🔒 Aplicando protección ({method})...")
+    for compiled_dir, protected_file in _protect_jobs(
+        args, Path(output_dir).resolve(), targets
+    ):
+        result = client.request(
+            "protect",
+            {
+                "compiled_dir": str(compiled_dir),
+                "output_file": str(protected_file),
+                "password": args.password,
+                "method": method,
+                "crypto_threads": args.crypto_threads,
+                "kdf": kdf.to_dict() if kdf else None,
+                "keyring": absolute(args.keyring),
+            },
+            on_log=show,
+        )
+        if not result.get("success"):
             print("❌ Error aplicando protección")
             exit(1)
-    else:
-        print("🎉 Compilación exitosa!")
+        print(f"🎉 Código protegido exitosamente: {protected_file}")
+
+    _remove_unprotected_output(output_dir)
 
 
 if __name__ == "__main__":
@@ -18,15 +18,41 @@ def main():
     )
 
     parser.add_argument("source", help="Archivo protegido a desproteger")
-    parser.add_argument("-o", "--output", required=True, help="Directorio de salida")
+    parser.add_argument("-o", "--output", help="Directorio de salida")
     parser.add_argument(
         "--password", required=True, help="Contraseña/licencia para desproteger"
     )
+    parser.add_argument(
+        "--list",
+        action="store_true",
+        help="Listar el contenido de un .enc sin extraerlo (solo desencripta el índice)",
+    )
+    parser.add_argument(
+        "--member",
+        action="append",
+        metavar="RUTA",
+        help="Extraer solo este archivo de un .enc (repetible)",
+    )
+    parser.add_argument(
+        "--crypto-threads",
+        type=int,
+        default=1,
+        help="Hilos que desencriptan bloques en paralelo (0 = todos los CPUs, default: 1)",
+    )
+    parser.add_argument(
+        "--keyring",
+        help="Archivo con claves derivadas guardadas: evita volver a derivar la clave "
+        "de los .enc que ya conoce",
+    )
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="Mostrar información detallada"
     )
 
     args = parser.parse_args()
+    if args.crypto_threads < 0:
+        parser.error("--crypto-threads debe ser 0 (todos los CPUs) o un número positivo")
+    if not args.list and not args.output:
+        parser.error("Se requiere -o/--output (salvo con --list)")
 
     # Configurar logging
     if args.verbose:
@@ -40,10 +66,17 @@ def main():
         print(f"❌ Archivo no encontrado: {source_file}")
         exit(1)
 
-    output_dir = Path(args.output)
-
     # Crear manager de seguridad
-    security_manager = SecurityManager()
+    security_manager = SecurityManager(
+        crypto_threads=args.crypto_threads,
+        keyring=Path(args.keyring) if args.keyring else None,
+    )
+
+    if args.list or args.member:
+        _run_members(security_manager, source_file, args)
+        return
+
+    output_dir = Path(args.output)
 
     # Detectar método de protección
     method = security_manager.detect_protection_method(source_file)
@@ -66,5 +99,35 @@ def main():
         exit(1)
 
 
+def _run_members(security_manager, source_file, args):
+    """--list y --member: operaciones sobre miembros sueltos de un .enc"""
+    from .infrastructure.encrypted_stream import ContainerError
+
+    if security_manager.detect_protection_method(source_file) != "encrypt":
+        print("❌ --list y --member solo aplican a archivos .enc")
+        exit(1)
+    service = security_manager.encryption_service
+    if service is None:
+        print("❌ Servicio de encriptación no disponible")
+        exit(1)
+
+    if args.list:
+        try:
+            members = service.list(source_file, args.password)
+        except (ContainerError, OSError) as e:
+            print(f"❌ {e}")
+            exit(1)
+        for member in members:
+            print(f"{member.length:>12}  {member.path}")
+        print(f"{len(members)} archivos")
+        return
+
+    print(f"🔓 Extrayendo {len(args.member)} archivo(s)...")
+    if not service.extract(source_file, Path(args.output), args.password, args.member):
+        print("❌ Error extrayendo. Verifique la contraseña y las rutas pedidas.")
+        exit(1)
+    print(f"🎉 Archivos extraídos en: {args.output}")
+
+
 if __name__ == "__main__":
     main()
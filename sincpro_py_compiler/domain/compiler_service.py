@@ -3,14 +3,24 @@ Dominio - Interfaces y contratos para el compilador de Python
 """
 
 from pathlib import Path
-from typing import List, Optional, Protocol
+from typing import TYPE_CHECKING, List, Optional, Protocol, Sequence, Union
+
+if TYPE_CHECKING:
+    from ..infrastructure.build_report import BuildResult
+    from ..infrastructure.interpreter_matrix import TargetInterpreter
 
 
 class CompilerServiceProtocol(Protocol):
     """Protocolo que define el contrato para servicios de compilación"""
 
-    def should_exclude(self, file_path: Path, exclude_patterns: List[str]) -> bool:
-        """Determina si un archivo debe ser excluido"""
+    def should_exclude(
+        self,
+        file_path: Path,
+        exclude_patterns: List[str],
+        root: Optional[Path] = None,
+        is_dir: bool = False,
+    ) -> bool:
+        """Determina si un archivo debe ser excluido (relativo a root si se indica)"""
         ...
 
     def get_exclude_patterns(
@@ -19,10 +29,20 @@ class CompilerServiceProtocol(Protocol):
         """Obtiene patrones de exclusión"""
         ...
 
-    def compile_python_file(self, source_file: Path, output_file: Path) -> bool:
+    def compile_python_file(
+        self,
+        source_file: Path,
+        output_file: Path,
+        dfile: Optional[str] = None,
+        source: Optional[bytes] = None,
+    ) -> bool:
         """Compila un archivo Python"""
         ...
 
+    def bytecode_variant(self) -> str:
+        """Opciones de compilación que determinan el contenido de los .pyc"""
+        ...
+
     def list_available_templates(self) -> List[str]:
         """Lista templates disponibles"""
         ...
@@ -35,6 +55,10 @@ class FileManagerProtocol(Protocol):
         """Copia un archivo preservando metadatos"""
         ...
 
+    def transfer_file(self, source: Path, destination: Path) -> Optional[str]:
+        """Copia o enlaza un archivo; retorna el método usado o None si falló"""
+        ...
+
     def create_directory(self, directory: Path) -> bool:
         """Crea un directorio si no existe"""
         ...
@@ -54,6 +78,30 @@ class ProjectCompilerProtocol(Protocol):
         template: str = "basic",
         exclude_file: Optional[str] = None,
         remove_py: bool = False,
-    ) -> bool:
-        """Compila un proyecto completo"""
+        copy_faithful_file: Optional[str] = None,
+        jobs: Optional[int] = 1,
+        incremental: bool = False,
+        python_targets: Optional[Sequence[Union[str, "TargetInterpreter"]]] = None,
+        walk_threads: int = 1,
+        sync: Optional[str] = None,
+        staged: bool = False,
+    ) -> "BuildResult":
+        """Compila un proyecto completo; el resultado se evalúa como bool"""
+        ...
+
+    async def compile_project_async(
+        self,
+        source_dir: str,
+        output_dir: str,
+        template: str = "basic",
+        exclude_file: Optional[str] = None,
+        remove_py: bool = False,
+        copy_faithful_file: Optional[str] = None,
+        jobs: Optional[int] = 1,
+        incremental: bool = False,
+        archive_file: Optional[str] = None,
+        password: Optional[str] = None,
+        method: str = "compress",
+    ) -> "BuildResult":
+        """Compila un proyecto completo como pipeline asíncrono"""
         ...
@@ -0,0 +1,156 @@
+"""
+Infraestructura - Build directo a archivo protegido
+
+    recorrido → compilación en memoria (workers) → cola acotada → ZIP / .enc
+
+Los .pyc se compilan en memoria y, junto con los assets, se entregan al writer
+del archivo protegido (ver SecurityManager.open_archive) a medida que se
+producen: no se escribe un árbol de salida intermedio que luego haya que leer y
+borrar. El writer corre en su propio hilo (zlib y el cifrado liberan el GIL), así
+la escritura del archivo se solapa con la compilación.
+"""
+
+import logging
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Deque, List, NamedTuple, Optional, Tuple
+
+from . import python_compiler
+from .python_compiler import BuildTask, TaskContext
+
+logger = logging.getLogger(__name__)
+
+# Entradas listas para el writer que pueden esperar en memoria
+QUEUE_SIZE = 256
+# Bloques en vuelo por worker: acota la memoria de .pyc pendientes de escribir
+CHUNKS_PER_WORKER = 4
+
+
+class ArchiveEntry(NamedTuple):
+    """Resultado de una tarea, listo para el writer"""
+
+    outcome: str  # "compiled" o "copied"
+    data: Optional[bytes]  # .pyc en memoria; None = agregar la fuente del disco
+    mtime: Optional[int]
+
+
+def produce_entries(
+    context: TaskContext, tasks: List[BuildTask]
+) -> List[Tuple[ArchiveEntry, List[logging.LogRecord]]]:
+    """Compila en memoria un bloque de tareas (en un worker o en el proceso actual)"""
+    collector = python_compiler._worker_collector
+    results = []
+    for task in tasks:
+        if collector is not None:
+            collector.records = []
+        compiled = None
+        if task.action == "compile":
+            compiled = context.compiler_service.compile_to_bytes(
+                task.source, task.relative_path
+            )
+        if compiled is not None:
+            entry = ArchiveEntry("compiled", *compiled)
+        else:
+            # Si falla la compilación, se archiva el archivo original
+            entry = ArchiveEntry("copied", None, None)
+        results.append((entry, collector.records if collector is not None else []))
+    return results
+
+
+class _ArchiveFeeder:
+    """Hilo que vuelca las entradas en el writer mientras el build sigue compilando"""
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.error: Optional[BaseException] = None
+        self._queue: "queue.Queue" = queue.Queue(QUEUE_SIZE)
+        self._thread = threading.Thread(target=self._run, name="sincpro-archive", daemon=True)
+        self._thread.start()
+
+    def put(self, task: BuildTask, entry: ArchiveEntry) -> None:
+        if self.error is not None:
+            raise RuntimeError(f"Error escribiendo el archivo: {self.error}")
+        self._queue.put((task, entry))
+
+    def finish(self) -> None:
+        """Espera a que se escriban todas las entradas encoladas"""
+        self._queue.put(None)
+        self._thread.join()
+        if self.error is not None:
+            raise RuntimeError(f"Error escribiendo el archivo: {self.error}")
+
+    def _run(self) -> None:
+        while (item := self._queue.get()) is not None:
+            if self.error is not None:
+                continue  # Vaciar la cola para no bloquear al productor
+            task, entry = item
+            try:
+                if entry.data is None:
+                    self.writer.add_file(task.relative_path, task.source)
+                else:
+                    arcname = Path(task.relative_path).with_suffix(".pyc").as_posix()
+                    self.writer.add_bytes(arcname, entry.data, entry.mtime)
+            except BaseException as e:
+                self.error = e
+
+
+def write_archive(
+    tasks: List[BuildTask],
+    context: TaskContext,
+    writer,
+    workers: int,
+    pool: Optional[Executor] = None,
+    on_done: Optional[Callable[[BuildTask, str], None]] = None,
+) -> List[Tuple[str, int]]:
+    """
+    Compila las tareas y las agrega al writer en el orden del recorrido
+
+    Con workers > 1 la compilación corre en un pool de procesos (el persistente
+    del compilador si se pasa) con un número acotado de bloques en vuelo.
+
+    Returns:
+        Resultado de cada tarea ("compiled" o "copied") y el tamaño del .pyc
+        agregado (0 para los archivos agregados desde el disco)
+    """
+    feeder = _ArchiveFeeder(writer)
+    outcomes: List[Tuple[str, int]] = []
+
+    def deliver(results: List[Tuple[ArchiveEntry, List[logging.LogRecord]]]) -> None:
+        for entry, records in results:
+            for record in records:
+                logging.getLogger(record.name).handle(record)
+            task = tasks[len(outcomes)]
+            feeder.put(task, entry)
+            outcomes.append((entry.outcome, len(entry.data or b"")))
+            if on_done is not None:
+                on_done(task, entry.outcome)
+
+    try:
+        if workers <= 1:
+            for task in tasks:
+                deliver(produce_entries(context, [task]))
+        else:
+            executor = pool or ProcessPoolExecutor(
+                max_workers=workers, initializer=python_compiler._init_worker
+            )
+            chunksize = max(1, min(64, len(tasks) // (workers * 16)))
+            chunks = [tasks[i : i + chunksize] for i in range(0, len(tasks), chunksize)]
+            in_flight: Deque[Future] = deque()
+            try:
+                for chunk in chunks:
+                    in_flight.append(executor.submit(produce_entries, context, chunk))
+                    if len(in_flight) >= workers * CHUNKS_PER_WORKER:
+                        deliver(in_flight.popleft().result())
+                while in_flight:
+                    deliver(in_flight.popleft().result())
+            finally:
+                for future in in_flight:
+                    future.cancel()
+                if executor is not pool:
+                    executor.shutdown()
+    finally:
+        feeder.finish()
+    return outcomes
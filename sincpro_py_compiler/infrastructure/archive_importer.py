@@ -0,0 +1,233 @@
+"""
+Infraestructura - Importar módulos directamente desde un archivo protegido
+
+ArchiveFinder se instala en sys.meta_path y resuelve los módulos y paquetes
+que están dentro de un .enc (versión 3) o de un ZIP generado por
+SecurityManager, sin extraerlos al disco:
+
+    from sincpro_py_compiler.infrastructure.archive_importer import install_archive
+
+    install_archive("dist.enc", os.environ["LICENCIA"])
+    import mi_app
+
+Al instalarse deriva la clave y lee el índice una sola vez; después cada import
+lee y desencripta solo el .pyc de ese módulo. Los .pyc deben ser de la misma
+versión de Python que los importa. pkgutil.get_data funciona con los assets
+del archivo (loader.get_data).
+"""
+
+import importlib.abc
+import importlib.util
+import marshal
+import sys
+import threading
+import zipfile
+from importlib.machinery import ModuleSpec
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from .encrypted_stream import ContainerError
+
+# Bytes de cabecera de un .pyc: magic, flags y mtime/hash de la fuente (PEP 552)
+PYC_HEADER_SIZE = 16
+
+
+class _EncryptedSource:
+    """Miembros de un .enc versión 3: el reader conserva clave e índice"""
+
+    def __init__(self, archive: Path, password: str, crypto_threads: int):
+        from .encryption_service import SimpleEncryptionService
+
+        self._reader = SimpleEncryptionService(crypto_threads=crypto_threads).open_reader(
+            archive, password
+        )
+        self.members: List[str] = [member.path for member in self._reader.members]
+
+    def read(self, member: str) -> bytes:
+        return self._reader.read(member)
+
+    def close(self) -> None:
+        self._reader.close()
+
+
+class _ZipSource:
+    """Miembros de un ZIP protegido: nombres codificados más .sincpro_metadata"""
+
+    def __init__(self, archive: Path, password: str):
+        self._zip = zipfile.ZipFile(archive)
+        self._lock = threading.Lock()
+        try:
+            lines = self._zip.read(".sincpro_metadata").decode("utf-8").strip().split("\n")
+        except KeyError:
+            self._zip.close()
+            raise ContainerError(f"{archive} no es un ZIP protegido de SincPro") from None
+        if len(lines) < 2 or lines[0] != "SINCPRO_MAPPING" or lines[1] != password:
+            self._zip.close()
+            raise ContainerError("Contraseña incorrecta o archivo corrupto")
+        self._encoded: Dict[str, str] = {}
+        for line in lines[2:]:
+            if ":" in line:
+                encoded, original = line.split(":", 1)
+                self._encoded[original] = encoded
+        self.members = list(self._encoded)
+
+    def read(self, member: str) -> bytes:
+        with self._lock:
+            return self._zip.read(self._encoded[member])
+
+    def close(self) -> None:
+        self._zip.close()
+
+
+def _module_name(member: str) -> Optional[Tuple[str, bool]]:
+    """Nombre de módulo y si es paquete para un miembro .pyc/.py"""
+    for suffix in (".pyc", ".py"):
+        if member.endswith(suffix):
+            parts = member[: -len(suffix)].split("/")
+            if parts[-1] == "__init__":
+                return ".".join(parts[:-1]), True
+            return ".".join(parts), False
+    return None
+
+
+class ArchiveFinder(importlib.abc.MetaPathFinder, importlib.abc.InspectLoader):
+    """Finder y loader de los módulos de un archivo protegido"""
+
+    def __init__(self, archive: Union[str, Path], password: str, crypto_threads: int = 1):
+        self.archive = Path(archive).resolve()
+        if zipfile.is_zipfile(self.archive):
+            self._source: Union[_EncryptedSource, _ZipSource] = _ZipSource(
+                self.archive, password
+            )
+        else:
+            self._source = _EncryptedSource(self.archive, password, crypto_threads)
+
+        # nombre -> (miembro, es paquete); el .pyc tiene prioridad sobre el .py
+        self._modules: Dict[str, Tuple[str, bool]] = {}
+        directories: Set[str] = set()
+        self._members = set(self._source.members)
+        for member in self._source.members:
+            parsed = _module_name(member)
+            parts = member.split("/")[:-1]
+            directories.update(".".join(parts[:i]) for i in range(1, len(parts) + 1))
+            if parsed is None or not parsed[0]:
+                continue
+            name, is_package = parsed
+            current = self._modules.get(name)
+            if current is None or current[0].endswith(".py"):
+                self._modules[name] = (member, is_package)
+        # Directorios sin __init__: paquetes de espacio de nombres (PEP 420)
+        self._namespaces = {
+            name for name in directories if not self._modules.get(name, ("", False))[1]
+        } - set(self._modules)
+
+    # Finder
+
+    def find_spec(self, fullname: str, path=None, target=None) -> Optional[ModuleSpec]:
+        entry = self._modules.get(fullname)
+        if entry is not None:
+            member, is_package = entry
+            spec = ModuleSpec(
+                fullname, self, origin=self._location(member), is_package=is_package
+            )
+            spec.has_location = True
+            if is_package:
+                spec.submodule_search_locations = [self._location(member.rsplit("/", 1)[0])]
+            return spec
+        if fullname in self._namespaces:
+            spec = ModuleSpec(fullname, None, is_package=True)
+            spec.submodule_search_locations = [self._location(fullname.replace(".", "/"))]
+            return spec
+        return None
+
+    def invalidate_caches(self) -> None:
+        """El índice del archivo no cambia mientras está instalado"""
+
+    # Loader
+
+    def create_module(self, spec: ModuleSpec):
+        return None  # Módulo por defecto
+
+    def exec_module(self, module) -> None:
+        code = self.get_code(module.__name__)
+        exec(code, module.__dict__)
+
+    def is_package(self, fullname: str) -> bool:
+        return self._entry(fullname)[1]
+
+    def get_filename(self, fullname: str) -> str:
+        return self._location(self._entry(fullname)[0])
+
+    def get_code(self, fullname: str):
+        member, _ = self._entry(fullname)
+        data = self._read(member)
+        origin = self._location(member)
+        if member.endswith(".py"):
+            return compile(data, origin, "exec", dont_inherit=True)
+        if data[:4] != importlib.util.MAGIC_NUMBER:
+            raise ImportError(
+                f"{origin} fue compilado para otra versión de Python "
+                f"(se esperaba Python {sys.version_info.major}.{sys.version_info.minor})",
+                name=fullname,
+            )
+        return marshal.loads(memoryview(data)[PYC_HEADER_SIZE:])
+
+    def get_source(self, fullname: str) -> Optional[str]:
+        member, _ = self._entry(fullname)
+        if not member.endswith(".py"):
+            return None
+        return importlib.util.decode_source(self._read(member))
+
+    def get_data(self, path: str) -> bytes:
+        """Contenido de un archivo del archivo protegido (para pkgutil.get_data)"""
+        prefix = str(self.archive) + "/"
+        member = path[len(prefix) :] if path.startswith(prefix) else None
+        if member not in self._members:
+            raise FileNotFoundError(path)
+        return self._read(member)
+
+    # Instalación
+
+    def install(self) -> "ArchiveFinder":
+        """Agrega el finder al inicio de sys.meta_path"""
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+        return self
+
+    def uninstall(self) -> None:
+        """Quita el finder y libera el archivo (los módulos importados siguen cargados)"""
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+        self._source.close()
+
+    def _entry(self, fullname: str) -> Tuple[str, bool]:
+        try:
+            return self._modules[fullname]
+        except KeyError:
+            raise ImportError(
+                f"{fullname} no está en {self.archive}", name=fullname
+            ) from None
+
+    def _read(self, member: str) -> bytes:
+        try:
+            return self._source.read(member)
+        except ContainerError as e:
+            raise ImportError(f"No se pudo leer {member} de {self.archive}: {e}") from e
+
+    def _location(self, member: str) -> str:
+        return f"{self.archive}/{member}"
+
+    def __repr__(self) -> str:
+        return f"ArchiveFinder({str(self.archive)!r})"
+
+
+def install_archive(
+    archive: Union[str, Path], password: str, crypto_threads: int = 1
+) -> ArchiveFinder:
+    """
+    Permite importar los módulos de un archivo protegido (.enc o .zip)
+
+    Raises:
+        ContainerError: contraseña incorrecta, archivo corrupto o .enc sin índice
+    """
+    return ArchiveFinder(archive, password, crypto_threads).install()
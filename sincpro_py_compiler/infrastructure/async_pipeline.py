@@ -0,0 +1,231 @@
+"""
+Infraestructura - Pipeline asíncrono por etapas
+
+    recorrido → clasificación → compilación / copia → archivo protegido
+
+Cada etapa es una corrutina conectada a la siguiente por colas acotadas, de modo
+que el recorrido no se adelanta sin límite a la compilación (backpressure). La
+compilación, limitada por CPU, corre en un pool de procesos (o en un hilo con
+jobs=1) y las copias en un pool de hilos, solapadas con ella.
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from .build_manifest import BuildManifest
+from .pattern_matcher import PatternMatcher
+from .python_compiler import (
+    BuildTask,
+    TaskContext,
+    _init_worker,
+    _run_worker_chunk,
+    execute_build_task,
+)
+from .tree_walker import scan_directory
+
+if TYPE_CHECKING:
+    from .python_compiler import PythonCompiler
+
+logger = logging.getLogger(__name__)
+
+# Capacidad de cada cola entre etapas
+QUEUE_SIZE = 256
+# Tareas que un consumidor de compilación envía juntas a un worker
+COMPILE_BATCH = 16
+# Hilos dedicados a copias y a la E/S del recorrido
+IO_THREADS = 4
+
+_DONE = None  # Marca de fin de cola
+
+
+class AsyncBuildPipeline:
+    """Ejecuta un build de PythonCompiler como etapas concurrentes de asyncio"""
+
+    def __init__(
+        self,
+        compiler: "PythonCompiler",
+        source_path: Path,
+        output_path: Path,
+        exclude_patterns: PatternMatcher,
+        copy_faithful_patterns: PatternMatcher,
+        context: TaskContext,
+        jobs: Optional[int] = 1,
+        manifest: Optional[BuildManifest] = None,
+        queue_size: int = QUEUE_SIZE,
+    ):
+        self.compiler = compiler
+        self.source_path = source_path
+        self.output_path = output_path
+        self.exclude_patterns = exclude_patterns
+        self.copy_faithful_patterns = copy_faithful_patterns
+        self.context = context
+        self.workers = jobs or os.cpu_count() or 1
+        self.manifest = manifest
+        self.queue_size = queue_size
+
+        self.excluded_count = 0
+        self.unchanged_count = 0
+        # Tareas ejecutadas con su resultado, indexadas por orden de recorrido
+        self._results: Dict[int, Tuple[BuildTask, str]] = {}
+
+    async def run(self) -> Tuple[List[BuildTask], List[str]]:
+        """
+        Ejecuta todas las etapas hasta vaciar el árbol fuente
+
+        Returns:
+            Tareas ejecutadas y sus resultados, en el orden del recorrido
+        """
+        paths: asyncio.Queue = asyncio.Queue(self.queue_size)
+        compile_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        copy_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+
+        io_executor = ThreadPoolExecutor(IO_THREADS, thread_name_prefix="sincpro-io")
+        compile_executor, owns_executor = self._compile_executor()
+        compile_consumers = self.workers * 2 if self.workers > 1 else 1
+        if self.workers > 1:
+            logger.info(f"Compilando en paralelo con {self.workers} procesos")
+
+        stages = [
+            self._walk(paths, io_executor),
+            self._classify(paths, compile_queue, copy_queue, io_executor, compile_consumers),
+            *(
+                self._compile(compile_queue, compile_executor)
+                for _ in range(compile_consumers)
+            ),
+            *(self._copy(copy_queue, io_executor) for _ in range(IO_THREADS)),
+        ]
+        running = [asyncio.ensure_future(stage) for stage in stages]
+        try:
+            await asyncio.gather(*running)
+        except BaseException:
+            for task in running:
+                task.cancel()
+            raise
+        finally:
+            io_executor.shutdown(wait=False)
+            if owns_executor:
+                compile_executor.shutdown(wait=False)
+
+        ordered = [self._results[index] for index in sorted(self._results)]
+        return [task for task, _ in ordered], [outcome for _, outcome in ordered]
+
+    def _compile_executor(self) -> Tuple[Executor, bool]:
+        """Pool para compilar: el persistente del compilador, uno nuevo o un hilo"""
+        if self.workers <= 1:
+            return ThreadPoolExecutor(1, thread_name_prefix="sincpro-compile"), True
+        if self.compiler._pool is not None:
+            return self.compiler._pool, False
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker), True
+
+    async def _walk(self, paths: asyncio.Queue, io_executor: Executor) -> None:
+        """Etapa 1: recorre el árbol (en profundidad, mismo orden que os.walk)"""
+        loop = asyncio.get_running_loop()
+        pending = [(str(self.source_path), "")]
+        index = 0
+        while pending:
+            directory, relative_dir = pending.pop()
+            dirs, files = await loop.run_in_executor(
+                io_executor, scan_directory, directory, relative_dir
+            )
+            for entry in files:
+                await paths.put((index, entry))
+                index += 1
+            included = [
+                d
+                for d in dirs
+                if self.compiler._include_dir(
+                    Path(d.path),
+                    self.source_path,
+                    self.output_path,
+                    self.exclude_patterns,
+                    self.copy_faithful_patterns,
+                )
+            ]
+            pending.extend((d.path, d.relative_path) for d in reversed(included))
+        await paths.put(_DONE)
+
+    async def _classify(
+        self,
+        paths: asyncio.Queue,
+        compile_queue: asyncio.Queue,
+        copy_queue: asyncio.Queue,
+        io_executor: Executor,
+        compile_consumers: int,
+    ) -> None:
+        """Etapa 2: decide compilar, copiar, excluir u omitir (sin cambios) cada archivo"""
+        loop = asyncio.get_running_loop()
+        while (item := await paths.get()) is not _DONE:
+            index, entry = item
+            task = self.compiler._classify_file(
+                Path(entry.path),
+                self.source_path,
+                self.output_path,
+                self.exclude_patterns,
+                self.copy_faithful_patterns,
+                entry.relative_path,
+            )
+            if task is None:
+                self.excluded_count += 1
+                continue
+            if self.manifest is not None and await loop.run_in_executor(
+                io_executor,
+                self.manifest.is_unchanged,
+                task.relative_path,
+                task.source,
+                self.output_path,
+            ):
+                self.unchanged_count += 1
+                continue
+            queue = compile_queue if task.action == "compile" else copy_queue
+            await queue.put((index, task))
+
+        for _ in range(compile_consumers):
+            await compile_queue.put(_DONE)
+        for _ in range(IO_THREADS):
+            await copy_queue.put(_DONE)
+
+    async def _compile(self, compile_queue: asyncio.Queue, executor: Executor) -> None:
+        """Etapa 3: compila por lotes en el pool, reemitiendo los logs de los workers"""
+        loop = asyncio.get_running_loop()
+        finished = False
+        while not finished:
+            batch = []
+            item = await compile_queue.get()
+            while item is not _DONE:
+                batch.append(item)
+                if len(batch) >= COMPILE_BATCH or compile_queue.empty():
+                    break
+                item = compile_queue.get_nowait()
+            finished = item is _DONE
+            if not batch:
+                continue
+
+            tasks = [task for _, task in batch]
+            if isinstance(executor, ProcessPoolExecutor):
+                results = await loop.run_in_executor(
+                    executor, _run_worker_chunk, self.context, tasks
+                )
+                for (index, task), (outcome, records, _) in zip(batch, results):
+                    for record in records:
+                        logging.getLogger(record.name).handle(record)
+                    self._results[index] = (task, outcome)
+            else:
+                for index, task in batch:
+                    outcome = await loop.run_in_executor(
+                        executor, execute_build_task, task, self.context
+                    )
+                    self._results[index] = (task, outcome)
+
+    async def _copy(self, copy_queue: asyncio.Queue, io_executor: Executor) -> None:
+        """Etapa 4: copia los archivos no compilables en paralelo con la compilación"""
+        loop = asyncio.get_running_loop()
+        while (item := await copy_queue.get()) is not _DONE:
+            index, task = item
+            outcome = await loop.run_in_executor(
+                io_executor, execute_build_task, task, self.context
+            )
+            self._results[index] = (task, outcome)
@@ -0,0 +1,167 @@
+"""
+Infraestructura - Manifiesto de build para compilaciones incrementales
+"""
+
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = ".sincpro_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def hash_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """Calcula el hash SHA-256 del contenido de un archivo"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BuildManifest:
+    """
+    Registro persistente del último build en el directorio de salida
+
+    Guarda por cada fuente su tamaño, mtime_ns y hash de contenido junto con la
+    salida producida, además de la configuración del build (template, patrones y
+    número mágico del intérprete). Si la configuración cambia, el manifiesto
+    anterior se descarta y el build es completo.
+    """
+
+    def __init__(self, output_dir: Path, settings: Dict[str, Any]):
+        self.path = output_dir / MANIFEST_FILENAME
+        self.settings = dict(settings, magic=importlib.util.MAGIC_NUMBER.hex())
+        self.previous: Dict[str, Dict[str, Any]] = {}
+        self.entries: Dict[str, Dict[str, Any]] = {}
+
+    def load(self) -> bool:
+        """
+        Carga el manifiesto del build anterior
+
+        Returns:
+            bool: True si existe y es compatible con la configuración actual
+        """
+        if not self.path.exists():
+            return False
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception as e:
+            logger.warning(f"Manifiesto de build ilegible, se recompila todo: {e}")
+            return False
+
+        if data.get("version") != MANIFEST_VERSION or data.get("settings") != self.settings:
+            logger.info("Configuración del build cambió, se recompila todo")
+            # Las salidas previas siguen siendo candidatas a limpieza
+            self.previous = {
+                source: dict(entry, size=-1)
+                for source, entry in data.get("files", {}).items()
+            }
+            return False
+
+        self.previous = data.get("files", {})
+        return True
+
+    def is_unchanged(self, relative_source: str, source: Path, output_dir: Path) -> bool:
+        """
+        Verifica si una fuente no cambió desde el build anterior
+
+        Compara tamaño y mtime_ns; si solo difiere el mtime se confirma con el hash
+        del contenido. Las entradas sin cambios se conservan para el nuevo manifiesto.
+        """
+        entry = self.previous.get(relative_source)
+        if entry is None or not (output_dir / entry["output"]).exists():
+            return False
+
+        stat = source.stat()
+        if stat.st_size != entry["size"]:
+            return False
+        if stat.st_mtime_ns != entry["mtime_ns"]:
+            if hash_file(source) != entry["sha256"]:
+                return False
+            entry = dict(entry, mtime_ns=stat.st_mtime_ns)
+
+        self.entries[relative_source] = entry
+        return True
+
+    def record(self, relative_source: str, source: Path, relative_output: str) -> None:
+        """Registra una fuente procesada y la salida que produjo"""
+        stat = source.stat()
+        self.entries[relative_source] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": hash_file(source),
+            "output": relative_output,
+        }
+
+    def stale_outputs(self) -> List[str]:
+        """Salidas del build anterior que ya no corresponden a ninguna fuente"""
+        current = {entry["output"] for entry in self.entries.values()}
+        return sorted(
+            {entry["output"] for entry in self.previous.values()} - current,
+        )
+
+    def remove_stale_outputs(self, output_dir: Path) -> int:
+        """
+        Elimina las salidas obsoletas y los directorios que queden vacíos
+
+        Returns:
+            int: Número de archivos eliminados
+        """
+        removed = 0
+        for relative_output in self.stale_outputs():
+            output_file = output_dir / relative_output
+            try:
+                output_file.unlink()
+                removed += 1
+                logger.debug(f"Eliminado (obsoleto): {relative_output}")
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                logger.warning(f"No se pudo eliminar {output_file}: {e}")
+                continue
+            _prune_empty_parents(output_file.parent, output_dir)
+        return removed
+
+    def save(self) -> None:
+        """Escribe el manifiesto de forma atómica"""
+        data = {
+            "version": MANIFEST_VERSION,
+            "settings": self.settings,
+            "files": dict(sorted(self.entries.items())),
+        }
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(json.dumps(data, indent=1), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+def _prune_empty_parents(directory: Path, stop: Path) -> None:
+    """Elimina directorios vacíos subiendo hasta `stop` (exclusivo)"""
+    while directory != stop and stop in directory.parents:
+        try:
+            directory.rmdir()
+        except OSError:
+            return
+        directory = directory.parent
+
+
+def build_settings(
+    template: str,
+    exclude_patterns: Iterable[str],
+    copy_faithful_patterns: Iterable[str],
+    extra: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Configuración del build que invalida el manifiesto cuando cambia"""
+    settings: Dict[str, Any] = {
+        "template": template,
+        "exclude": list(exclude_patterns),
+        "copy_faithful": list(copy_faithful_patterns),
+    }
+    settings.update(extra or {})
+    return settings
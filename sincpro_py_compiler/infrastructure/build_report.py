@@ -0,0 +1,191 @@
+"""
+Infraestructura - Reporte estructurado de un build
+
+BuildResult es lo que devuelve compile_project: contadores y bytes por
+categoría, archivos que fallaron con su error, tiempo de pared y de CPU por
+fase, throughput, pico de memoria y aciertos de caché. Se evalúa como bool
+(éxito del build), así que `if compiler.compile_project(...)` sigue funcionando,
+y se serializa a JSON para los dashboards de despliegue.
+"""
+
+import contextlib
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+REPORT_VERSION = 1
+
+# Resultados de tarea que procesan un archivo (excluidos, sin cambios, etc. no)
+PROCESSED_OUTCOMES = ("compiled", "cached", "copied", "reflinked", "hardlinked", "failed")
+
+
+class PhaseTiming(NamedTuple):
+    """Tiempo de una fase del build, en segundos"""
+
+    wall_s: float
+    cpu_s: float
+
+
+class FailedFile(NamedTuple):
+    """Archivo que no se pudo compilar o copiar"""
+
+    path: str
+    stage: str  # "compile" (se copió la fuente en su lugar) o "copy" (no hay salida)
+    error: str
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Pico de memoria residente del proceso o de sus workers ya terminados"""
+    if resource is None:
+        return None
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # ru_maxrss está en KB en Linux y en bytes en macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class ErrorCollector(logging.Handler):
+    """Acumula los mensajes de error emitidos mientras se ejecuta una tarea"""
+
+    def __init__(self):
+        super().__init__(level=logging.ERROR)
+        self.messages: List[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(record.getMessage())
+
+    def take(self) -> List[str]:
+        """Devuelve y vacía los mensajes acumulados"""
+        messages, self.messages = self.messages, []
+        return messages
+
+
+class BuildResult:
+    """Resultado de un build con sus métricas"""
+
+    def __init__(self, source_dir: str = "", output_dir: str = ""):
+        self.success = False
+        self.error: Optional[str] = None
+        self.source_dir = source_dir
+        self.output_dir = output_dir
+        # Archivos por categoría (compiled, copied, excluded, ...) = last_build_stats
+        self.counts: Dict[str, int] = {}
+        # Bytes escritos en la salida por resultado de tarea
+        self.bytes: Dict[str, int] = {}
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.failed_files: List[FailedFile] = []
+        self.phases: Dict[str, PhaseTiming] = {}
+        # CPU consumida por los procesos del pool (no la cuenta process_time)
+        self.worker_cpu_s = 0.0
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self.peak_rss_bytes: Optional[int] = None
+        self._start = time.perf_counter()
+        self._start_cpu = time.process_time()
+
+    def __bool__(self) -> bool:
+        return self.success
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Mide una fase; si se repite, los tiempos se suman"""
+        start, start_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            previous = self.phases.get(name, PhaseTiming(0.0, 0.0))
+            self.phases[name] = PhaseTiming(
+                previous.wall_s + time.perf_counter() - start,
+                previous.cpu_s + time.process_time() - start_cpu,
+            )
+
+    def add_output(self, outcome: str, read: int, written: int) -> None:
+        """Suma los bytes leídos y escritos por una tarea"""
+        self.bytes_read += read
+        self.bytes_written += written
+        self.bytes[outcome] = self.bytes.get(outcome, 0) + written
+
+    def finish(self, success: bool, error: Optional[str] = None) -> "BuildResult":
+        """Cierra las mediciones del build"""
+        self.success = success
+        self.error = error
+        self.wall_s = time.perf_counter() - self._start
+        self.cpu_s = time.process_time() - self._start_cpu + self.worker_cpu_s
+        self.peak_rss_bytes = peak_rss_bytes()
+        return self
+
+    @property
+    def files_processed(self) -> int:
+        return sum(self.counts.get(outcome, 0) for outcome in PROCESSED_OUTCOMES)
+
+    @property
+    def files_per_sec(self) -> float:
+        return self.files_processed / self.wall_s if self.wall_s else 0.0
+
+    @property
+    def cache_hits(self) -> int:
+        return self.counts.get("cached", 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": REPORT_VERSION,
+            "success": self.success,
+            "error": self.error,
+            "source_dir": self.source_dir,
+            "output_dir": self.output_dir,
+            "counts": dict(self.counts),
+            "bytes": dict(self.bytes),
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "failed_files": [failed._asdict() for failed in self.failed_files],
+            "phases": {name: timing._asdict() for name, timing in self.phases.items()},
+            "wall_s": self.wall_s,
+            "cpu_s": self.cpu_s,
+            "worker_cpu_s": self.worker_cpu_s,
+            "files_per_sec": self.files_per_sec,
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "cache_hits": self.cache_hits,
+        }
+
+    def write(self, path: Path) -> None:
+        """Escribe el reporte como JSON"""
+        write_report(self.to_dict(), path)
+
+    def summary(self) -> str:
+        """Resumen de una línea para la consola"""
+        return format_summary(self.to_dict())
+
+
+def write_report(report: Dict[str, Any], path: Path) -> None:
+    """Escribe un reporte (BuildResult.to_dict) como JSON"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+
+def format_summary(report: Dict[str, Any]) -> str:
+    """Resumen de una línea de un reporte (también de los que envía el daemon)"""
+    processed = sum(report["counts"].get(outcome, 0) for outcome in PROCESSED_OUTCOMES)
+    parts = [
+        f"{processed} archivos en {report['wall_s']:.2f} s "
+        f"({report['files_per_sec']:.0f} archivos/s, CPU {report['cpu_s']:.2f} s)",
+        f"{report['bytes_read'] / 1e6:.1f} MB leídos, "
+        f"{report['bytes_written'] / 1e6:.1f} MB escritos",
+    ]
+    if report["peak_rss_bytes"] is not None:
+        parts.append(f"pico RSS {report['peak_rss_bytes'] / 1e6:.0f} MB")
+    if report["cache_hits"]:
+        parts.append(f"{report['cache_hits']} aciertos de caché")
+    if report["failed_files"]:
+        parts.append(f"{len(report['failed_files'])} con errores")
+    return " · ".join(parts)
@@ -0,0 +1,154 @@
+"""
+Infraestructura - Trazas de build en formato Chrome trace event
+
+Registra spans de cada fase del build y de la protección, y la duración de cada
+archivo compilado o copiado con el proceso e hilo que lo procesó. El archivo se
+abre en chrome://tracing o https://ui.perfetto.dev.
+
+Los tiempos se toman con time.perf_counter_ns, que en Linux es un reloj monótono
+común a todos los procesos, así los spans de los workers quedan alineados con los
+del proceso principal.
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class TaskTiming(NamedTuple):
+    """Duración de una tarea y dónde se ejecutó"""
+
+    start_ns: int
+    end_ns: int
+    pid: int
+    tid: int
+    cpu_ns: int = 0  # CPU del proceso durante la tarea, si se midió
+
+    @classmethod
+    def measure_from(cls, start_ns: int, start_cpu_ns: Optional[int] = None) -> "TaskTiming":
+        """Cierra una medición iniciada en este proceso e hilo"""
+        cpu_ns = 0 if start_cpu_ns is None else time.process_time_ns() - start_cpu_ns
+        return cls(
+            start_ns, time.perf_counter_ns(), os.getpid(), threading.get_ident(), cpu_ns
+        )
+
+
+class SlowFile(NamedTuple):
+    """Archivo entre los más lentos del build"""
+
+    path: str
+    category: str
+    duration_ms: float
+
+
+class BuildTracer:
+    """Acumula eventos de traza; deshabilitado no registra nada"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.events: List[Dict[str, Any]] = []
+        # Tiempo acumulado (ns) de operaciones demasiado frecuentes para un span cada una
+        self.counters: Dict[str, int] = {}
+        self._origin_ns = time.perf_counter_ns()
+        self._pids = {os.getpid()}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(
+        self, name: str, category: str = "fase", **args: Any
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Mide un bloque como un span completo
+
+        Produce un diccionario de argumentos que el bloque puede completar (por
+        ejemplo, con contadores) antes de que se registre el span.
+        """
+        if not self.enabled:
+            yield args
+            return
+        start_ns = time.perf_counter_ns()
+        try:
+            yield args
+        finally:
+            self.add_span(name, category, TaskTiming.measure_from(start_ns), args)
+
+    def add_span(
+        self,
+        name: str,
+        category: str,
+        timing: TaskTiming,
+        args: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Registra un span ya medido (p. ej. en un worker)"""
+        if not self.enabled:
+            return
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (timing.start_ns - self._origin_ns) / 1000,
+            "dur": (timing.end_ns - timing.start_ns) / 1000,
+            "pid": timing.pid,
+            "tid": timing.tid,
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self.events.append(event)
+            self._pids.add(timing.pid)
+
+    def timed(self, counter: str, function: Callable[..., T]) -> Callable[..., T]:
+        """Envuelve una función para acumular su tiempo en counters[counter]"""
+        if not self.enabled:
+            return function
+
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            start_ns = time.perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter_ns() - start_ns
+                with self._lock:
+                    self.counters[counter] = self.counters.get(counter, 0) + elapsed
+
+        return wrapper
+
+    def counter_ms(self, counter: str) -> float:
+        """Tiempo acumulado de un contador, en milisegundos"""
+        return self.counters.get(counter, 0) / 1e6
+
+    def slowest_files(self, count: int = 10) -> List[SlowFile]:
+        """Archivos que más tardaron en compilarse o copiarse"""
+        files = [
+            event for event in self.events if event["cat"] in ("compile", "copy", "failed")
+        ]
+        files.sort(key=lambda event: event["dur"], reverse=True)
+        return [
+            SlowFile(event["name"], event["cat"], event["dur"] / 1000)
+            for event in files[:count]
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Traza completa, con los nombres de proceso como metadatos"""
+        main_pid = os.getpid()
+        metadata = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "args": {"name": "sincpro-compile" if pid == main_pid else f"worker {pid}"},
+            }
+            for pid in sorted(self._pids)
+        ]
+        return {"traceEvents": metadata + self.events, "displayTimeUnit": "ms"}
+
+    def write(self, path: Path) -> None:
+        """Escribe la traza como JSON"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict()), encoding="utf-8")
@@ -0,0 +1,148 @@
+"""
+Infraestructura - Motor de compilación a bytecode en memoria
+
+Reemplaza el recorrido por py_compile (lectura vía loader de importlib, archivo
+temporal y rename por cada módulo): la fuente se lee una sola vez, se compila con
+compile(), el code object se serializa con marshal junto a una cabecera .pyc
+construida en el proceso y el resultado se escribe con una única llamada.
+"""
+
+import importlib.util
+import marshal
+import os
+import sys
+from pathlib import Path
+from typing import Optional
+
+MAGIC_NUMBER = importlib.util.MAGIC_NUMBER
+
+PYC_MODES = ("timestamp", "checked-hash", "unchecked-hash")
+OPTIMIZATION_LEVELS = (-1, 0, 1, 2)
+
+
+def default_pyc_mode() -> str:
+    """Modo por defecto: igual que py_compile, hash verificado si SOURCE_DATE_EPOCH existe"""
+    if os.environ.get("SOURCE_DATE_EPOCH"):
+        return "checked-hash"
+    return "timestamp"
+
+
+def build_pyc(
+    code,
+    source: bytes,
+    source_mtime: int,
+    source_size: int,
+    pyc_mode: str = "timestamp",
+) -> bytes:
+    """
+    Serializa un code object como .pyc
+
+    Cabecera (PEP 552): número mágico, flags y, según el modo, mtime y tamaño de la
+    fuente (timestamp) o el hash SipHash de la fuente (checked/unchecked-hash).
+    """
+    header = bytearray(MAGIC_NUMBER)
+    if pyc_mode == "timestamp":
+        header += (0).to_bytes(4, "little")
+        header += (source_mtime & 0xFFFFFFFF).to_bytes(4, "little")
+        header += (source_size & 0xFFFFFFFF).to_bytes(4, "little")
+    else:
+        flags = 0b01 | (0b10 if pyc_mode == "checked-hash" else 0)
+        header += flags.to_bytes(4, "little")
+        header += importlib.util.source_hash(source)
+    return bytes(header) + marshal.dumps(code)
+
+
+class BytecodeCompiler:
+    """Compila fuentes Python a .pyc en memoria, sin pasar por py_compile"""
+
+    def __init__(self, optimize: int = -1, pyc_mode: Optional[str] = None):
+        """
+        Args:
+            optimize: Nivel de optimización de compile() (-1 = el del intérprete,
+                0, 1 = -O sin asserts, 2 = -OO sin asserts ni docstrings)
+            pyc_mode: 'timestamp', 'checked-hash' o 'unchecked-hash'
+        """
+        pyc_mode = pyc_mode or default_pyc_mode()
+        if pyc_mode not in PYC_MODES:
+            raise ValueError(f"Modo de pyc no válido: {pyc_mode}")
+        if optimize not in OPTIMIZATION_LEVELS:
+            raise ValueError(f"Nivel de optimización no válido: {optimize}")
+        self.optimize = optimize
+        self.pyc_mode = pyc_mode
+
+    @property
+    def effective_optimize(self) -> int:
+        """Nivel que aplica compile(): -1 se resuelve al del intérprete (python -O)"""
+        return sys.flags.optimize if self.optimize == -1 else self.optimize
+
+    @property
+    def variant(self) -> str:
+        """Identifica las opciones que afectan a los bytes del .pyc generado"""
+        return f"optimize={self.effective_optimize};pyc_mode={self.pyc_mode}"
+
+    def compile_source(
+        self, source: bytes, dfile: str, source_mtime: int, source_size: int
+    ) -> bytes:
+        """
+        Compila el contenido de una fuente y devuelve los bytes del .pyc
+
+        Args:
+            source: Contenido de la fuente (se respeta la declaración de encoding)
+            dfile: Nombre registrado en el bytecode (co_filename)
+            source_mtime: mtime de la fuente en segundos
+            source_size: Tamaño de la fuente en bytes
+        """
+        code = compile(
+            source, dfile, "exec", dont_inherit=True, optimize=self.effective_optimize
+        )
+        return build_pyc(code, source, source_mtime, source_size, self.pyc_mode)
+
+    def compile_file(
+        self,
+        source_file: Path,
+        output_file: Path,
+        dfile: Optional[str] = None,
+        source: Optional[bytes] = None,
+    ) -> bytes:
+        """
+        Compila un archivo y escribe el .pyc resultante
+
+        Args:
+            source_file: Archivo fuente
+            output_file: Archivo .pyc de salida
+            dfile: Nombre registrado en el bytecode (default: ruta de la fuente)
+            source: Contenido ya cargado por otra etapa (evita releer el archivo)
+
+        Returns:
+            bytes: Contenido del .pyc escrito
+
+        Raises:
+            SyntaxError, ValueError u OSError si la fuente no se puede compilar
+        """
+        if source is None:
+            with open(source_file, "rb") as f:
+                stat = os.fstat(f.fileno())
+                source = f.read()
+        else:
+            stat = os.stat(source_file)
+
+        data = self.compile_source(
+            source, dfile or str(source_file), int(stat.st_mtime), stat.st_size
+        )
+        self.write(output_file, data)
+        return data
+
+    def write(self, output_file: Path, data: bytes) -> None:
+        """Escribe un .pyc en una sola llamada, creando el directorio solo si falta"""
+        # Desvincular primero: la salida puede ser un hardlink a la caché de bytecode
+        try:
+            os.unlink(output_file)
+        except FileNotFoundError:
+            pass
+        try:
+            f = open(output_file, "wb")
+        except FileNotFoundError:
+            output_file.parent.mkdir(parents=True, exist_ok=True)
+            f = open(output_file, "wb")
+        with f:
+            f.write(data)
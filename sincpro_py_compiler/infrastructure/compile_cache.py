@@ -0,0 +1,221 @@
+"""
+Infraestructura - Caché de bytecode direccionada por contenido
+
+La caché es compartida por todos los builds de la máquina: la clave de cada
+entrada combina el hash de la fuente, el número mágico del intérprete, las
+opciones de compilación (optimización y modo de pyc) y el nombre con el que se
+compila el módulo (co_filename).
+"""
+
+import hashlib
+import importlib.util
+import logging
+import os
+import shutil
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+LOCKING_AVAILABLE = fcntl is not None
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_VERSION = b"sincpro-compile-cache-v1"
+DEFAULT_CACHE_MAX_SIZE = 1024 * 1024 * 1024  # 1 GiB
+
+
+def default_cache_dir() -> Path:
+    """Directorio de caché por defecto (respeta XDG_CACHE_HOME)"""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(Path.home(), ".cache")
+    return Path(base) / "sincpro_py_compiler"
+
+
+class CompileCache:
+    """
+    Caché de archivos .pyc compartida entre builds y checkouts
+
+    Las entradas se escriben de forma atómica (archivo temporal + rename) bajo un
+    lock compartido; la limpieza LRU toma el lock exclusivo. El mtime de cada
+    entrada se actualiza en cada acierto y sirve como marca de último uso.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_size: int = DEFAULT_CACHE_MAX_SIZE,
+        link: bool = True,
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.objects_dir = self.cache_dir / "objects"
+        self.max_size = max_size
+        self.link = link
+
+    def key_for(self, source: bytes, dfile: str, variant: str = "") -> str:
+        """
+        Calcula la clave de una fuente para el intérprete actual
+
+        Args:
+            source: Contenido de la fuente
+            dfile: Nombre registrado en el bytecode
+            variant: Opciones de compilación (ver CompilerService.bytecode_variant)
+        """
+        digest = hashlib.sha256()
+        digest.update(CACHE_KEY_VERSION)
+        digest.update(importlib.util.MAGIC_NUMBER)
+        digest.update(variant.encode("utf-8") + b"\0")
+        digest.update(dfile.encode("utf-8") + b"\0")
+        digest.update(source)
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.objects_dir / key[:2] / f"{key}.pyc"
+
+    @contextmanager
+    def _lock(self, exclusive: bool = False) -> Iterator[None]:
+        """Lock de la caché entre procesos (no-op si fcntl no está disponible)"""
+        if fcntl is None:
+            yield
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_dir / "lock", "a+b") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def fetch(self, key: str, source_file: Path, output_file: Path) -> bool:
+        """
+        Coloca la entrada cacheada en output_file
+
+        Los .pyc por timestamp guardan el mtime y tamaño de la fuente: si no coinciden
+        con los de source_file se reescribe la cabecera; si coinciden, la entrada se
+        enlaza (hardlink) o se copia sin modificarla.
+
+        Returns:
+            bool: True si hubo acierto
+        """
+        entry = self._entry_path(key)
+        try:
+            with self._lock():
+                data = entry.read_bytes()
+                os.utime(entry)  # Marca de último uso para LRU
+                patched = _patch_timestamp_header(data, source_file)
+                output_file.parent.mkdir(parents=True, exist_ok=True)
+                if patched is data and self.link:
+                    _replace_with_link(entry, output_file, data)
+                else:
+                    _atomic_write(output_file, patched)
+            logger.debug(f"Caché (acierto): {source_file.name}")
+            return True
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning(f"Entrada de caché inválida para {source_file}: {e}")
+            return False
+
+    def store(self, key: str, compiled_file: Path) -> None:
+        """Guarda un .pyc recién compilado en la caché"""
+        entry = self._entry_path(key)
+        try:
+            with self._lock():
+                entry.parent.mkdir(parents=True, exist_ok=True)
+                _atomic_write(entry, compiled_file.read_bytes())
+        except Exception as e:
+            logger.warning(f"No se pudo guardar en caché {compiled_file}: {e}")
+
+    def size(self) -> int:
+        """Tamaño total en bytes de las entradas de la caché"""
+        total = 0
+        for entry in self.objects_dir.glob("*/*.pyc"):
+            try:
+                total += entry.stat().st_size
+            except FileNotFoundError:
+                continue
+        return total
+
+    def prune(self) -> int:
+        """
+        Elimina las entradas menos usadas hasta respetar el tamaño máximo
+
+        Returns:
+            int: Número de entradas eliminadas
+        """
+        if not self.objects_dir.exists():
+            return 0
+        removed = 0
+        with self._lock(exclusive=True):
+            entries = []
+            total = 0
+            for entry in self.objects_dir.glob("*/*.pyc"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry))
+                total += stat.st_size
+
+            entries.sort()
+            for _, size, entry in entries:
+                if total <= self.max_size:
+                    break
+                try:
+                    entry.unlink()
+                    removed += 1
+                    total -= size
+                except FileNotFoundError:
+                    continue
+        if removed:
+            logger.debug(f"Caché: {removed} entradas eliminadas (LRU)")
+        return removed
+
+    def clear(self) -> None:
+        """Vacía la caché completa"""
+        with self._lock(exclusive=True):
+            shutil.rmtree(self.objects_dir, ignore_errors=True)
+
+
+def _patch_timestamp_header(data: bytes, source_file: Path) -> bytes:
+    """Ajusta mtime/tamaño de la cabecera de un .pyc por timestamp (PEP 552)"""
+    if len(data) < 16 or int.from_bytes(data[4:8], "little") != 0:
+        return data  # .pyc basado en hash: la cabecera no depende de la fuente
+    stat = source_file.stat()
+    header = (int(stat.st_mtime) & 0xFFFFFFFF).to_bytes(4, "little")
+    header += (stat.st_size & 0xFFFFFFFF).to_bytes(4, "little")
+    if data[8:16] == header:
+        return data
+    return data[:8] + header + data[16:]
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Escribe un archivo completo y lo publica con un rename atómico"""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _replace_with_link(entry: Path, output_file: Path, data: bytes) -> None:
+    """Enlaza la entrada de caché en la salida, copiando si el enlace no es posible"""
+    tmp_link = output_file.with_name(f".{output_file.name}.link")
+    try:
+        if tmp_link.exists():
+            tmp_link.unlink()
+        os.link(entry, tmp_link)
+        os.replace(tmp_link, output_file)
+    except OSError:
+        _atomic_write(output_file, data)
@@ -0,0 +1,315 @@
+"""
+Infraestructura - Daemon de compilación persistente
+
+Mantiene un PythonCompiler y su pool de procesos calientes detrás de un socket
+Unix, de modo que cada build solo paga el trabajo de E/S y compilación, no el
+arranque del intérprete ni la creación de procesos.
+
+Protocolo: una línea JSON por petición y una línea JSON por evento de respuesta.
+    petición:  {"command": "compile" | "protect" | "ping" | "shutdown", "args": {...}}
+    eventos:   {"event": "log", "level": "INFO", "message": "..."}  (0 o más)
+               {"event": "result", "success": true, "stats": {...}, "report": {...}}
+               (siempre el último; report es BuildResult.to_dict() en "compile")
+"""
+
+import contextlib
+import contextvars
+import itertools
+import json
+import logging
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, cast
+
+from .compiler_service import CompilerService
+from .file_manager import FileManager
+from .key_derivation import KdfParams
+from .python_compiler import PythonCompiler
+
+logger = logging.getLogger(__name__)
+
+# Argumentos de compile_project aceptados por el daemon
+COMPILE_ARGS = (
+    "source_dir",
+    "output_dir",
+    "template",
+    "exclude_file",
+    "remove_py",
+    "copy_faithful_file",
+    "jobs",
+    "incremental",
+    "python_targets",
+    "walk_threads",
+    "sync",
+    "staged",
+)
+
+
+def default_socket_path() -> Path:
+    """Socket por usuario: $XDG_RUNTIME_DIR o el directorio temporal"""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "sincpro-compile.sock"
+    return Path(tempfile.gettempdir()) / f"sincpro-compile-{os.getuid()}.sock"
+
+
+# Petición que atiende el contexto actual (None en hilos que no atienden una)
+_request_id: "contextvars.ContextVar[Optional[int]]" = contextvars.ContextVar(
+    "sincpro_daemon_request", default=None
+)
+_request_ids = itertools.count(1)
+
+
+class _StreamHandler(logging.Handler):
+    """Reenvía al cliente los logs de su petición y del build que está ejecutando"""
+
+    def __init__(self, send: Callable[[Dict[str, Any]], None], daemon: "CompileDaemon"):
+        super().__init__()
+        self.send = send
+        self.daemon = daemon
+        self.request_id = _request_id.get()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Los hilos sin petición (walk_threads, tracer) trabajan para el build en
+        # curso; los logs de los workers se reemiten desde el hilo de la petición
+        owner = _request_id.get()
+        if owner is None:
+            owner = self.daemon.build_owner
+        if owner != self.request_id:
+            return
+        try:
+            self.send(
+                {"event": "log", "level": record.levelname, "message": self.format(record)}
+            )
+        except OSError:
+            pass  # El cliente se desconectó; el build continúa
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Atiende una petición por conexión"""
+
+    def send(self, event: Dict[str, Any]) -> None:
+        self.wfile.write(json.dumps(event).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline())
+            command = request["command"]
+            args = request.get("args") or {}
+        except (ValueError, KeyError, TypeError) as e:
+            self.send(
+                {"event": "result", "success": False, "error": f"Petición inválida: {e}"}
+            )
+            return
+
+        daemon = cast(_DaemonServer, self.server).daemon
+        _request_id.set(next(_request_ids))
+        handler = _StreamHandler(self.send, daemon)
+        handler.setFormatter(logging.Formatter("%(levelname)s - %(message)s"))
+        logging.getLogger().addHandler(handler)
+        try:
+            result = daemon.dispatch(command, args)
+        except Exception as e:
+            logger.error(f"Error atendiendo '{command}': {e}")
+            result = {"success": False, "error": str(e)}
+        finally:
+            logging.getLogger().removeHandler(handler)
+        try:
+            self.send({"event": "result", **result})
+        except OSError:
+            pass
+
+
+class _DaemonServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, daemon: "CompileDaemon"):
+        self.daemon = daemon
+        super().__init__(socket_path, _RequestHandler)
+
+
+class CompileDaemon:
+    """Servidor de compilación con compilador y pool de procesos persistentes"""
+
+    def __init__(
+        self,
+        socket_path: Optional[Path] = None,
+        compiler: Optional[PythonCompiler] = None,
+        jobs: Optional[int] = None,
+    ):
+        self.socket_path = Path(socket_path or default_socket_path())
+        self.compiler = compiler or PythonCompiler()
+        self.jobs = jobs
+        self._security_manager = None
+        # Un build a la vez: comparten pool, caché y directorio de trabajo
+        self._build_lock = threading.Lock()
+        # Petición cuyo build está en curso (recibe los logs de hilos sin petición)
+        self.build_owner: Optional[int] = None
+        self._server: Optional[_DaemonServer] = None
+
+    def serve_forever(self, ready: Optional[threading.Event] = None) -> None:
+        """
+        Atiende peticiones hasta recibir "shutdown"
+
+        Args:
+            ready: Evento que se activa cuando el socket acepta conexiones
+        """
+        self._remove_stale_socket()
+        self.compiler.start_worker_pool(self.jobs)
+        # Solo el usuario propietario puede conectarse
+        previous_umask = os.umask(0o177)
+        try:
+            self._server = _DaemonServer(str(self.socket_path), self)
+        finally:
+            os.umask(previous_umask)
+
+        logger.info(f"🛰️  Daemon de compilación escuchando en {self.socket_path}")
+        if ready is not None:
+            ready.set()
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+            self._server = None
+            self.compiler.shutdown_worker_pool()
+            try:
+                self.socket_path.unlink()
+            except FileNotFoundError:
+                pass
+            logger.info("Daemon de compilación detenido")
+
+    def _remove_stale_socket(self) -> None:
+        """Elimina el socket de un daemon anterior que ya no responde"""
+        if not self.socket_path.exists():
+            return
+        try:
+            DaemonClient(self.socket_path).request("ping")
+        except OSError:
+            self.socket_path.unlink()
+            return
+        raise RuntimeError(f"Ya hay un daemon escuchando en {self.socket_path}")
+
+    def dispatch(self, command: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Ejecuta un comando y devuelve el evento de resultado (sin la clave 'event')"""
+        if command == "ping":
+            return {"success": True, "pid": os.getpid()}
+        if command == "shutdown":
+            if self._server is not None:
+                threading.Thread(target=self._server.shutdown, daemon=True).start()
+            return {"success": True}
+        if command == "compile":
+            return self._compile(args)
+        if command == "protect":
+            return self._protect(args)
+        return {"success": False, "error": f"Comando desconocido: {command}"}
+
+    @contextlib.contextmanager
+    def _build(self) -> Iterator[None]:
+        """Ejecuta un build a la vez, registrando la petición que lo pidió"""
+        with self._build_lock:
+            self.build_owner = _request_id.get()
+            try:
+                yield
+            finally:
+                self.build_owner = None
+
+    def _compile(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        unknown = set(args) - set(COMPILE_ARGS) - {"optimize", "pyc_mode", "link_mode"}
+        if unknown:
+            return {"success": False, "error": f"Argumentos desconocidos: {sorted(unknown)}"}
+        build_args = {key: value for key, value in args.items() if key in COMPILE_ARGS}
+
+        with self._build():
+            default_service = self.compiler.compiler_service
+            default_file_manager = self.compiler.file_manager
+            if "optimize" in args or "pyc_mode" in args:
+                self.compiler.compiler_service = CompilerService(
+                    optimize=args.get("optimize", -1), pyc_mode=args.get("pyc_mode")
+                )
+            try:
+                if "link_mode" in args:
+                    self.compiler.file_manager = FileManager(link_mode=args["link_mode"])
+                self.compiler.last_build_stats = {}
+                result = self.compiler.compile_project(**build_args)
+                stats = dict(self.compiler.last_build_stats)
+            except ValueError as e:
+                return {"success": False, "error": str(e)}
+            finally:
+                self.compiler.compiler_service = default_service
+                self.compiler.file_manager = default_file_manager
+        return {"success": bool(result), "stats": stats, "report": result.to_dict()}
+
+    def _protect(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        # Las claves derivadas quedan en la caché del proceso entre builds
+        crypto_threads = args.get("crypto_threads", 1)
+        kdf = KdfParams.from_dict(args["kdf"]) if args.get("kdf") else None
+        keyring = Path(args["keyring"]) if args.get("keyring") else None
+        with self._build():
+            # Se elige el manager dentro del lock: otra petición puede cambiarlo
+            manager = self._security_manager
+            if manager is None or (manager.crypto_threads, manager.kdf, manager.keyring) != (
+                crypto_threads,
+                kdf,
+                keyring,
+            ):
+                from .security_manager import SecurityManager
+
+                manager = self._security_manager = SecurityManager(
+                    crypto_threads=crypto_threads, kdf=kdf, keyring=keyring
+                )
+            success = manager.protect_compiled_code(
+                compiled_dir=Path(args["compiled_dir"]),
+                output_file=Path(args["output_file"]),
+                password=args.get("password", ""),
+                method=args.get("method", "compress"),
+            )
+        return {"success": success}
+
+
+class DaemonClient:
+    """Cliente mínimo del daemon de compilación"""
+
+    def __init__(self, socket_path: Optional[Path] = None, timeout: Optional[float] = None):
+        self.socket_path = Path(socket_path or default_socket_path())
+        self.timeout = timeout
+
+    def request(
+        self,
+        command: str,
+        args: Optional[Dict[str, Any]] = None,
+        on_log: Optional[Callable[[str, str], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Envía una petición y espera su resultado
+
+        Args:
+            command: "compile", "protect", "ping" o "shutdown"
+            args: Argumentos del comando
+            on_log: Callback (nivel, mensaje) por cada log transmitido por el daemon
+
+        Returns:
+            Evento de resultado ({"event": "result", "success": ..., ...})
+
+        Raises:
+            OSError: Si no hay daemon escuchando o la conexión se corta
+        """
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(str(self.socket_path))
+            payload = {"command": command, "args": args or {}}
+            sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as stream:
+                for line in stream:
+                    event = json.loads(line)
+                    if event.get("event") == "result":
+                        return event
+                    if on_log is not None:
+                        on_log(event.get("level", "INFO"), event.get("message", ""))
+        raise ConnectionError("El daemon cerró la conexión sin enviar resultado")
@@ -4,17 +4,39 @@ Implementación concreta del servicio de compilación
 
 import logging
 import os
-import py_compile
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
+
+from .bytecode_compiler import BytecodeCompiler
+from .pattern_matcher import PatternMatcher, read_rules
 
 logger = logging.getLogger(__name__)
 
+Patterns = Union[List[str], PatternMatcher]
+
+
+def _match_path(file_path: Path, root: Optional[Path]) -> str:
+    """Ruta POSIX sobre la que se evalúan los patrones"""
+    path = file_path.as_posix()
+    if root is None:
+        return path.lstrip("/")
+    # Recorte de prefijo: mucho más barato que Path.relative_to en cada archivo
+    prefix = root.as_posix().rstrip("/") + "/"
+    if path.startswith(prefix):
+        return path[len(prefix) :]
+    return file_path.relative_to(root).as_posix()
+
 
 class CompilerService:
     """Implementación concreta del servicio de compilación"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        bytecode_compiler: Optional[BytecodeCompiler] = None,
+        optimize: int = -1,
+        pyc_mode: Optional[str] = None,
+    ):
+        self.bytecode_compiler = bytecode_compiler or BytecodeCompiler(optimize, pyc_mode)
         # Templates de exclusión y copia fiel
         self.templates: Dict[str, Dict[str, List[str]]] = {
             "basic": {
@@ -72,39 +94,45 @@ class CompilerService:
             },
         }
 
-    def should_exclude(self, file_path: Path, exclude_patterns: List[str]) -> bool:
-        """Determina si un archivo debe ser excluido"""
-        file_str = str(file_path)
-        for pattern in exclude_patterns:
-            if pattern.endswith("/"):
-                # Es un directorio
-                if f"/{pattern}" in file_str or file_str.startswith(pattern):
-                    return True
-            elif "*" in pattern:
-                # Es un patrón con wildcard
-                if pattern.startswith("*."):
-                    extension = pattern[1:]
-                    if file_str.endswith(extension):
-                        return True
-            else:
-                # Es un archivo específico
-                if file_path.name == pattern or file_str.endswith(f"/{pattern}"):
-                    return True
-        return False
-
-    def should_copy_faithful(self, file_path: Path, copy_patterns: List[str]) -> bool:
-        """Determina si un archivo debe copiarse fielmente"""
-        file_str = str(file_path)
-        for pattern in copy_patterns:
-            if pattern.endswith("/"):
-                # Es un directorio
-                if f"/{pattern}" in file_str or file_str.startswith(pattern):
-                    return True
-            else:
-                # Es un archivo específico
-                if file_path.name == pattern or file_str.endswith(f"/{pattern}"):
-                    return True
-        return False
+    def compile_patterns(
+        self, patterns: Patterns, root: Optional[Path] = None
+    ) -> PatternMatcher:
+        """
+        Compila una lista de patrones (una vez por build) en un PatternMatcher
+
+        Args:
+            root: Raíz del proyecto para cargar los .sincpro_exclude de cada directorio
+        """
+        if isinstance(patterns, PatternMatcher):
+            return patterns
+        return PatternMatcher(patterns, root)
+
+    def should_exclude(
+        self,
+        file_path: Path,
+        exclude_patterns: Patterns,
+        root: Optional[Path] = None,
+        is_dir: bool = False,
+    ) -> bool:
+        """
+        Determina si un archivo (o directorio, con is_dir) debe ser excluido
+
+        Los patrones se evalúan sobre la ruta relativa a `root`; sin raíz, sobre la
+        ruta completa. Pasar un PatternMatcher evita recompilar en cada llamada.
+        """
+        matcher = self.compile_patterns(exclude_patterns)
+        return matcher.matches(_match_path(file_path, root), is_dir)
+
+    def should_copy_faithful(
+        self,
+        file_path: Path,
+        copy_patterns: Patterns,
+        root: Optional[Path] = None,
+        is_dir: bool = False,
+    ) -> bool:
+        """Determina si un archivo (o directorio, con is_dir) debe copiarse fielmente"""
+        matcher = self.compile_patterns(copy_patterns)
+        return matcher.matches(_match_path(file_path, root), is_dir)
 
     def get_exclude_patterns(
         self, template: Optional[str] = None, custom_file: Optional[str] = None
@@ -114,11 +142,7 @@ class CompilerService:
         if template and template in self.templates:
             patterns.extend(self.templates[template]["exclude"])
         if custom_file and os.path.exists(custom_file):
-            with open(custom_file, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith("#"):
-                        patterns.append(line)
+            patterns.extend(read_rules(Path(custom_file)))
         return patterns
 
     def get_copy_faithful_patterns(self, template: Optional[str] = None) -> List[str]:
@@ -127,16 +151,56 @@ class CompilerService:
             return self.templates[template]["copy_faithful"]
         return []
 
-    def compile_python_file(self, source_file: Path, output_file: Path) -> bool:
-        """Compila un archivo Python"""
+    def compile_python_file(
+        self,
+        source_file: Path,
+        output_file: Path,
+        dfile: Optional[str] = None,
+        source: Optional[bytes] = None,
+    ) -> bool:
+        """
+        Compila un archivo Python
+
+        Args:
+            source_file: Archivo fuente
+            output_file: Archivo .pyc de salida
+            dfile: Nombre a registrar en el bytecode (default: ruta de la fuente)
+            source: Contenido de la fuente si ya fue leído por otra etapa
+        """
         try:
-            py_compile.compile(str(source_file), str(output_file), doraise=True)
+            self.bytecode_compiler.compile_file(source_file, output_file, dfile, source)
             logger.debug(f"Compilado: {source_file.name} -> {output_file.name}")
             return True
         except Exception as e:
             logger.error(f"Error compilando {source_file}: {e}")
             return False
 
+    def compile_to_bytes(
+        self, source_file: Path, dfile: Optional[str] = None
+    ) -> Optional[Tuple[bytes, int]]:
+        """
+        Compila un archivo Python en memoria, sin escribir el .pyc
+
+        Returns:
+            (bytes del .pyc, mtime de la fuente) o None si no se pudo compilar
+        """
+        try:
+            with open(source_file, "rb") as f:
+                stat = os.fstat(f.fileno())
+                source = f.read()
+            data = self.bytecode_compiler.compile_source(
+                source, dfile or str(source_file), int(stat.st_mtime), stat.st_size
+            )
+            logger.debug(f"Compilado en memoria: {source_file.name}")
+            return data, int(stat.st_mtime)
+        except Exception as e:
+            logger.error(f"Error compilando {source_file}: {e}")
+            return None
+
+    def bytecode_variant(self) -> str:
+        """Opciones de compilación que determinan el contenido de los .pyc"""
+        return self.bytecode_compiler.variant
+
     def list_available_templates(self) -> List[str]:
         """Lista templates disponibles"""
         return list(self.templates.keys())
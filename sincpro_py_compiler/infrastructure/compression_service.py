@@ -5,18 +5,95 @@ Infraestructura - Servicio de compresión con contraseña
 import logging
 import shutil
 import tempfile
+import time
 import zipfile
 from pathlib import Path
-from typing import List
+from typing import Dict, Optional
 
 from ..domain.security_service import CompressionProtocol
+from .build_tracer import BuildTracer
+from .tree_walker import iter_files
+
+# Fecha mínima representable en una entrada ZIP
+_ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+
+class ZipArchiveWriter:
+    """
+    Escribe un ZIP protegido entrada por entrada, sin árbol temporal
+
+    Cada archivo se guarda con su nombre codificado; el mapeo de nombres se agrega
+    como .sincpro_metadata al cerrar. Usar como context manager: si el bloque
+    falla, el ZIP incompleto se elimina.
+    """
+
+    def __init__(self, output_file: Path, password: str, service: "ZipCompressionService"):
+        self.output_file = output_file
+        self.password = password
+        self.service = service
+        self.file_mapping: Dict[str, str] = {}
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        self.zip_file = zipfile.ZipFile(
+            output_file, "w", zipfile.ZIP_DEFLATED, compresslevel=6
+        )
+
+    @property
+    def files_added(self) -> int:
+        return len(self.file_mapping)
+
+    def _register(self, relative_path: str) -> str:
+        encoded_name = self.service._encode_filename(relative_path, self.password)
+        self.file_mapping[encoded_name] = relative_path
+        self.service.logger.debug(f"Agregado: {relative_path} -> {encoded_name}")
+        return encoded_name
+
+    def add_file(self, relative_path: str, path: Path) -> None:
+        """Agrega un archivo del disco"""
+        self.zip_file.write(path, self._register(relative_path))
+
+    def add_bytes(
+        self, relative_path: str, data: bytes, mtime: Optional[float] = None
+    ) -> None:
+        """Agrega un archivo generado en memoria (p. ej. un .pyc)"""
+        date_time = time.localtime(time.time() if mtime is None else mtime)[:6]
+        info = zipfile.ZipInfo(self._register(relative_path), max(date_time, _ZIP_EPOCH))
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.external_attr = 0o644 << 16
+        self.zip_file.writestr(info, data, compresslevel=6)
+
+    def close(self) -> None:
+        """Escribe el mapeo de nombres y cierra el ZIP"""
+        metadata_content = f"SINCPRO_MAPPING\n{self.password}\n"
+        for encoded, original in self.file_mapping.items():
+            metadata_content += f"{encoded}:{original}\n"
+        self.zip_file.writestr(".sincpro_metadata", metadata_content.encode("utf-8"))
+        self.zip_file.close()
+
+    def abort(self) -> None:
+        """Descarta el ZIP incompleto"""
+        self.zip_file.close()
+        self.output_file.unlink(missing_ok=True)
+
+    def __enter__(self) -> "ZipArchiveWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
 
 
 class ZipCompressionService(CompressionProtocol):
     """Implementación de compresión usando ZIP con contraseña"""
 
-    def __init__(self):
+    def __init__(self, tracer: Optional[BuildTracer] = None):
         self.logger = logging.getLogger(__name__)
+        self.tracer = tracer or BuildTracer(enabled=False)
+
+    def open_writer(self, output_file: Path, password: str) -> ZipArchiveWriter:
+        """Abre un ZIP protegido para agregar archivos a medida que se producen"""
+        return ZipArchiveWriter(output_file, password, self)
 
     def compress_directory(self, source_dir: Path, output_file: Path, password: str) -> bool:
         """
@@ -37,64 +114,17 @@ class ZipCompressionService(CompressionProtocol):
                 self.logger.error(f"Directorio fuente no válido: {source_dir}")
                 return False
 
-            # Asegurar que el directorio de salida existe
-            output_file.parent.mkdir(parents=True, exist_ok=True)
-
-            # Crear un directorio temporal con nombres codificados
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-
-                # Copiar archivos con nombres codificados
-                file_mapping = {}
-                files_added = 0
-
-                for file_path in self._walk_directory(source_dir):
-                    if file_path.is_file():
-                        # Calcular ruta relativa
-                        relative_path = file_path.relative_to(source_dir)
-
-                        # Generar nombre codificado simple
-                        encoded_name = self._encode_filename(str(relative_path), password)
-                        encoded_path = temp_path / encoded_name
-
-                        # Asegurar que el directorio padre existe
-                        encoded_path.parent.mkdir(parents=True, exist_ok=True)
-
-                        # Copiar archivo
-                        shutil.copy2(file_path, encoded_path)
-
-                        # Guardar mapeo para metadata
-                        file_mapping[encoded_name] = str(relative_path)
-                        files_added += 1
-
-                        self.logger.debug(f"Preparado: {relative_path} -> {encoded_name}")
-
-                # Crear archivo de metadata con mapeo de nombres
-                metadata_content = f"SINCPRO_MAPPING\n{password}\n"
-                for encoded, original in file_mapping.items():
-                    metadata_content += f"{encoded}:{original}\n"
-
-                metadata_file = temp_path / ".sincpro_metadata"
-                metadata_file.write_text(metadata_content, encoding="utf-8")
-
-                # Crear ZIP normal con archivos codificados
-                with zipfile.ZipFile(
-                    output_file, "w", zipfile.ZIP_DEFLATED, compresslevel=6
-                ) as zip_file:
+            # Los archivos van directo al ZIP con su nombre codificado
+            with self.tracer.span("zip", "proteger") as zip_args:
+                with self.open_writer(output_file, password) as writer:
+                    for entry in iter_files(source_dir):
+                        writer.add_file(entry.relative_path, Path(entry.path))
+                zip_args["archivos"] = writer.files_added
 
-                    # Agregar metadata
-                    zip_file.write(metadata_file, ".sincpro_metadata")
-
-                    # Agregar todos los archivos codificados
-                    for item in temp_path.rglob("*"):
-                        if item.is_file() and item.name != ".sincpro_metadata":
-                            relative_path = item.relative_to(temp_path)
-                            zip_file.write(item, relative_path)
-
-                self.logger.info(
-                    f"Compresión completada: {files_added} archivos en {output_file}"
-                )
-                return True
+            self.logger.info(
+                f"Compresión completada: {writer.files_added} archivos en {output_file}"
+            )
+            return True
 
         except Exception as e:
             self.logger.error(f"Error durante compresión: {e}")
@@ -154,24 +184,21 @@ class ZipCompressionService(CompressionProtocol):
 
                 # Restaurar archivos con nombres originales
                 files_extracted = 0
-                for encoded_file in temp_path.rglob("*"):
-                    if encoded_file.is_file() and encoded_file.name != ".sincpro_metadata":
-                        encoded_relative = encoded_file.relative_to(temp_path)
-                        encoded_name = str(encoded_relative)
+                for entry in iter_files(temp_path):
+                    encoded_name = entry.relative_path
+                    if entry.name != ".sincpro_metadata" and encoded_name in file_mapping:
+                        original_path = output_dir / file_mapping[encoded_name]
 
-                        if encoded_name in file_mapping:
-                            original_path = output_dir / file_mapping[encoded_name]
-
-                            # Asegurar que el directorio padre existe
-                            original_path.parent.mkdir(parents=True, exist_ok=True)
+                        # Asegurar que el directorio padre existe
+                        original_path.parent.mkdir(parents=True, exist_ok=True)
 
-                            # Copiar archivo restaurado
-                            shutil.copy2(encoded_file, original_path)
-                            files_extracted += 1
+                        # Copiar archivo restaurado
+                        shutil.copy2(entry.path, original_path)
+                        files_extracted += 1
 
-                            self.logger.debug(
-                                f"Restaurado: {encoded_name} -> {file_mapping[encoded_name]}"
-                            )
+                        self.logger.debug(
+                            f"Restaurado: {encoded_name} -> {file_mapping[encoded_name]}"
+                        )
 
                 self.logger.info(
                     f"Descompresión completada: {files_extracted} archivos extraídos"
@@ -200,23 +227,3 @@ class ZipCompressionService(CompressionProtocol):
             return f"{hash_hex}.{ext}"
         else:
             return hash_hex
-
-    def _walk_directory(self, directory: Path) -> List[Path]:
-        """
-        Recorre recursivamente un directorio y retorna todos los archivos
-
-        Args:
-            directory: Directorio a recorrer
-
-        Returns:
-            List[Path]: Lista de rutas de archivos
-        """
-        files = []
-        try:
-            for item in directory.rglob("*"):
-                if item.is_file():
-                    files.append(item)
-        except Exception as e:
-            self.logger.error(f"Error recorriendo directorio {directory}: {e}")
-
-        return files
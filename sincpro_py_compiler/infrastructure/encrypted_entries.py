@@ -0,0 +1,358 @@
+"""
+Infraestructura - Contenedor encriptado por archivo con índice (formato .enc versión 3)
+
+    [4 bytes: largo del header][header JSON][---SINCPRO_SEPARATOR---]
+    [entrada 0][entrada 1]...[índice sellado][trailer]
+
+Cada archivo se comprime con zlib por separado (o se guarda tal cual si no se
+reduce) y se sella como un flujo de bloques AES-GCM propio, con un prefijo de
+nonce aleatorio (ver encrypted_stream.ChunkSealer). El índice guarda por
+entrada la ruta, el offset, el tamaño sellado, el tamaño original, el SHA-256,
+mtime, modo y nonce; es JSON comprimido y sellado con su propio nonce. El
+trailer, de tamaño fijo al final del archivo, solo dice dónde está el índice:
+
+    [offset del índice: 8][tamaño del índice: 8][nonce del índice: 8]["SINCIDX3"]
+
+Listar lee el header, el trailer y el índice; leer un miembro lee además solo
+sus bytes. El índice está autenticado, así que una entrada movida, cambiada o
+copiada de otro archivo no se abre.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from .encrypted_stream import (
+    CHUNK_SIZE,
+    CIPHER,
+    NONCE_PREFIX_SIZE,
+    TAG_SIZE,
+    ChunkReader,
+    ChunkSealer,
+    ChunkWriter,
+    ContainerError,
+    _ChunkPipeline,
+    write_header,
+)
+
+FORMAT_VERSION = 3
+LAYOUT = "entries"
+TRAILER = struct.Struct(">QQ8s8s")
+TRAILER_MAGIC = b"SINCIDX3"
+COMPRESSION_LEVEL = 6
+# Datos asociados extra del índice: sus bloques no se confunden con los de una entrada
+INDEX_CONTEXT = b"\x00index"
+
+
+class MemberInfo(NamedTuple):
+    """Entrada del índice de un contenedor versión 3"""
+
+    path: str
+    offset: int  # Posición de la entrada sellada en el archivo
+    size: int  # Bytes sellados en el archivo
+    length: int  # Tamaño original
+    sha256: str
+    mtime: int
+    mode: int
+    compression: str  # "zlib" o "none"
+    nonce: str  # Prefijo de nonce de la entrada (base64 urlsafe)
+
+    def to_dict(self) -> Dict:
+        return self._asdict()
+
+
+def _safe_target(output_dir: Path, member_path: str) -> Path:
+    """Destino de un miembro dentro de output_dir (rechaza rutas absolutas o con ..)"""
+    relative = PurePosixPath(member_path)
+    if relative.is_absolute() or ".." in relative.parts or not relative.parts:
+        raise ContainerError(f"Ruta no válida en el índice: {member_path}")
+    return output_dir.joinpath(*relative.parts)
+
+
+class EntryWriter:
+    """
+    Escribe un contenedor versión 3 entrada por entrada
+
+    Los archivos chicos se comprimen y sellan en hilos (threads > 1) y se escriben
+    en el orden en que se agregaron; los que superan un bloque se procesan en
+    stream. close() escribe el índice y el trailer pero no cierra `stream`.
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        key: bytes,
+        metadata: Dict,
+        chunk_size: int = CHUNK_SIZE,
+        threads: int = 1,
+    ):
+        self._stream = stream
+        self._key = key
+        self._chunk_size = chunk_size
+        self._threads = threads
+        self._header = write_header(
+            stream,
+            {
+                **metadata,
+                "version": FORMAT_VERSION,
+                "layout": LAYOUT,
+                "cipher": CIPHER,
+                "chunk_size": chunk_size,
+            },
+        )
+        self._position = stream.tell()
+        self._pipeline = _ChunkPipeline(threads)
+        self.members: List[MemberInfo] = []
+        self.closed = False
+        self.bytes_in = 0
+
+    def add_bytes(
+        self, path: str, data: bytes, mtime: Optional[float] = None, mode: int = 0o644
+    ) -> None:
+        """Agrega un archivo generado en memoria"""
+        self._pipeline.submit(self._pack, path, data, mtime, mode)
+        self.bytes_in += len(data)
+        while self._pipeline.full:
+            self._write_next()
+
+    def add_file(self, path: str, source: Path) -> None:
+        """Agrega un archivo del disco; si supera un bloque se procesa en stream"""
+        stat = source.stat()
+        if stat.st_size <= self._chunk_size:
+            self.add_bytes(path, source.read_bytes(), stat.st_mtime, stat.st_mode & 0o777)
+            return
+
+        # Las entradas deben quedar en orden: vaciar las pendientes antes
+        while self._pipeline.pending:
+            self._write_next()
+        nonce = os.urandom(NONCE_PREFIX_SIZE)
+        writer = ChunkWriter(
+            self._stream,
+            ChunkSealer(self._key, nonce, self._header),
+            self._chunk_size,
+            self._threads,
+        )
+        compressor = zlib.compressobj(COMPRESSION_LEVEL)
+        digest = hashlib.sha256()
+        length = 0
+        try:
+            with open(source, "rb") as f:
+                while block := f.read(self._chunk_size):
+                    digest.update(block)
+                    length += len(block)
+                    writer.write(compressor.compress(block))
+            writer.write(compressor.flush())
+            writer.close()
+        except BaseException:
+            writer.abort()
+            raise
+        self._record(
+            MemberInfo(
+                path,
+                self._position,
+                writer.bytes_out,
+                length,
+                digest.hexdigest(),
+                int(stat.st_mtime),
+                stat.st_mode & 0o777,
+                "zlib",
+                urlsafe_b64encode(nonce).decode("utf-8"),
+            )
+        )
+        self.bytes_in += length
+
+    def close(self) -> None:
+        """Escribe las entradas pendientes, el índice sellado y el trailer"""
+        if self.closed:
+            return
+        try:
+            while self._pipeline.pending:
+                self._write_next()
+        finally:
+            self._pipeline.shutdown()
+
+        index = json.dumps(
+            {"members": [member.to_dict() for member in self.members]},
+            separators=(",", ":"),
+        ).encode("utf-8")
+        nonce = os.urandom(NONCE_PREFIX_SIZE)
+        sealer = ChunkSealer(self._key, nonce, self._header + INDEX_CONTEXT)
+        sealed = sealer.seal_all(zlib.compress(index, COMPRESSION_LEVEL), self._chunk_size)
+        self._stream.write(sealed)
+        self._stream.write(TRAILER.pack(self._position, len(sealed), nonce, TRAILER_MAGIC))
+        self.closed = True
+
+    def abort(self) -> None:
+        """Descarta las entradas pendientes y libera los hilos"""
+        self._pipeline.shutdown()
+        self.closed = True
+
+    def _pack(
+        self, path: str, data: bytes, mtime: Optional[float], mode: int
+    ) -> Tuple[MemberInfo, bytes]:
+        """Comprime y sella una entrada (corre en los hilos del pipeline)"""
+        payload = zlib.compress(data, COMPRESSION_LEVEL)
+        compression = "zlib"
+        if len(payload) >= len(data):
+            payload, compression = data, "none"
+        nonce = os.urandom(NONCE_PREFIX_SIZE)
+        sealed = ChunkSealer(self._key, nonce, self._header).seal_all(
+            payload, self._chunk_size
+        )
+        member = MemberInfo(
+            path,
+            0,
+            len(sealed),
+            len(data),
+            hashlib.sha256(data).hexdigest(),
+            int(time.time() if mtime is None else mtime),
+            mode,
+            compression,
+            urlsafe_b64encode(nonce).decode("utf-8"),
+        )
+        return member, sealed
+
+    def _write_next(self) -> None:
+        member, sealed = self._pipeline.pending.popleft().result()
+        self._record(member._replace(offset=self._position))
+        self._stream.write(sealed)
+
+    def _record(self, member: MemberInfo) -> None:
+        self.members.append(member)
+        self._position = member.offset + member.size
+
+
+class EntryReader:
+    """
+    Acceso aleatorio a un contenedor versión 3
+
+    Lee el trailer y el índice al abrirse; después cada lectura toca solo los
+    bytes del miembro pedido. Es seguro leer desde varios hilos.
+    """
+
+    def __init__(self, path: Path, key: bytes, metadata: Dict, header: bytes):
+        if metadata.get("version") != FORMAT_VERSION or metadata.get("cipher") != CIPHER:
+            raise ContainerError(
+                f"Versión de contenedor no soportada: {metadata.get('version')}"
+            )
+        self.path = path
+        self._key = key
+        self._header = header
+        self._chunk_size = int(metadata["chunk_size"])
+        self._lock = threading.Lock()
+        self._file = open(path, "rb")
+        try:
+            self.members = self._read_index()
+        except BaseException:
+            self._file.close()
+            raise
+        self._by_path = {member.path: member for member in self.members}
+
+    def _read_index(self) -> List[MemberInfo]:
+        self._file.seek(0, os.SEEK_END)
+        if self._file.tell() < TRAILER.size:
+            raise ContainerError("Archivo truncado")
+        self._file.seek(-TRAILER.size, os.SEEK_END)
+        offset, size, nonce, magic = TRAILER.unpack(self._file.read(TRAILER.size))
+        if magic != TRAILER_MAGIC:
+            raise ContainerError("Archivo truncado: no se encontró el índice")
+        self._file.seek(offset)
+        sealed = self._file.read(size)
+        sealer = ChunkSealer(self._key, nonce, self._header + INDEX_CONTEXT)
+        index = json.loads(zlib.decompress(sealer.open_all(sealed, self._chunk_size)))
+        return [MemberInfo(**member) for member in index["members"]]
+
+    def get(self, member: Union[str, MemberInfo]) -> MemberInfo:
+        """Entrada del índice de un miembro; KeyError si no existe"""
+        if isinstance(member, MemberInfo):
+            return member
+        try:
+            return self._by_path[member]
+        except KeyError:
+            raise KeyError(f"Miembro no encontrado: {member}") from None
+
+    def read(self, member: Union[str, MemberInfo]) -> bytes:
+        """Contenido de un miembro, verificado contra el SHA-256 del índice"""
+        info = self.get(member)
+        with self._lock:
+            self._file.seek(info.offset)
+            sealed = self._file.read(info.size)
+        payload = self._sealer(info).open_all(sealed, self._chunk_size)
+        data = zlib.decompress(payload) if info.compression == "zlib" else payload
+        self._check(info, len(data), hashlib.sha256(data).hexdigest())
+        return data
+
+    def extract(
+        self,
+        output_dir: Path,
+        members: Optional[Iterable[Union[str, MemberInfo]]] = None,
+        threads: int = 1,
+    ) -> int:
+        """Extrae los miembros pedidos (todos por defecto); devuelve cuántos"""
+        selected = self.members if members is None else [self.get(m) for m in members]
+        targets = [(info, _safe_target(output_dir, info.path)) for info in selected]
+        if threads > 1 and len(targets) > 1:
+            with ThreadPoolExecutor(threads, thread_name_prefix="sincpro-extract") as pool:
+                for _ in pool.map(lambda item: self._extract_one(*item), targets):
+                    pass
+        else:
+            for info, target in targets:
+                self._extract_one(info, target)
+        return len(targets)
+
+    def _extract_one(self, info: MemberInfo, target: Path) -> None:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if info.size <= self._chunk_size + TAG_SIZE:
+            target.write_bytes(self.read(info))
+        else:
+            self._extract_streamed(info, target)
+        os.chmod(target, info.mode)
+        os.utime(target, (info.mtime, info.mtime))
+
+    def _extract_streamed(self, info: MemberInfo, target: Path) -> None:
+        """Extrae un miembro grande de a un bloque, con su propio descriptor"""
+        digest = hashlib.sha256()
+        length = 0
+        decompressor = zlib.decompressobj() if info.compression == "zlib" else None
+        with open(self.path, "rb") as source, open(target, "wb") as out:
+            source.seek(info.offset)
+            reader = ChunkReader(
+                source, self._sealer(info), self._chunk_size, limit=info.size
+            )
+            while block := reader.read(self._chunk_size):
+                if decompressor is not None:
+                    block = decompressor.decompress(block)
+                digest.update(block)
+                length += len(block)
+                out.write(block)
+            reader.verify_end()
+            if decompressor is not None:
+                tail = decompressor.flush()
+                digest.update(tail)
+                length += len(tail)
+                out.write(tail)
+        self._check(info, length, digest.hexdigest())
+
+    def _sealer(self, info: MemberInfo) -> ChunkSealer:
+        return ChunkSealer(self._key, urlsafe_b64decode(info.nonce), self._header)
+
+    def _check(self, info: MemberInfo, length: int, sha256: str) -> None:
+        if length != info.length or sha256 != info.sha256:
+            raise ContainerError(f"El contenido de {info.path} no coincide con el índice")
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "EntryReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
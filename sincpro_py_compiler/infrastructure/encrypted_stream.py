@@ -0,0 +1,379 @@
+"""
+Infraestructura - Contenedor encriptado por bloques (formato .enc versión 2)
+
+    [4 bytes: largo del header][header JSON][---SINCPRO_SEPARATOR---]
+    [bloque 0][bloque 1]...[bloque final]
+
+El header conserva el sobre del formato original (así detect_protection_method
+lo reconoce igual) y agrega version, cipher, chunk_size, salt y nonce. El
+contenido (el tar.gz) se corta en bloques de `chunk_size` bytes; cada bloque se
+encripta por separado con AES-256-GCM:
+
+- nonce = prefijo aleatorio del archivo (8 bytes) + índice del bloque (4 bytes)
+- datos asociados = índice (8 bytes) + marca de bloque final (1 byte) + header
+
+Un bloque reordenado, duplicado, truncado o copiado de otro archivo no pasa la
+verificación, y cortar el archivo en un límite de bloque se detecta porque el
+último bloque leído no lleva la marca de final. Solo el bloque final puede ser
+más corto que `chunk_size` (puede estar vacío), así que el lector sabe dónde
+termina cada bloque sin prefijos de largo.
+
+Encriptar y desencriptar recorren el contenido de a un bloque: la memoria usada
+no depende del tamaño del archivo. ChunkSealer, ChunkWriter y ChunkReader son
+también los flujos de cada entrada del contenedor versión 3 (ver
+encrypted_entries). Como cada bloque es independiente, con
+`threads` > 1 se sellan o abren varios en paralelo (AES-GCM libera el GIL) con
+una ventana acotada de bloques en vuelo; la escritura y la entrega de los datos
+siguen el orden de los índices.
+"""
+
+import io
+import json
+import os
+import struct
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import BinaryIO, Callable, Deque, Dict, Optional, Tuple
+
+try:
+    from cryptography.exceptions import InvalidTag
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+except ImportError:  # El servicio de encriptación valida CRYPTO_AVAILABLE
+    AESGCM = None  # ChunkSealer exige cryptography
+    InvalidTag = ValueError  # Nunca se lanza: sin AESGCM no hay bloques que abrir
+
+SEPARATOR = b"---SINCPRO_SEPARATOR---"
+FORMAT_VERSION = 2
+CIPHER = "AES-256-GCM"
+CHUNK_SIZE = 1024 * 1024
+TAG_SIZE = 16
+NONCE_PREFIX_SIZE = 8
+# El índice del bloque ocupa los 4 bytes restantes del nonce de 12
+MAX_CHUNKS = 2**32
+# Bloques en vuelo por hilo: acota la memoria a threads * 2 * chunk_size
+CHUNKS_PER_THREAD = 2
+
+
+class ContainerError(ValueError):
+    """Archivo encriptado con formato inválido, corrupto o contraseña incorrecta"""
+
+
+def write_header(stream: BinaryIO, metadata: Dict) -> bytes:
+    """Escribe el sobre del header y devuelve sus bytes (para los datos asociados)"""
+    header = json.dumps(metadata, sort_keys=True).encode("utf-8")
+    stream.write(len(header).to_bytes(4, "big"))
+    stream.write(header)
+    stream.write(SEPARATOR)
+    return header
+
+
+def read_header(stream: BinaryIO) -> Tuple[Dict, bytes]:
+    """Lee el sobre del header (de cualquier versión) y devuelve metadata y bytes"""
+    header_size = int.from_bytes(stream.read(4), "big")
+    header = stream.read(header_size)
+    if len(header) != header_size or stream.read(len(SEPARATOR)) != SEPARATOR:
+        raise ContainerError("Formato de archivo inválido")
+    try:
+        return json.loads(header.decode("utf-8")), header
+    except ValueError as e:
+        raise ContainerError(f"Header inválido: {e}") from None
+
+
+class ChunkSealer:
+    """
+    Sella y abre los bloques de un flujo con AES-GCM
+
+    nonce = `nonce_prefix` (8 bytes) + índice del bloque; los datos asociados
+    son el índice, la marca de bloque final y `associated` (el header del
+    archivo), así un bloque no se puede mover a otra posición ni a otro archivo.
+    """
+
+    def __init__(self, key: bytes, nonce_prefix: bytes, associated: bytes):
+        if AESGCM is None:
+            raise ImportError("cryptography package is required")
+        self._aead = AESGCM(key)
+        self.nonce_prefix = nonce_prefix
+        self._associated = associated
+
+    def seal(self, index: int, plaintext: bytes, final: bool) -> bytes:
+        return self._aead.encrypt(
+            self._nonce(index), plaintext, self._associated_data(index, final)
+        )
+
+    def open(self, index: int, sealed: bytes, final: bool) -> bytes:
+        try:
+            return self._aead.decrypt(
+                self._nonce(index), sealed, self._associated_data(index, final)
+            )
+        except InvalidTag:
+            raise ContainerError("Contraseña incorrecta o archivo corrupto") from None
+
+    def seal_all(self, data: bytes, chunk_size: int) -> bytes:
+        """Sella un contenido en memoria con el mismo corte que ChunkWriter"""
+        count = len(data) // chunk_size + 1
+        return b"".join(
+            self.seal(i, data[i * chunk_size : (i + 1) * chunk_size], i == count - 1)
+            for i in range(count)
+        )
+
+    def open_all(self, sealed: bytes, chunk_size: int) -> bytes:
+        """Abre un flujo completo leído en memoria (ver seal_all)"""
+        reader = ChunkReader(io.BytesIO(sealed), self, chunk_size)
+        data = reader.read()
+        reader.verify_end()
+        return data
+
+    def _nonce(self, index: int) -> bytes:
+        return self.nonce_prefix + index.to_bytes(4, "big")
+
+    def _associated_data(self, index: int, final: bool) -> bytes:
+        return struct.pack(">QB", index, final) + self._associated
+
+
+class _ChunkPipeline:
+    """Ejecuta el sellado/apertura de bloques en hilos, entregando en orden"""
+
+    def __init__(self, threads: int):
+        self._pool = (
+            ThreadPoolExecutor(threads, thread_name_prefix="sincpro-crypto")
+            if threads > 1
+            else None
+        )
+        self._window = threads * CHUNKS_PER_THREAD
+        self.pending: Deque[Future] = deque()
+
+    def submit(self, fn: Callable, *args) -> None:
+        if self._pool is not None:
+            self.pending.append(self._pool.submit(fn, *args))
+            return
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+        self.pending.append(future)
+
+    @property
+    def full(self) -> bool:
+        return len(self.pending) >= max(self._window, 1)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        self.pending.clear()
+
+
+class ChunkWriter:
+    """
+    Archivo de solo escritura que sella por bloques hacia `stream`
+
+    close() emite el bloque final pero no cierra `stream`. Si el build falla,
+    abort() libera los hilos sin terminar el flujo.
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        sealer: ChunkSealer,
+        chunk_size: int = CHUNK_SIZE,
+        threads: int = 1,
+    ):
+        self._stream = stream
+        self._sealer = sealer
+        self._chunk_size = chunk_size
+        self._buffer = bytearray()
+        self._index = 0
+        self._pipeline = _ChunkPipeline(threads)
+        self._aborted = False
+        self.closed = False
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def write(self, data: bytes) -> int:
+        if self._aborted:
+            return len(data)  # tarfile todavía puede vaciar su buffer al destruirse
+        if self.closed:
+            raise ValueError("Escritura sobre un contenedor cerrado")
+        self._buffer += data
+        self.bytes_in += len(data)
+        # Un bloque lleno no es final hasta saber que sigue algo (ver close)
+        while len(self._buffer) > self._chunk_size:
+            self._submit(bytes(self._buffer[: self._chunk_size]), final=False)
+            del self._buffer[: self._chunk_size]
+        return len(data)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            if len(self._buffer) == self._chunk_size:
+                self._submit(bytes(self._buffer), final=False)
+                self._buffer.clear()
+            self._submit(bytes(self._buffer), final=True)
+            self._buffer.clear()
+            while self._pipeline.pending:
+                self._write_next()
+        finally:
+            self._pipeline.shutdown()
+        self.closed = True
+
+    def abort(self) -> None:
+        """Descarta los bloques pendientes y libera los hilos"""
+        self._pipeline.shutdown()
+        self._aborted = self.closed = True
+
+    def _submit(self, plaintext: bytes, final: bool) -> None:
+        if self._index >= MAX_CHUNKS:
+            raise ContainerError("Contenido demasiado grande para el contenedor")
+        self._pipeline.submit(self._sealer.seal, self._index, plaintext, final)
+        self._index += 1
+        while self._pipeline.full:
+            self._write_next()
+
+    def _write_next(self) -> None:
+        sealed = self._pipeline.pending.popleft().result()
+        self._stream.write(sealed)
+        self.bytes_out += len(sealed)
+
+
+class ChunkEncryptor(ChunkWriter):
+    """
+    Contenedor versión 2: header seguido de un único flujo de bloques
+
+    Se le pasa a tarfile (modo "w|gz") como fileobj. Escribe el header al crearse.
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        key: bytes,
+        metadata: Dict,
+        chunk_size: int = CHUNK_SIZE,
+        threads: int = 1,
+    ):
+        nonce_prefix = os.urandom(NONCE_PREFIX_SIZE)
+        header = write_header(
+            stream,
+            {
+                **metadata,
+                "version": FORMAT_VERSION,
+                "cipher": CIPHER,
+                "chunk_size": chunk_size,
+                "nonce": urlsafe_b64encode(nonce_prefix).decode("utf-8"),
+            },
+        )
+        super().__init__(stream, ChunkSealer(key, nonce_prefix, header), chunk_size, threads)
+
+
+class ChunkReader:
+    """
+    Archivo de solo lectura que abre por bloques desde `stream`
+
+    Solo entrega datos de bloques verificados. `limit` acota los bytes sellados
+    del flujo cuando le siguen otros datos (p. ej. una entrada del contenedor por
+    archivo). Con threads > 1 lee por adelantado y abre varios bloques en
+    paralelo; close() libera los hilos.
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        sealer: ChunkSealer,
+        chunk_size: int,
+        threads: int = 1,
+        limit: Optional[int] = None,
+    ):
+        self._stream = stream
+        self._sealer = sealer
+        self._sealed_size = chunk_size + TAG_SIZE
+        self._remaining = limit
+        self._buffer = b""
+        self._offset = 0
+        self._index = 0
+        self._pipeline = _ChunkPipeline(threads)
+        # Ya se leyó del disco el bloque final / ya se entregó al lector
+        self._final_read = False
+        self._finished = False
+
+    def read(self, size: int = -1) -> bytes:
+        parts = []
+        wanted = size if size is not None and size >= 0 else None
+        while wanted is None or wanted > 0:
+            if self._offset == len(self._buffer):
+                if self._finished:
+                    break
+                self._buffer, self._offset = self._open_next(), 0
+                continue
+            end = len(self._buffer) if wanted is None else self._offset + wanted
+            part = self._buffer[self._offset : end]
+            self._offset += len(part)
+            if wanted is not None:
+                wanted -= len(part)
+            parts.append(part)
+        return b"".join(parts)
+
+    def _open_next(self) -> bytes:
+        while not self._final_read and (
+            not self._pipeline.pending or not self._pipeline.full
+        ):
+            self._read_ahead()
+        if not self._pipeline.pending:
+            raise ContainerError("Archivo truncado")
+        plaintext, final = self._pipeline.pending.popleft().result()
+        self._finished = final
+        return plaintext
+
+    def _read_ahead(self) -> None:
+        """Lee el siguiente bloque sellado y lo encola para abrirlo"""
+        size = self._sealed_size
+        if self._remaining is not None:
+            size = min(size, self._remaining)
+        sealed = self._stream.read(size)
+        if self._remaining is not None:
+            self._remaining -= len(sealed)
+        final = len(sealed) < self._sealed_size
+        if len(sealed) < TAG_SIZE:
+            raise ContainerError("Archivo truncado")
+        self._pipeline.submit(self._open, self._index, sealed, final)
+        self._index += 1
+        self._final_read = final
+
+    def _open(self, index: int, sealed: bytes, final: bool) -> Tuple[bytes, bool]:
+        return self._sealer.open(index, sealed, final), final
+
+    def verify_end(self) -> None:
+        """Lee hasta el bloque final: confirma que el flujo no fue truncado"""
+        while not self._finished:
+            self._open_next()
+        extra = self._remaining if self._remaining is not None else len(self._stream.read(1))
+        if extra:
+            raise ContainerError("Datos extra después del bloque final")
+
+    def close(self) -> None:
+        self._pipeline.shutdown()
+
+
+class ChunkDecryptor(ChunkReader):
+    """
+    Lector del contenedor versión 2
+
+    Se construye con el header ya leído (ver read_header); se le pasa a tarfile
+    en modo "r|gz".
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        key: bytes,
+        metadata: Dict,
+        header: bytes,
+        threads: int = 1,
+    ):
+        if metadata.get("version") != FORMAT_VERSION or metadata.get("cipher") != CIPHER:
+            raise ContainerError(
+                f"Versión de contenedor no soportada: {metadata.get('version')}"
+            )
+        sealer = ChunkSealer(key, urlsafe_b64decode(metadata["nonce"]), header)
+        super().__init__(stream, sealer, int(metadata["chunk_size"]), threads)
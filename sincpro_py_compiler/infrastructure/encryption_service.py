@@ -1,30 +1,69 @@
 """
 Infraestructura - Servicio de encriptación simple
+
+Los archivos nuevos usan el contenedor por archivo con índice (versión 3, ver
+encrypted_entries): listar, leer un miembro o extraer algunos solo desencripta
+los bytes necesarios. Los .enc de un único flujo por bloques (versión 2) y los
+del formato original (un token Fernet sobre el tar.gz, versión 1) se siguen
+pudiendo desencriptar.
+
+Las claves se derivan a través de una KeyCache (ver key_derivation): el KDF
+corre una vez por contraseña y salt en todo el proceso.
 """
 
-import json
+import io
 import logging
+import os
 import tarfile
 from base64 import urlsafe_b64decode, urlsafe_b64encode
 from pathlib import Path
+from typing import IO, BinaryIO, Collection, Dict, List, Optional, Union, cast
 
 try:
-    from cryptography.fernet import Fernet
-    from cryptography.hazmat.primitives import hashes
-    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+    from cryptography.fernet import Fernet, InvalidToken
 
     CRYPTO_AVAILABLE = True
 except ImportError:
     CRYPTO_AVAILABLE = False
+    Fernet = None
+    InvalidToken = ValueError  # Nunca se lanza: sin Fernet no hay tokens que abrir
 
 from ..domain.security_service import EncryptionProtocol
+from .build_tracer import BuildTracer
+from .encrypted_entries import EntryReader, EntryWriter, MemberInfo
+from .encrypted_stream import ChunkDecryptor, ContainerError, read_header
+from .key_derivation import (
+    DEFAULT_KDF,
+    SALT_SIZE,
+    KdfParams,
+    KeyCache,
+    archive_key,
+    shared_key_cache,
+)
+from .tree_walker import iter_files
+
+# Salt fijo del formato original (versión 1)
+LEGACY_SALT = b"sincpro_compiler_salt_2025"
 
 
 class SimpleEncryptionService(EncryptionProtocol):
-    """Implementación de encriptación simple usando Fernet"""
-
-    def __init__(self):
+    """Implementación de encriptación simple: archivos comprimidos y sellados con AES-GCM"""
+
+    def __init__(
+        self,
+        tracer: Optional[BuildTracer] = None,
+        crypto_threads: int = 1,
+        kdf: Optional[KdfParams] = None,
+        key_cache: Optional[KeyCache] = None,
+    ):
         self.logger = logging.getLogger(__name__)
+        self.tracer = tracer or BuildTracer(enabled=False)
+        # Hilos que sellan/abren bloques en paralelo (0 = todos los CPUs)
+        self.crypto_threads = crypto_threads or os.cpu_count() or 1
+        # KDF de los archivos nuevos; al leer se usa el del header
+        self.kdf = kdf or DEFAULT_KDF
+        self.kdf.validate()
+        self.key_cache = key_cache or shared_key_cache()
 
         if not CRYPTO_AVAILABLE:
             raise ImportError(
@@ -32,6 +71,10 @@ class SimpleEncryptionService(EncryptionProtocol):
                 "Install with: pip install cryptography"
             )
 
+    def open_writer(self, output_file: Path, password: str) -> "EncryptedArchiveWriter":
+        """Abre un archivo encriptado para agregar archivos a medida que se producen"""
+        return EncryptedArchiveWriter(output_file, password, self)
+
     def encrypt_directory(self, source_dir: Path, output_file: Path, password: str) -> bool:
         """
         Encripta un directorio completo en un archivo protegido
@@ -45,57 +88,15 @@ class SimpleEncryptionService(EncryptionProtocol):
             bool: True si la encriptación fue exitosa
         """
         try:
-            # Asegurar que el directorio de salida existe
-            output_file.parent.mkdir(parents=True, exist_ok=True)
-
-            # Generar clave de encriptación desde contraseña
-            salt = b"sincpro_compiler_salt_2025"  # Salt fijo para reproducibilidad
-            fernet = self._generate_fernet_key(password, salt)
-
-            # Crear archivo tar temporal en memoria
-            import io
-
-            tar_buffer = io.BytesIO()
-
-            with tarfile.open(mode="w:gz", fileobj=tar_buffer) as tar:
-                # Agregar todos los archivos del directorio
-                files_added = 0
-                for file_path in self._walk_directory(source_dir):
-                    if file_path.is_file():
-                        # Calcular ruta relativa
-                        relative_path = file_path.relative_to(source_dir)
-
-                        # Agregar archivo al tar
-                        tar.add(file_path, arcname=relative_path)
-                        files_added += 1
-
-                        self.logger.debug(f"Agregado al archivo: {relative_path}")
-
-            # Obtener datos del tar
-            tar_data = tar_buffer.getvalue()
-            tar_buffer.close()
-
-            # Encriptar los datos
-            encrypted_data = fernet.encrypt(tar_data)
-
-            # Crear metadata
-            metadata = {
-                "method": "encrypt",
-                "salt": urlsafe_b64encode(salt).decode("utf-8"),
-                "files_count": files_added,
-            }
-
-            # Escribir archivo final con metadata y datos encriptados
-            with open(output_file, "wb") as f:
-                # Escribir metadata como JSON seguido de separador
-                metadata_json = json.dumps(metadata).encode("utf-8")
-                f.write(len(metadata_json).to_bytes(4, "big"))
-                f.write(metadata_json)
-                f.write(b"---SINCPRO_SEPARATOR---")
-                f.write(encrypted_data)
+            with self.open_writer(output_file, password) as writer:
+                with self.tracer.span("tar", "proteger") as tar_args:
+                    # Agregar todos los archivos del directorio
+                    for entry in iter_files(source_dir):
+                        writer.add_file(entry.relative_path, Path(entry.path))
+                    tar_args["archivos"] = writer.files_added
 
             self.logger.info(
-                f"Encriptación completada: {files_added} archivos en {output_file}"
+                f"Encriptación completada: {writer.files_added} archivos en {output_file}"
             )
             return True
 
@@ -115,6 +116,24 @@ class SimpleEncryptionService(EncryptionProtocol):
         Returns:
             bool: True si la desencriptación fue exitosa
         """
+        return self.extract(encrypted_file, output_dir, password)
+
+    def extract(
+        self,
+        encrypted_file: Path,
+        output_dir: Path,
+        password: str,
+        members: Optional[Collection[str]] = None,
+    ) -> bool:
+        """
+        Extrae todos los archivos o solo `members` (rutas relativas del archivo)
+
+        Con el contenedor versión 3 solo se leen y desencriptan los miembros
+        pedidos; con las versiones anteriores se recorre el archivo completo.
+
+        Returns:
+            bool: True si se extrajeron todos los miembros pedidos
+        """
         try:
             # Verificar que el archivo existe
             if not encrypted_file.exists():
@@ -124,57 +143,141 @@ class SimpleEncryptionService(EncryptionProtocol):
             # Crear directorio de salida
             output_dir.mkdir(parents=True, exist_ok=True)
 
-            # Leer archivo encriptado
             with open(encrypted_file, "rb") as f:
-                # Leer tamaño de metadata
-                metadata_size = int.from_bytes(f.read(4), "big")
-
-                # Leer metadata
-                metadata_json = f.read(metadata_size)
-                metadata = json.loads(metadata_json.decode("utf-8"))
-
-                # Leer separador
-                separator = f.read(len(b"---SINCPRO_SEPARATOR---"))
-                if separator != b"---SINCPRO_SEPARATOR---":
-                    raise ValueError("Formato de archivo inválido")
-
-                # Leer datos encriptados
-                encrypted_data = f.read()
-
-            # Generar clave de desencriptación
-            salt = urlsafe_b64decode(metadata["salt"].encode("utf-8"))
-            fernet = self._generate_fernet_key(password, salt)
-
-            # Desencriptar datos
-            try:
-                decrypted_data = fernet.decrypt(encrypted_data)
-            except Exception:
-                self.logger.error("Contraseña incorrecta o archivo corrupto")
-                return False
-
-            # Extraer archivo tar
-            import io
-
-            tar_buffer = io.BytesIO(decrypted_data)
-
-            with tarfile.open(mode="r:gz", fileobj=tar_buffer) as tar:
-                tar.extractall(output_dir)
-                files_extracted = len(tar.getnames())
-
-            tar_buffer.close()
+                metadata, header = read_header(f)
+                version = metadata.get("version", 1)
+                if version >= 3:
+                    with self._open_entries(
+                        encrypted_file, password, metadata, header
+                    ) as reader:
+                        files_extracted = reader.extract(
+                            output_dir, members, threads=self.crypto_threads
+                        )
+                else:
+                    if version == 1:
+                        tar_data = self._decrypt_legacy(f, metadata, password)
+                        tar = tarfile.open(mode="r:gz", fileobj=io.BytesIO(tar_data))
+                        decryptor = None
+                    else:
+                        key = self._derive_key_traced(password, metadata)
+                        decryptor = ChunkDecryptor(
+                            f, key, metadata, header, threads=self.crypto_threads
+                        )
+                        # Cada bloque se verifica antes de entregarlo a tarfile; en
+                        # modo "r|" tarfile solo llama a read()
+                        tar = tarfile.open(mode="r|gz", fileobj=cast(IO[bytes], decryptor))
+                    try:
+                        files_extracted = self._extract_tar(tar, output_dir, members)
+                        if decryptor is not None:
+                            decryptor.verify_end()
+                    finally:
+                        tar.close()
+                        if decryptor is not None:
+                            decryptor.close()
 
             self.logger.info(
                 f"Desencriptación completada: {files_extracted} archivos extraídos"
             )
             return True
 
+        except KeyError as e:
+            self.logger.error(str(e).strip("'\""))
+            return False
+        except ContainerError as e:
+            self.logger.error(str(e))
+            return False
         except Exception as e:
             self.logger.error(f"Error durante desencriptación: {e}")
             return False
 
+    def open_reader(self, encrypted_file: Path, password: str) -> EntryReader:
+        """
+        Abre un .enc versión 3 para leer miembros sueltos
+
+        El reader conserva la clave y el índice: conviene para varias lecturas
+        sobre el mismo archivo. Cerrarlo (o usarlo como context manager) al terminar.
+
+        Raises:
+            ContainerError: formato sin índice, contraseña incorrecta o archivo corrupto
+        """
+        with open(encrypted_file, "rb") as f:
+            metadata, header = read_header(f)
+        if metadata.get("version", 1) < 3:
+            raise ContainerError(
+                f"{encrypted_file} usa el formato versión {metadata.get('version', 1)}, "
+                "sin índice: vuelva a protegerlo para leer miembros sueltos"
+            )
+        return self._open_entries(encrypted_file, password, metadata, header)
+
+    def list(self, encrypted_file: Path, password: str) -> List[MemberInfo]:
+        """Miembros del archivo según su índice (sin desencriptar los contenidos)"""
+        with self.open_reader(encrypted_file, password) as reader:
+            return reader.members
+
+    def read_member(
+        self, encrypted_file: Path, password: str, member: Union[str, MemberInfo]
+    ) -> bytes:
+        """
+        Contenido de un miembro; solo se leen y desencriptan sus bytes
+
+        Raises:
+            KeyError: el miembro no existe
+        """
+        with self.open_reader(encrypted_file, password) as reader:
+            return reader.read(member)
+
+    def _open_entries(
+        self, encrypted_file: Path, password: str, metadata: Dict, header: bytes
+    ) -> EntryReader:
+        key = self._derive_key_traced(password, metadata)
+        with self.tracer.span("indice", "proteger"):
+            return EntryReader(encrypted_file, key, metadata, header)
+
+    def _derive_key_traced(self, password: str, metadata: Dict) -> bytes:
+        """Clave del archivo según el salt, el KDF y el key_salt de su header"""
+        params = KdfParams.from_dict(metadata.get("kdf"))
+        with self.tracer.span("kdf", "proteger"):
+            key = self._derive_key(password, urlsafe_b64decode(metadata["salt"]), params)
+        if "key_salt" in metadata:
+            key = archive_key(key, urlsafe_b64decode(metadata["key_salt"]))
+        return key
+
+    def _extract_tar(
+        self, tar: tarfile.TarFile, output_dir: Path, members: Optional[Collection[str]]
+    ) -> int:
+        """Extrae un tar (formatos 1 y 2) recorriéndolo en orden"""
+        wanted = None if members is None else set(members)
+        files_extracted = 0
+        for member in tar:
+            if wanted is None or member.name in wanted:
+                tar.extract(member, output_dir)
+                files_extracted += 1
+                if wanted is not None:
+                    wanted.discard(member.name)
+        if wanted:
+            raise KeyError(f"Miembros no encontrados: {', '.join(sorted(wanted))}")
+        return files_extracted
+
+    def _decrypt_legacy(self, stream: BinaryIO, metadata: Dict, password: str) -> bytes:
+        """Desencripta un .enc del formato original (Fernet sobre el tar.gz completo)"""
+        salt = urlsafe_b64decode(metadata["salt"].encode("utf-8"))
+        fernet = self._generate_fernet_key(password, salt)
+        try:
+            return fernet.decrypt(stream.read())
+        except InvalidToken:
+            raise ContainerError("Contraseña incorrecta o archivo corrupto") from None
+
+    def _derive_key(
+        self, password: str, salt: bytes, params: KdfParams = DEFAULT_KDF
+    ) -> bytes:
+        """Deriva una clave de 32 bytes desde la contraseña (vía la caché de claves)"""
+        if not CRYPTO_AVAILABLE:
+            raise ImportError("cryptography package is required")
+        return self.key_cache.derive(password, salt, params)
+
     def _generate_fernet_key(self, password: str, salt: bytes):
         """
-        Genera una clave Fernet desde contraseña usando PBKDF2
+        Genera una clave Fernet desde contraseña (PBKDF2 del formato original)
 
         Args:
             password: Contraseña del usuario
@@ -183,34 +286,83 @@ class SimpleEncryptionService(EncryptionProtocol):
         Returns:
             Fernet: Instancia de Fernet para encriptación/desencriptación
         """
-        if not CRYPTO_AVAILABLE:
+        if Fernet is None:
             raise ImportError("cryptography package is required")
+        return Fernet(urlsafe_b64encode(self._derive_key(password, salt)))
 
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        key = urlsafe_b64encode(kdf.derive(password.encode("utf-8")))
-        return Fernet(key)
 
-    def _walk_directory(self, directory: Path) -> list[Path]:
-        """
-        Recorre recursivamente un directorio y retorna todos los archivos
+class EncryptedArchiveWriter:
+    """
+    Escribe un archivo encriptado entrada por entrada, sin árbol temporal
 
-        Args:
-            directory: Directorio a recorrer
+    Cada archivo se comprime y sella a medida que se agrega (ver
+    encrypted_entries), así la memoria usada no depende del tamaño del archivo.
+    Usar como context manager: si el bloque falla, se borra el archivo incompleto.
+    """
 
-        Returns:
-            List[Path]: Lista de rutas de archivos
-        """
-        files = []
-        try:
-            for item in directory.rglob("*"):
-                if item.is_file():
-                    files.append(item)
-        except Exception as e:
-            self.logger.error(f"Error recorriendo directorio {directory}: {e}")
+    def __init__(self, output_file: Path, password: str, service: SimpleEncryptionService):
+        self.output_file = output_file
+        self.service = service
+        self.files_added = 0
+
+        # El salt del KDF se reutiliza en el proceso (la clave derivada queda en
+        # caché); key_salt hace que cada archivo tenga su propia clave
+        salt = service.key_cache.writer_salt(password, service.kdf)
+        key_salt = os.urandom(SALT_SIZE)
+        with service.tracer.span("kdf", "proteger"):
+            key = archive_key(service._derive_key(password, salt, service.kdf), key_salt)
 
-        return files
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(output_file, "wb")
+        try:
+            self._entries = EntryWriter(
+                self._file,
+                key,
+                {
+                    "method": "encrypt",
+                    "salt": urlsafe_b64encode(salt).decode("utf-8"),
+                    "kdf": service.kdf.to_dict(),
+                    "key_salt": urlsafe_b64encode(key_salt).decode("utf-8"),
+                },
+                threads=service.crypto_threads,
+            )
+        except BaseException:
+            self._file.close()
+            output_file.unlink(missing_ok=True)
+            raise
+
+    def add_file(self, relative_path: str, path: Path) -> None:
+        """Agrega un archivo del disco"""
+        self._entries.add_file(relative_path, path)
+        self.files_added += 1
+        self.service.logger.debug(f"Agregado al archivo: {relative_path}")
+
+    def add_bytes(
+        self, relative_path: str, data: bytes, mtime: Optional[float] = None
+    ) -> None:
+        """Agrega un archivo generado en memoria (p. ej. un .pyc)"""
+        self._entries.add_bytes(relative_path, data, mtime)
+        self.files_added += 1
+        self.service.logger.debug(f"Agregado al archivo: {relative_path}")
+
+    def close(self) -> None:
+        """Escribe las entradas pendientes, el índice y el trailer"""
+        with self.service.tracer.span("encriptar", "proteger") as span_args:
+            self._entries.close()
+            span_args["bytes"] = self._entries.bytes_in
+        self._file.close()
+
+    def abort(self) -> None:
+        """Descarta el archivo incompleto"""
+        self._entries.abort()
+        self._file.close()
+        self.output_file.unlink(missing_ok=True)
+
+    def __enter__(self) -> "EncryptedArchiveWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -3,10 +3,11 @@ Implementación concreta para manejo de archivos
 """
 
 import logging
-import os
-import shutil
 from pathlib import Path
-from typing import List
+from typing import List, Optional
+
+from .file_transfer import LINK_MODES, transfer_file
+from .tree_walker import iter_files
 
 logger = logging.getLogger(__name__)
 
@@ -14,16 +15,35 @@ logger = logging.getLogger(__name__)
 class FileManager:
     """Implementación concreta para operaciones de archivos"""
 
+    def __init__(self, link_mode: str = "copy"):
+        """
+        Args:
+            link_mode: Cómo se transfieren los archivos copiados: copy, hardlink,
+                reflink o auto (ver file_transfer)
+        """
+        if link_mode not in LINK_MODES:
+            raise ValueError(f"Modo de enlace no soportado: {link_mode}")
+        self.link_mode = link_mode
+
     def copy_file(self, source: Path, destination: Path) -> bool:
         """Copia un archivo preservando metadatos"""
+        return self.transfer_file(source, destination) is not None
+
+    def transfer_file(self, source: Path, destination: Path) -> Optional[str]:
+        """
+        Copia o enlaza un archivo según link_mode
+
+        Returns:
+            Método usado (reflink, hardlink, copy_file_range, sendfile, copy) o None
+            si falló
+        """
         try:
-            destination.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(str(source), str(destination))
-            logger.debug(f"Copiado: {source.name}")
-            return True
+            method = transfer_file(source, destination, self.link_mode)
+            logger.debug(f"Copiado ({method}): {source.name}")
+            return method
         except Exception as e:
             logger.error(f"Error copiando {source}: {e}")
-            return False
+            return None
 
     def create_directory(self, directory: Path) -> bool:
         """Crea un directorio si no existe"""
@@ -36,11 +56,4 @@ class FileManager:
 
     def walk_directory(self, directory: Path) -> List[Path]:
         """Recorre un directorio y retorna lista de archivos"""
-        files = []
-        try:
-            for root, dirs, file_names in os.walk(directory):
-                for file_name in file_names:
-                    files.append(Path(root) / file_name)
-        except Exception as e:
-            logger.error(f"Error recorriendo directorio {directory}: {e}")
-        return files
+        return [Path(entry.path) for entry in iter_files(directory, sort=False)]
@@ -0,0 +1,210 @@
+"""
+Infraestructura - Observación de cambios en el árbol fuente
+
+Usa inotify en Linux (vía ctypes, sin dependencias externas) y un sondeo
+periódico de mtime/tamaño en el resto de plataformas o si inotify falla.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+DirFilter = Callable[[Path], bool]
+
+# Constantes de <sys/inotify.h>
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (
+    IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+# Ventana para agrupar ráfagas de eventos (p. ej. un editor que guarda en varios pasos)
+DEBOUNCE_SECONDS = 0.03
+
+
+class PollingWatcher:
+    """Detecta cambios comparando instantáneas de mtime_ns y tamaño"""
+
+    def __init__(
+        self, root: Path, dir_filter: Optional[DirFilter] = None, interval: float = 0.5
+    ):
+        self.root = root
+        self.dir_filter = dir_filter
+        self.interval = interval
+        self._snapshot = self._scan()
+        self._last_scan = time.monotonic()
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        snapshot = {}
+        for root, dirs, files in os.walk(self.root):
+            if self.dir_filter is not None:
+                dirs[:] = [d for d in dirs if self.dir_filter(Path(root) / d)]
+            for name in files:
+                path = Path(root) / name
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self, timeout: float) -> Optional[Set[Path]]:
+        """
+        Espera cambios hasta `timeout` segundos
+
+        Returns:
+            Rutas creadas, modificadas o eliminadas (vacío si no hubo cambios)
+        """
+        remaining = self._last_scan + self.interval - time.monotonic()
+        if remaining > timeout:
+            time.sleep(timeout)
+            return set()
+        time.sleep(max(0.0, remaining))
+
+        current = self._scan()
+        self._last_scan = time.monotonic()
+        changed = {path for path, info in current.items() if self._snapshot.get(path) != info}
+        changed.update(path for path in self._snapshot if path not in current)
+        self._snapshot = current
+        return changed
+
+    def close(self) -> None:
+        self._snapshot = {}
+
+
+class InotifyWatcher:
+    """Observa el árbol con inotify; agrega watches a directorios nuevos"""
+
+    def __init__(self, root: Path, dir_filter: Optional[DirFilter] = None):
+        self.root = root
+        self.dir_filter = dir_filter
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falló")
+        self._watches: Dict[int, Path] = {}
+        self._add_tree(root)
+
+    def _add_watch(self, directory: Path) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            logger.warning(f"No se pudo observar {directory}: {os.strerror(error)}")
+            return
+        self._watches[wd] = directory
+
+    def _add_tree(self, directory: Path) -> Set[Path]:
+        """Observa un directorio y sus subdirectorios; devuelve los archivos encontrados"""
+        found = set()
+        for root, dirs, files in os.walk(directory):
+            if self.dir_filter is not None:
+                dirs[:] = [d for d in dirs if self.dir_filter(Path(root) / d)]
+            self._add_watch(Path(root))
+            found.update(Path(root) / name for name in files)
+        return found
+
+    def wait(self, timeout: float) -> Optional[Set[Path]]:
+        """
+        Espera cambios hasta `timeout` segundos
+
+        Returns:
+            Rutas creadas, modificadas o eliminadas, o None si la cola de eventos
+            del kernel se desbordó y hace falta una reconstrucción completa
+        """
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        changed: Set[Path] = set()
+        overflow = False
+        deadline = time.monotonic() + DEBOUNCE_SECONDS
+        while True:
+            try:
+                buffer = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                buffer = b""
+            overflow |= self._parse(buffer, changed)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([self._fd], [], [], remaining)[0]:
+                break
+        return None if overflow else changed
+
+    def _parse(self, buffer: bytes, changed: Set[Path]) -> bool:
+        """Interpreta los eventos leídos; devuelve True si hubo desborde"""
+        overflow = False
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(buffer):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(buffer, offset)
+            offset += _EVENT_HEADER.size
+            name = buffer[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                overflow = True
+                continue
+            directory = self._watches.get(wd)
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            if directory is None:
+                continue
+            if not name:
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    changed.add(directory)
+                continue
+
+            path = directory / os.fsdecode(name)
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                if self.dir_filter is None or self.dir_filter(path):
+                    changed.update(self._add_tree(path))
+                continue
+            changed.add(path)
+        return overflow
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(
+    root: Path,
+    dir_filter: Optional[DirFilter] = None,
+    polling: bool = False,
+    interval: float = 0.5,
+):
+    """Crea el watcher más eficiente disponible (inotify o sondeo)"""
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root, dir_filter)
+        except (OSError, AttributeError) as e:
+            logger.warning(f"inotify no disponible, usando sondeo: {e}")
+    return PollingWatcher(root, dir_filter, interval)
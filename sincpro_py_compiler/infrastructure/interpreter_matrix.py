@@ -0,0 +1,156 @@
+"""
+Infraestructura - Compilación para varios intérpretes en una sola ejecución
+
+El árbol se recorre y clasifica una sola vez; cada intérprete destino compila las
+mismas tareas mediante subprocesos worker (ver matrix_worker.py) y escribe en su
+propio subdirectorio de salida, nombrado con su cache tag (p. ej. cpython-311).
+"""
+
+import json
+import logging
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+WORKER_SCRIPT = Path(__file__).with_name("matrix_worker.py")
+
+_PROBE_SCRIPT = (
+    "import importlib.util, json, sys; print(json.dumps({"
+    "'version': '%d.%d' % sys.version_info[:2], "
+    "'cache_tag': sys.implementation.cache_tag, "
+    "'magic': importlib.util.MAGIC_NUMBER.hex()}))"
+)
+
+
+class TargetInterpreter(NamedTuple):
+    """Intérprete destino de la matriz"""
+
+    executable: str
+    version: str  # "3.11"
+    cache_tag: str  # "cpython-311"
+    magic: str  # Número mágico en hexadecimal
+
+
+class MatrixTask(NamedTuple):
+    """Compilación de una fuente para un intérprete destino"""
+
+    source: Path
+    output: Path
+    dfile: str
+
+
+def probe_interpreter(executable: str) -> TargetInterpreter:
+    """
+    Consulta versión, cache tag y número mágico de un intérprete instalado
+
+    Raises:
+        ValueError: Si el intérprete no existe o no responde
+    """
+    try:
+        completed = subprocess.run(
+            [executable, "-I", "-c", _PROBE_SCRIPT],
+            capture_output=True,
+            text=True,
+            timeout=30,
+            check=True,
+        )
+        info = json.loads(completed.stdout)
+    except (OSError, subprocess.SubprocessError, ValueError) as e:
+        raise ValueError(f"Intérprete no válido: {executable} ({e})") from e
+    return TargetInterpreter(executable, info["version"], info["cache_tag"], info["magic"])
+
+
+def resolve_interpreters(
+    interpreters: Sequence[Union[str, TargetInterpreter]],
+) -> List[TargetInterpreter]:
+    """Sondea los intérpretes (si hace falta) y descarta duplicados con el mismo cache tag"""
+    targets: Dict[str, TargetInterpreter] = {}
+    for interpreter in interpreters:
+        if isinstance(interpreter, TargetInterpreter):
+            target = interpreter
+        else:
+            target = probe_interpreter(interpreter)
+        if target.cache_tag in targets:
+            logger.warning(
+                f"{target.executable} duplica {target.cache_tag} "
+                f"({targets[target.cache_tag].executable}), se omite"
+            )
+            continue
+        targets[target.cache_tag] = target
+    return list(targets.values())
+
+
+class MatrixCompiler:
+    """Ejecuta compilaciones en subprocesos worker de cada intérprete destino"""
+
+    def __init__(self, optimize: int = -1, pyc_mode: str = "timestamp"):
+        self.optimize = optimize
+        self.pyc_mode = pyc_mode
+
+    def compile(
+        self,
+        tasks_by_target: Dict[TargetInterpreter, List[MatrixTask]],
+        workers_per_target: int = 1,
+    ) -> Dict[TargetInterpreter, List[Optional[str]]]:
+        """
+        Compila las tareas de todos los intérpretes en paralelo
+
+        Args:
+            tasks_by_target: Tareas de cada intérprete destino
+            workers_per_target: Subprocesos worker por intérprete
+
+        Returns:
+            Por intérprete, una entrada por tarea y en el mismo orden:
+            None si compiló, o el mensaje de error
+        """
+        jobs: List[Tuple[TargetInterpreter, List[int], List[MatrixTask]]] = []
+        for target, tasks in tasks_by_target.items():
+            workers = max(1, min(workers_per_target, len(tasks)))
+            for worker in range(workers):
+                indexes = list(range(worker, len(tasks), workers))
+                jobs.append((target, indexes, [tasks[i] for i in indexes]))
+
+        results: Dict[TargetInterpreter, List[Optional[str]]] = {
+            target: [None] * len(tasks) for target, tasks in tasks_by_target.items()
+        }
+        if not jobs:
+            return results
+
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            futures = [
+                (target, indexes, executor.submit(self._run_worker, target, chunk))
+                for target, indexes, chunk in jobs
+            ]
+            for target, indexes, future in futures:
+                for index, error in zip(indexes, future.result()):
+                    results[target][index] = error
+        return results
+
+    def _run_worker(
+        self, target: TargetInterpreter, tasks: List[MatrixTask]
+    ) -> List[Optional[str]]:
+        """Lanza un worker del intérprete destino y recoge el resultado de cada tarea"""
+        lines = [json.dumps({"optimize": self.optimize, "pyc_mode": self.pyc_mode})]
+        lines.extend(
+            json.dumps(
+                {"source": str(task.source), "output": str(task.output), "dfile": task.dfile}
+            )
+            for task in tasks
+        )
+        process = subprocess.run(
+            [target.executable, "-I", "-B", str(WORKER_SCRIPT)],
+            input="\n".join(lines) + "\n",
+            capture_output=True,
+            text=True,
+        )
+        answers = [json.loads(line) for line in process.stdout.splitlines() if line]
+        if process.returncode != 0 or len(answers) != len(tasks):
+            error = process.stderr.strip().splitlines()[-1:] or ["sin salida"]
+            failure = f"worker {target.cache_tag} terminó con error: {error[0]}"
+            answers.extend(
+                {"ok": False, "error": failure} for _ in range(len(answers), len(tasks))
+            )
+        return [None if answer["ok"] else answer["error"] for answer in answers]
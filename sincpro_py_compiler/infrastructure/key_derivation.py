@@ -0,0 +1,305 @@
+"""
+Infraestructura - Derivación de claves con caché
+
+La clave de un .enc se deriva de la contraseña con un KDF lento a propósito
+(PBKDF2-SHA256 o scrypt); el KDF y su costo van en el header del archivo
+("kdf"), así cada archivo se abre con los parámetros con los que se creó. Los
+archivos sin "kdf" usan PBKDF2-SHA256 con 100k iteraciones.
+
+KeyCache guarda en memoria las claves ya derivadas por (contraseña, salt, KDF):
+verificar o desproteger muchos archivos con la misma licencia deriva la clave
+una sola vez por salt. Al escribir, el proceso reutiliza un salt por
+contraseña y KDF, y la clave de cada archivo sale de HKDF sobre esa clave con
+un "key_salt" propio, así proteger un lote también deriva una sola vez.
+
+KeyRing (opcional) persiste las claves derivadas en un JSON con permisos 0600
+para servicios que se reinician. Cada entrada se indexa con un HMAC de
+(contraseña, salt, KDF), así una contraseña incorrecta no encuentra la clave
+guardada y vuelve a derivar; también guarda el salt de escritura por
+contraseña y KDF, así proteger en procesos sucesivos reutiliza la misma
+entrada. Quien pueda leer el keyring abre esos archivos sin la contraseña y
+puede probar contraseñas sin pagar el KDF: protéjalo como a la licencia.
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Tuple, Union
+
+from .encrypted_stream import ContainerError
+
+KEY_SIZE = 32
+SALT_SIZE = 16
+KDF_NAMES = ("pbkdf2-sha256", "scrypt")
+# Límites de costo aceptados en un header: evita que un archivo ajeno fuerce
+# una derivación de minutos o gigabytes
+MAX_PBKDF2_ITERATIONS = 20_000_000
+MAX_SCRYPT_N = 2**22
+MAX_SCRYPT_RP = 64
+MAX_SCRYPT_MEMORY = 1024**3  # scrypt usa 128 * N * r bytes
+HKDF_INFO = b"sincpro-enc archive key"
+KEYRING_VERSION = 2
+MAX_KEYRING_ENTRIES = 1024
+
+
+class KdfParams(NamedTuple):
+    """KDF y costo: iteraciones de PBKDF2 o N (potencia de 2) de scrypt"""
+
+    name: str
+    cost: int
+    r: int = 8  # Solo scrypt
+    p: int = 1  # Solo scrypt
+
+    def to_dict(self) -> Dict[str, Union[str, int]]:
+        if self.name == "scrypt":
+            return {"name": self.name, "n": self.cost, "r": self.r, "p": self.p}
+        return {"name": self.name, "iterations": self.cost}
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> "KdfParams":
+        """Parámetros del header; sin "kdf" son los del formato original"""
+        if data is None:
+            return DEFAULT_KDF
+        try:
+            if data["name"] == "scrypt":
+                params = cls("scrypt", int(data["n"]), int(data["r"]), int(data["p"]))
+            else:
+                params = cls(data["name"], int(data["iterations"]))
+        except (KeyError, TypeError, ValueError):
+            raise ContainerError(f"Parámetros de KDF inválidos: {data}") from None
+        params.validate()
+        return params
+
+    def validate(self) -> None:
+        """Raises ContainerError si el KDF no se conoce o el costo está fuera de rango"""
+        if self.name not in KDF_NAMES:
+            raise ContainerError(f"KDF no soportado: {self.name}")
+        if self.name == "scrypt":
+            valid = (
+                2 <= self.cost <= MAX_SCRYPT_N
+                and self.cost & (self.cost - 1) == 0
+                and 1 <= self.r <= MAX_SCRYPT_RP
+                and 1 <= self.p <= MAX_SCRYPT_RP
+                and 128 * self.cost * self.r <= MAX_SCRYPT_MEMORY
+            )
+        else:
+            valid = 1 <= self.cost <= MAX_PBKDF2_ITERATIONS
+        if not valid:
+            raise ContainerError(f"Costo de KDF fuera de rango: {self.to_dict()}")
+
+    def __str__(self) -> str:
+        if self.name == "scrypt":
+            return f"scrypt N={self.cost} r={self.r} p={self.p}"
+        return f"{self.name} {self.cost} iteraciones"
+
+
+# Parámetros del formato original y default de los archivos nuevos
+DEFAULT_KDF = KdfParams("pbkdf2-sha256", 100_000)
+# Costo por defecto de cada KDF (scrypt N=2**15 usa 32 MB)
+DEFAULT_COSTS = {"pbkdf2-sha256": DEFAULT_KDF.cost, "scrypt": 2**15}
+
+
+def derive_key(password: str, salt: bytes, params: KdfParams = DEFAULT_KDF) -> bytes:
+    """Deriva una clave de 32 bytes desde la contraseña (sin caché)"""
+    # Importado al usarse: sin cryptography, encryption_service informa que falta
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+    from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
+
+    if params.name == "scrypt":
+        kdf = Scrypt(salt=salt, length=KEY_SIZE, n=params.cost, r=params.r, p=params.p)
+    else:
+        kdf = PBKDF2HMAC(
+            algorithm=hashes.SHA256(), length=KEY_SIZE, salt=salt, iterations=params.cost
+        )
+    return kdf.derive(password.encode("utf-8"))
+
+
+def archive_key(master_key: bytes, key_salt: bytes) -> bytes:
+    """Clave propia de un archivo a partir de la clave derivada de la contraseña"""
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+    return HKDF(
+        algorithm=hashes.SHA256(), length=KEY_SIZE, salt=key_salt, info=HKDF_INFO
+    ).derive(master_key)
+
+
+class KeyRing:
+    """Claves derivadas y salts de escritura persistidos en disco"""
+
+    def __init__(self, path: Union[str, Path], max_entries: int = MAX_KEYRING_ENTRIES):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._data: Optional[Dict] = None
+
+    def get(self, password: str, salt: bytes, params: KdfParams) -> Optional[bytes]:
+        return self._get("keys", self._entry_id(password, salt, params))
+
+    def put(self, password: str, salt: bytes, params: KdfParams, key: bytes) -> None:
+        self._put("keys", self._entry_id(password, salt, params), key)
+
+    def get_writer_salt(self, password: str, params: KdfParams) -> Optional[bytes]:
+        return self._get("writer_salts", self._entry_id(password, b"", params))
+
+    def put_writer_salt(self, password: str, params: KdfParams, salt: bytes) -> None:
+        self._put("writer_salts", self._entry_id(password, b"", params), salt)
+
+    def _get(self, section: str, entry_id: str) -> Optional[bytes]:
+        with self._lock:
+            encoded = self._load()[section].get(entry_id)
+        return urlsafe_b64decode(encoded) if encoded else None
+
+    def _put(self, section: str, entry_id: str, value: bytes) -> None:
+        with self._lock:
+            data = self._load()
+            entries = data[section]
+            entries.pop(entry_id, None)
+            entries[entry_id] = urlsafe_b64encode(value).decode("utf-8")
+            # Las entradas quedan en orden de escritura: se descartan las más viejas
+            while len(entries) > self.max_entries:
+                del entries[next(iter(entries))]
+            self._save(data)
+
+    def _load(self) -> Dict:
+        if self._data is not None:
+            return self._data
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            data = {}
+        if data.get("version") != KEYRING_VERSION:
+            # Las entradas de la versión 1 no estaban ligadas a la contraseña
+            data = {
+                "version": KEYRING_VERSION,
+                "secret": urlsafe_b64encode(os.urandom(KEY_SIZE)).decode("utf-8"),
+                "keys": {},
+                "writer_salts": {},
+            }
+        self._data = data
+        return data
+
+    def _save(self, data: Dict) -> None:
+        """Reemplaza el archivo de forma atómica, creado con permisos 0600"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        fd = os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temp, self.path)
+
+    def _entry_id(self, password: str, salt: bytes, params: KdfParams) -> str:
+        """HMAC de (contraseña, salt, KDF) con el secreto propio del keyring"""
+        message = json.dumps(
+            [password, urlsafe_b64encode(salt).decode("utf-8"), params.to_dict()],
+            sort_keys=True,
+        )
+        with self._lock:
+            secret = urlsafe_b64decode(self._load()["secret"])
+        return hmac.new(secret, message.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+class KeyCache:
+    """Claves derivadas en memoria (LRU), con un KeyRing opcional detrás"""
+
+    def __init__(self, keyring: Optional[KeyRing] = None, max_entries: int = 256):
+        self.keyring = keyring
+        self.max_entries = max_entries
+        self.derivations = 0  # Derivaciones reales (no servidas por la caché)
+        self._lock = threading.Lock()
+        self._keys: "OrderedDict[Tuple[str, bytes, KdfParams], bytes]" = OrderedDict()
+        self._writer_salts: Dict[Tuple[str, KdfParams], bytes] = {}
+
+    def derive(self, password: str, salt: bytes, params: KdfParams = DEFAULT_KDF) -> bytes:
+        """Clave para (contraseña, salt, KDF); solo la primera vez corre el KDF"""
+        cache_key = (password, salt, params)
+        with self._lock:
+            key = self._keys.get(cache_key)
+            if key is not None:
+                self._keys.move_to_end(cache_key)
+                return key
+        key = self.keyring.get(password, salt, params) if self.keyring else None
+        if key is None:
+            key = derive_key(password, salt, params)
+            with self._lock:
+                self.derivations += 1
+            if self.keyring:
+                self.keyring.put(password, salt, params, key)
+        with self._lock:
+            self._keys[cache_key] = key
+            while len(self._keys) > self.max_entries:
+                self._keys.popitem(last=False)
+        return key
+
+    def writer_salt(self, password: str, params: KdfParams) -> bytes:
+        """Salt aleatorio que se reutiliza para la contraseña y el KDF al escribir"""
+        with self._lock:
+            salt = self._writer_salts.get((password, params))
+        if salt is not None:
+            return salt
+        salt = self.keyring.get_writer_salt(password, params) if self.keyring else None
+        if salt is None:
+            salt = os.urandom(SALT_SIZE)
+            if self.keyring:
+                self.keyring.put_writer_salt(password, params, salt)
+        with self._lock:
+            return self._writer_salts.setdefault((password, params), salt)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys.clear()
+            self._writer_salts.clear()
+
+
+_shared_caches: Dict[Optional[Path], KeyCache] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_key_cache(keyring: Optional[Union[str, Path]] = None) -> KeyCache:
+    """KeyCache del proceso (una por keyring), compartida entre servicios"""
+    path = Path(keyring).resolve() if keyring else None
+    with _shared_lock:
+        cache = _shared_caches.get(path)
+        if cache is None:
+            cache = _shared_caches[path] = KeyCache(KeyRing(path) if path else None)
+        return cache
+
+
+def calibrate(name: str, target_ms: float, password: str = "calibracion") -> KdfParams:
+    """
+    Costo de KDF cuya derivación tarda aproximadamente `target_ms` en esta máquina
+
+    PBKDF2 escala lineal con las iteraciones (redondeadas a miles); scrypt usa
+    el mayor N potencia de 2 que no supera el objetivo (mínimo 2**14).
+    """
+    salt = os.urandom(SALT_SIZE)
+
+    def seconds(params: KdfParams) -> float:
+        started = time.perf_counter()
+        derive_key(password, salt, params)
+        return time.perf_counter() - started
+
+    target = target_ms / 1000
+    if name == "scrypt":
+        params = KdfParams("scrypt", 2**14)
+        while True:
+            candidate = params._replace(cost=params.cost * 2)
+            try:
+                candidate.validate()
+            except ContainerError:
+                return params
+            if seconds(candidate) > target:
+                return params
+            params = candidate
+
+    sample = 50_000
+    elapsed = min(seconds(KdfParams(name, sample)) for _ in range(3))
+    iterations = int(sample * target / elapsed) // 1000 * 1000
+    return KdfParams(name, min(max(iterations, 1000), MAX_PBKDF2_ITERATIONS))
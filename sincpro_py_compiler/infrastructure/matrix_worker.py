@@ -0,0 +1,50 @@
+"""
+Worker de compilación para intérpretes destino de la matriz de versiones
+
+Se ejecuta con el intérprete destino como script aislado (`python -I -B
+matrix_worker.py`), por lo que no depende de que el paquete esté instalado en
+ese intérprete: carga el motor de bytecode desde el archivo vecino.
+
+Protocolo por stdin/stdout, una línea JSON por mensaje:
+    entrada:  {"optimize": 0, "pyc_mode": "timestamp"}  (configuración)
+              {"source": ..., "output": ..., "dfile": ...}  (una por tarea)
+    salida:   {"ok": true} o {"ok": false, "error": "..."}  (una por tarea)
+"""
+
+import importlib.util
+import json
+import os
+import sys
+
+
+def _load_bytecode_compiler():
+    """Carga bytecode_compiler.py por ruta, sin importar el paquete"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bytecode_compiler.py")
+    spec = importlib.util.spec_from_file_location("_sincpro_bytecode_compiler", path)
+    module = importlib.util.module_from_spec(spec)  # type: ignore[arg-type]
+    spec.loader.exec_module(module)  # type: ignore[union-attr]
+    return module
+
+
+def main() -> int:
+    """Compila las tareas recibidas por stdin con el intérprete actual"""
+    from pathlib import Path
+
+    engine_module = _load_bytecode_compiler()
+    config = json.loads(sys.stdin.readline())
+    engine = engine_module.BytecodeCompiler(config["optimize"], config["pyc_mode"])
+
+    for line in sys.stdin:
+        task = json.loads(line)
+        try:
+            engine.compile_file(Path(task["source"]), Path(task["output"]), task["dfile"])
+            result = {"ok": True}
+        except Exception as e:
+            result = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        sys.stdout.write(json.dumps(result) + "\n")
+    sys.stdout.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
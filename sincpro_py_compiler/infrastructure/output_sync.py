@@ -0,0 +1,74 @@
+"""
+Infraestructura - Sincronización del directorio de salida al estilo rsync
+
+Antes de copiar un archivo se compara con el destino existente: si es idéntico
+no se escribe nada. Al terminar, se eliminan de la salida los archivos que ya no
+corresponden a ninguna fuente del build.
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Iterable
+
+from .build_manifest import MANIFEST_FILENAME, _prune_empty_parents, hash_file
+from .tree_walker import iter_files
+
+logger = logging.getLogger(__name__)
+
+# mtime: tamaño y mtime (en segundos, como rsync); checksum: tamaño y SHA-256
+SYNC_MODES = ("mtime", "checksum")
+
+
+class OutputSync:
+    """Compara fuentes con la salida existente y poda lo que sobra"""
+
+    def __init__(self, output_dir: Path, mode: str = "mtime"):
+        if mode not in SYNC_MODES:
+            raise ValueError(f"Modo de sincronización no soportado: {mode}")
+        self.output_dir = output_dir
+        self.mode = mode
+
+    def is_synced(self, source: Path, destination: Path) -> bool:
+        """Verifica si el destino ya es idéntico a la fuente"""
+        try:
+            destination_stat = destination.lstat()
+            source_stat = source.stat()
+        except FileNotFoundError:
+            return False
+        if not os.path.isfile(destination) or destination.is_symlink():
+            return False
+        if destination_stat.st_size != source_stat.st_size:
+            return False
+        if self.mode == "checksum":
+            return hash_file(source) == hash_file(destination)
+        return int(destination_stat.st_mtime) == int(source_stat.st_mtime)
+
+    def prune(self, expected_outputs: Iterable[str]) -> int:
+        """
+        Elimina los archivos de la salida que no están en `expected_outputs`
+
+        Args:
+            expected_outputs: Rutas POSIX relativas a la salida producidas por el build
+
+        Returns:
+            int: Número de archivos eliminados
+        """
+        expected = set(expected_outputs)
+        expected.add(MANIFEST_FILENAME)
+        stale = [
+            entry
+            for entry in iter_files(self.output_dir, sort=False)
+            if entry.relative_path not in expected
+        ]
+        removed = 0
+        for entry in stale:
+            try:
+                os.unlink(entry.path)
+                removed += 1
+                logger.debug(f"Eliminado (sin fuente): {entry.relative_path}")
+            except OSError as e:
+                logger.warning(f"No se pudo eliminar {entry.path}: {e}")
+                continue
+            _prune_empty_parents(Path(entry.path).parent, self.output_dir)
+        return removed
@@ -0,0 +1,300 @@
+"""
+Infraestructura - Motor de patrones con semántica gitignore
+
+Los patrones se compilan una sola vez y se evalúan contra la ruta relativa a la
+raíz del proyecto, con las reglas de .gitignore:
+
+    nombre         archivo o directorio con ese nombre, en cualquier nivel
+    dir/           solo directorios
+    /build         anclado al directorio del archivo de reglas
+    a/b.py         con "/" intermedia también queda anclado
+    **/tests/      "**" abarca cero o más directorios (a/**/b, logs/**)
+    *, ?, [a-z]    comodines dentro de un segmento ([!x] niega la clase)
+    !keep.py       negación: vuelve a incluir lo excluido por una regla anterior
+
+Gana la última regla que coincide, y un archivo dentro de un directorio excluido
+queda excluido (como en git, no se puede reincluir). Con una raíz, cada
+directorio puede tener su propio archivo de reglas (.sincpro_exclude), relativo a
+ese directorio y con prioridad sobre los de sus padres.
+
+Las reglas simples (nombres y extensiones sin anclar) se resuelven con
+diccionarios; el resto se combina en expresiones regulares en orden inverso, de
+modo que la primera alternativa que coincide es la regla de mayor prioridad, y
+las reglas ancladas se agrupan por primer segmento para que cada ruta consulte
+solo las que pueden aplicarle.
+"""
+
+import logging
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Archivo de reglas por directorio
+EXCLUDE_FILENAME = ".sincpro_exclude"
+
+_WILDCARDS = frozenset("*?[\\")
+
+
+class _Rule:
+    """Regla individual ya analizada"""
+
+    __slots__ = ("index", "negated", "dir_only", "anchored", "base", "body")
+
+    def __init__(self, index: int, pattern: str, base: str):
+        self.index = index
+        self.base = base
+        self.negated = pattern.startswith("!")
+        if self.negated:
+            pattern = pattern[1:]
+        elif pattern.startswith("\\!") or pattern.startswith("\\#"):
+            pattern = pattern[1:]
+        self.dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        # Una "/" al inicio o en medio ancla la regla a su directorio base
+        self.anchored = "/" in pattern
+        self.body = pattern.lstrip("/")
+
+    @property
+    def literal_name(self) -> Optional[str]:
+        """Nombre exacto si la regla es un nombre sin anclar y sin comodines"""
+        if self.anchored or self.base or any(c in _WILDCARDS for c in self.body):
+            return None
+        return self.body
+
+    @property
+    def extension(self) -> Optional[str]:
+        """Extensión si la regla es "*.ext" sin anclar"""
+        if self.anchored or self.base or not self.body.startswith("*."):
+            return None
+        suffix = self.body[1:]
+        if any(c in _WILDCARDS for c in suffix):
+            return None
+        return suffix
+
+    def regex(self) -> str:
+        """Regex que debe coincidir con la ruta relativa completa"""
+        prefix = re.escape(self.base) + "/" if self.base else ""
+        if not self.anchored:
+            return prefix + "(?:.*/)?" + _glob_segment(self.body)
+
+        segments = self.body.split("/")
+        parts = []
+        for position, segment in enumerate(segments):
+            last = position == len(segments) - 1
+            if segment == "**":
+                # a/**/b: cero o más directorios; logs/**: todo lo que contiene
+                parts.append(".*" if last else "(?:.*/)?")
+            else:
+                parts.append(_glob_segment(segment) + ("" if last else "/"))
+        return prefix + "".join(parts)
+
+
+def _glob_segment(segment: str) -> str:
+    """Traduce comodines de un segmento a regex sin cruzar separadores"""
+    parts = []
+    i = 0
+    while i < len(segment):
+        char = segment[i]
+        if char == "\\" and i + 1 < len(segment):
+            i += 1
+            parts.append(re.escape(segment[i]))
+        elif char == "*":
+            parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[":
+            end = segment.find("]", i + 2)
+            if end == -1:
+                parts.append(re.escape(char))
+            else:
+                body = segment[i + 1 : end]
+                if body[0] in "!^":
+                    body = "^" + body[1:]
+                parts.append("[" + body.replace("\\", "\\\\") + "]")
+                i = end
+        else:
+            parts.append(re.escape(char))
+        i += 1
+    return "".join(parts)
+
+
+def _combine(alternatives: Dict[bool, List[str]]) -> Dict[bool, Optional["re.Pattern[str]"]]:
+    """Une alternativas en orden inverso: la primera que coincide es la más prioritaria"""
+    return {
+        dir_only: re.compile("|".join(reversed(regexes))) if regexes else None
+        for dir_only, regexes in alternatives.items()
+    }
+
+
+def read_rules(rules_file: Path) -> List[str]:
+    """Lee un archivo de reglas: omite vacías y comentarios, recorta espacios finales"""
+    rules = []
+    with open(rules_file, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+            stripped = line.rstrip()
+            if stripped.endswith("\\") and len(stripped) < len(line):
+                stripped += " "  # "\ " final conserva el espacio
+            rules.append(stripped.lstrip())
+    return rules
+
+
+class PatternMatcher:
+    """Conjunto de reglas compilado; decide por ruta relativa"""
+
+    def __init__(self, patterns: Iterable[str], root: Optional[Path] = None):
+        """
+        Args:
+            patterns: Reglas base (template y archivo -e), relativas a la raíz
+            root: Raíz del proyecto; si se indica, se cargan los archivos
+                .sincpro_exclude de cada directorio a medida que se visitan
+        """
+        self.patterns: List[str] = list(patterns)
+        self.root = root
+        self._rules: List[_Rule] = []
+        self._dirty = True
+        # Decisión ya tomada para cada directorio (con sus ancestros)
+        self._dir_cache: Dict[str, bool] = {}
+        # Las reglas por directorio se cargan al evaluar: el recorrido con hilos
+        # consulta el matcher desde varios hilos a la vez
+        self._lock = threading.RLock()
+
+        if root is not None:
+            # El propio archivo de reglas no forma parte de la salida
+            self._add_rules([EXCLUDE_FILENAME], "")
+        self._add_rules(self.patterns, "")
+        if root is not None:
+            self._load_directory_rules("")
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.patterns)
+
+    def add_rules(self, patterns: Iterable[str], base: str = "") -> None:
+        """Agrega reglas relativas a `base` con prioridad sobre las anteriores"""
+        with self._lock:
+            self._add_rules(patterns, base)
+            self._dir_cache.clear()
+
+    def _add_rules(self, patterns: Iterable[str], base: str) -> None:
+        for pattern in patterns:
+            pattern = pattern.lstrip()
+            if not pattern.endswith("\\ "):
+                pattern = pattern.rstrip()
+            if pattern and not pattern.startswith("#") and pattern != "!":
+                self._rules.append(_Rule(len(self._rules), pattern, base))
+                self._dirty = True
+
+    def _load_directory_rules(self, relative_dir: str) -> None:
+        """Carga el archivo de reglas de un directorio (antes de evaluar su contenido)"""
+        assert self.root is not None
+        rules_file = self.root / relative_dir / EXCLUDE_FILENAME
+        if not rules_file.is_file():
+            return
+        try:
+            self._add_rules(read_rules(rules_file), relative_dir)
+        except (OSError, UnicodeDecodeError) as e:
+            logger.warning(f"No se pudo leer {rules_file}: {e}")
+
+    def _compile(self) -> None:
+        """
+        Construye los índices y las regex combinadas (mayor prioridad primero)
+
+        Nombres y extensiones van a diccionarios; los comodines sin anclar se evalúan
+        solo sobre el nombre; las reglas ancladas se agrupan por el primer segmento
+        de la ruta, así cada archivo consulta una sola regex pequeña.
+        """
+        self._names: Dict[Tuple[str, bool], _Rule] = {}
+        self._extensions: Dict[Tuple[str, bool], _Rule] = {}
+        self._by_group: Dict[str, _Rule] = {}
+        name_globs: Dict[bool, List[str]] = {False: [], True: []}
+        buckets: Dict[Optional[str], Dict[bool, List[str]]] = {}
+
+        for rule in self._rules:
+            if rule.literal_name is not None:
+                self._names[(rule.literal_name, rule.dir_only)] = rule
+                continue
+            if rule.extension is not None:
+                self._extensions[(rule.extension, rule.dir_only)] = rule
+                continue
+            group = f"r{rule.index}"
+            self._by_group[group] = rule
+            if not rule.anchored and not rule.base:
+                name_globs[rule.dir_only].append(f"(?P<{group}>{_glob_segment(rule.body)})")
+                continue
+            head = (rule.base or rule.body).split("/")[0]
+            key = None if any(c in _WILDCARDS for c in head) else head
+            bucket = buckets.setdefault(key, {False: [], True: []})
+            bucket[rule.dir_only].append(f"(?P<{group}>{rule.regex()})")
+
+        self._name_regex = _combine(name_globs)
+        self._buckets = {key: _combine(bucket) for key, bucket in buckets.items()}
+        self._global_bucket = self._buckets.pop(None, {False: None, True: None})
+        self._dirty = False
+
+    def _decide(self, relative_path: str, is_dir: bool) -> bool:
+        """Aplica las reglas a una entrada, sin mirar sus directorios padres"""
+        if self._dirty:
+            self._compile()
+        name = relative_path.rpartition("/")[2]
+        bucket = self._buckets.get(relative_path.partition("/")[0])
+        best: Optional[_Rule] = None
+
+        for dir_only in (False, True) if is_dir else (False,):
+            candidates = [self._names.get((name, dir_only))]
+            if self._extensions:
+                dot = name.find(".")
+                while dot != -1:
+                    candidates.append(self._extensions.get((name[dot:], dir_only)))
+                    dot = name.find(".", dot + 1)
+            for regex, target in (
+                (self._name_regex[dir_only], name),
+                (bucket[dir_only] if bucket else None, relative_path),
+                (self._global_bucket[dir_only], relative_path),
+            ):
+                if regex is not None:
+                    match = regex.fullmatch(target)
+                    if match is not None:
+                        candidates.append(self._by_group[match.lastgroup])  # type: ignore[index]
+            for rule in candidates:
+                if rule is not None and (best is None or rule.index > best.index):
+                    best = rule
+
+        return best is not None and not best.negated
+
+    def _dir_excluded(self, relative_dir: str) -> bool:
+        """Decisión de un directorio considerando sus ancestros (memorizada)"""
+        cached = self._dir_cache.get(relative_dir)
+        if cached is not None:
+            return cached
+        parent = relative_dir.rpartition("/")[0]
+        excluded = (bool(parent) and self._dir_excluded(parent)) or self._decide(
+            relative_dir, True
+        )
+        self._dir_cache[relative_dir] = excluded
+        if not excluded and self.root is not None:
+            self._load_directory_rules(relative_dir)
+        return excluded
+
+    def matches(self, relative_path: str, is_dir: bool = False) -> bool:
+        """
+        Evalúa una ruta relativa a la raíz del proyecto
+
+        Args:
+            relative_path: Ruta POSIX relativa, p. ej. "app/static/logo.png"
+            is_dir: Si la ruta es un directorio (aplican también las reglas "dir/")
+        """
+        with self._lock:
+            if is_dir:
+                return self._dir_excluded(relative_path)
+            parent = relative_path.rpartition("/")[0]
+            if parent and self._dir_excluded(parent):
+                return True
+            return self._decide(relative_path, False)
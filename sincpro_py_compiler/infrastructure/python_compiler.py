@@ -2,18 +2,191 @@
 Implementación principal del compilador de proyectos
 """
 
+import asyncio
+import contextlib
 import importlib.util
 import logging
 import os
+import shutil
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
+from .build_manifest import BuildManifest, build_settings
+from .build_report import BuildResult, ErrorCollector, FailedFile
+from .build_tracer import BuildTracer, TaskTiming
+from .compile_cache import CompileCache
 from .compiler_service import CompilerService
 from .file_manager import FileManager
+from .file_transfer import HARDLINK, REFLINK
+from .file_watcher import create_watcher
+from .interpreter_matrix import (
+    MatrixCompiler,
+    MatrixTask,
+    TargetInterpreter,
+    resolve_interpreters,
+)
+from .key_derivation import KdfParams
+from .output_sync import OutputSync
+from .pattern_matcher import EXCLUDE_FILENAME, PatternMatcher
+from .staged_output import StagedOutput
+from .tree_walker import WalkEntry, iter_files
 
 logger = logging.getLogger(__name__)
 
 
+class BuildTask(NamedTuple):
+    """Unidad de trabajo planificada: compilar o copiar un archivo"""
+
+    action: str  # "compile" o "copy"
+    source: Path
+    destination: Path
+    relative_path: str  # Ruta POSIX relativa al directorio fuente
+
+    def output_for(self, outcome: str) -> Path:
+        """Archivo producido según el resultado de la tarea"""
+        if outcome in ("compiled", "cached"):
+            return self.destination.with_suffix(".pyc")
+        return self.destination
+
+
+class TaskContext(NamedTuple):
+    """Servicios y opciones con los que se ejecutan las tareas de un build"""
+
+    compiler_service: CompilerService
+    file_manager: FileManager
+    remove_py: bool = False
+    compile_cache: Optional[CompileCache] = None
+
+
+# Resultado de una copia según el método de transferencia usado
+_TRANSFER_OUTCOMES = {REFLINK: "reflinked", HARDLINK: "hardlinked"}
+COPY_OUTCOMES = ("copied", "reflinked", "hardlinked")
+
+
+def execute_build_task(task: BuildTask, context: TaskContext) -> str:
+    """
+    Ejecuta una tarea de compilación o copia
+
+    Returns:
+        "compiled", "cached" (acierto de caché), "copied", "reflinked", "hardlinked"
+        (según el modo de enlace del FileManager) o "failed"
+    """
+    if task.action == "compile":
+        outcome = _compile_task(task, context)
+        if outcome:
+            # Eliminar .py original si se solicita
+            if context.remove_py and task.destination != task.source:
+                try:
+                    task.source.unlink()
+                except Exception as e:
+                    logger.warning(f"No se pudo eliminar {task.source}: {e}")
+            return outcome
+        # Si falla la compilación, copiar el archivo original
+
+    method = context.file_manager.transfer_file(task.source, task.destination)
+    if method is None:
+        return "failed"
+    return _TRANSFER_OUTCOMES.get(method, "copied")
+
+
+def _compile_task(task: BuildTask, context: TaskContext) -> Optional[str]:
+    """
+    Compila una fuente, usando la caché de bytecode si está configurada
+
+    El bytecode registra la ruta relativa al proyecto (co_filename), con o sin
+    caché: la salida no depende del checkout ni de la máquina del build.
+    """
+    pyc_path = task.output_for("compiled")
+    cache = context.compile_cache
+    if cache is None:
+        if context.compiler_service.compile_python_file(
+            task.source, pyc_path, dfile=task.relative_path
+        ):
+            return "compiled"
+        return None
+
+    try:
+        source = task.source.read_bytes()
+    except OSError as e:
+        # La fuente desapareció o no se puede leer (p. ej. durante --watch)
+        logger.error(f"❌ Error leyendo {task.source}: {e}")
+        return None
+    key = cache.key_for(
+        source, task.relative_path, context.compiler_service.bytecode_variant()
+    )
+    if cache.fetch(key, task.source, pyc_path):
+        return "cached"
+    if context.compiler_service.compile_python_file(
+        task.source, pyc_path, dfile=task.relative_path, source=source
+    ):
+        cache.store(key, pyc_path)
+        return "compiled"
+    return None
+
+
+class _RecordCollector(logging.Handler):
+    """Acumula los logs de un worker para reemitirlos en orden en el proceso padre"""
+
+    def __init__(self):
+        super().__init__()
+        self.records: List[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Congelar el mensaje para que el registro sea serializable
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        self.records.append(record)
+
+
+_worker_collector: Optional[_RecordCollector] = None
+
+
+def _init_worker() -> None:
+    """Inicializa un proceso del pool para capturar sus logs"""
+    global _worker_collector
+    _worker_collector = _RecordCollector()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_worker_collector)
+
+
+def _run_worker_chunk(
+    context: TaskContext, tasks: List[BuildTask]
+) -> List[Tuple[str, List[logging.LogRecord], TaskTiming]]:
+    """Ejecuta un bloque de tareas dentro de un worker y devuelve resultados, logs y tiempos"""
+    assert _worker_collector is not None
+    results = []
+    for task in tasks:
+        _worker_collector.records = []
+        start_ns, start_cpu_ns = time.perf_counter_ns(), time.process_time_ns()
+        outcome = execute_build_task(task, context)
+        results.append(
+            (
+                outcome,
+                _worker_collector.records,
+                TaskTiming.measure_from(start_ns, start_cpu_ns),
+            )
+        )
+    return results
+
+
 class PythonCompiler:
     """Implementación principal para compilación de proyectos Python"""
 
@@ -21,9 +194,20 @@ class PythonCompiler:
         self,
         compiler_service: Optional[CompilerService] = None,
         file_manager: Optional[FileManager] = None,
+        compile_cache: Optional[CompileCache] = None,
+        tracer: Optional[BuildTracer] = None,
     ):
         self.compiler_service = compiler_service or CompilerService()
         self.file_manager = file_manager or FileManager()
+        self.compile_cache = compile_cache
+        # Spans de cada fase y archivo (--trace-out); deshabilitado por defecto
+        self.tracer = tracer or BuildTracer(enabled=False)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_size = 0
+        # CPU acumulada por los workers del pool (ns), para el reporte del build
+        self._worker_cpu_ns = 0
+        # Contadores del último build (compiled, copied, excluded, ...)
+        self.last_build_stats: Dict[str, int] = {}
 
     def compile_project(
         self,
@@ -33,7 +217,13 @@ class PythonCompiler:
         exclude_file: Optional[str] = None,
         remove_py: bool = False,
         copy_faithful_file: Optional[str] = None,
-    ) -> bool:
+        jobs: Optional[int] = 1,
+        incremental: bool = False,
+        python_targets: Optional[Sequence[Union[str, TargetInterpreter]]] = None,
+        walk_threads: int = 1,
+        sync: Optional[str] = None,
+        staged: bool = False,
+    ) -> BuildResult:
         """
         Compila un proyecto Python completo
 
@@ -43,126 +233,1201 @@ class PythonCompiler:
             template: Template de exclusión
             exclude_file: Archivo custom de exclusiones
             remove_py: Si eliminar archivos .py originales
+            copy_faithful_file: Archivo o lista de patrones de copia fiel
+            jobs: Procesos para compilar/copiar en paralelo (None o 0 = todos los CPUs)
+            incremental: Omitir fuentes sin cambios según el manifiesto del build anterior
+                y eliminar salidas cuyas fuentes ya no existen
+            python_targets: Intérpretes destino (ejecutables); cada uno compila en
+                output_dir/<cache_tag>, p. ej. output_dir/cpython-311
+            walk_threads: Hilos que listan directorios en paralelo durante el recorrido
+                (útil en sistemas de archivos de red como NFS; el orden no cambia)
+            sync: Sincronizar la salida al estilo rsync: "mtime" (tamaño y mtime) o
+                "checksum" (tamaño y hash). No copia los archivos idénticos al destino
+                y elimina de la salida lo que ya no corresponde a ninguna fuente
+            staged: Construir en un directorio de staging con journal y publicarlo
+                con un rename atómico al terminar; un build interrumpido se reanuda
+                desde el journal. Siempre es un build completo: con incremental,
+                sync o python_targets lanza ValueError
 
         Returns:
-            True si la compilación fue exitosa
+            BuildResult con contadores, bytes, errores y tiempos por fase; se evalúa
+            como True si la compilación fue exitosa
         """
+        result = BuildResult(str(source_dir), str(output_dir))
+        staged_output = None
+        if staged:
+            if incremental or sync or python_targets:
+                raise ValueError(
+                    "El build en staging es completo: no admite incremental, "
+                    "sincronización ni varios intérpretes"
+                )
+            staged_output = StagedOutput(Path(output_dir).resolve())
+            output_dir = str(staged_output.staging_dir)
+
+        tracer = self.tracer
         try:
-            source_path = Path(source_dir).resolve()
-            output_path = Path(output_dir).resolve()
+            output_sync = OutputSync(Path(output_dir).resolve(), sync) if sync else None
+            with self._phase(result, "preparar"):
+                prepared = self._prepare_build(
+                    source_dir, output_dir, template, exclude_file, copy_faithful_file
+                )
+            if prepared is None:
+                return result.finish(False, "Directorio fuente o de salida inválido")
+            source_path, output_path, exclude_patterns, copy_faithful_patterns = prepared
 
-            if not source_path.exists():
-                logger.error(f"Directorio fuente no existe: {source_path}")
-                return False
+            skip_dir = staged_output.output_dir if staged_output is not None else None
+            with self._phase(result, "recorrer") as walk_args:
+                tasks, excluded_count = self._plan_tasks(
+                    source_path,
+                    output_path,
+                    exclude_patterns,
+                    copy_faithful_patterns,
+                    walk_threads,
+                    skip_dir,
+                )
+                walk_args.update(
+                    archivos=len(tasks),
+                    excluidos=excluded_count,
+                    patrones_ms=tracer.counter_ms("patrones"),
+                )
 
-            # Crear directorio de salida
-            if not self.file_manager.create_directory(output_path):
-                return False
+            if python_targets:
+                if incremental or sync or self.compile_cache is not None:
+                    logger.warning(
+                        "Build incremental, sincronización y caché no aplican con varios "
+                        "intérpretes, se omiten"
+                    )
+                worker_cpu_ns = self._worker_cpu_ns
+                with self._phase(result, "compilar y copiar", tareas=len(tasks)):
+                    target_stats = self._compile_matrix(
+                        tasks, python_targets, output_path, jobs, remove_py, result
+                    )
+                result.worker_cpu_s = (self._worker_cpu_ns - worker_cpu_ns) / 1e9
+                # Cada destino es una salida completa: los contadores suman todos
+                self.last_build_stats = {
+                    outcome: sum(stats[outcome] for stats in target_stats.values())
+                    for outcome in ("compiled", "copied", "failed")
+                }
+                self.last_build_stats["excluded"] = excluded_count
+                self.last_build_stats["targets"] = len(target_stats)
+                result.counts = self.last_build_stats
+                logger.info(f"   🚫 Archivos excluidos: {excluded_count}")
+                result.output_dir = str(output_path)
+                return result.finish(True)
 
-            # Obtener patrones de exclusión y copia fiel
-            exclude_patterns = self.compiler_service.get_exclude_patterns(
-                template, exclude_file
-            )
-            copy_faithful_patterns = self.compiler_service.get_copy_faithful_patterns(
-                template
-            )
-            # Cargar patrones personalizados de copia fiel si se especifica
-            if copy_faithful_file:
-                if os.path.exists(copy_faithful_file):
-                    if copy_faithful_file.endswith(".py"):
-                        # Cargar como módulo Python
-                        spec = importlib.util.spec_from_file_location(
-                            "copy_faithful_module", copy_faithful_file
+            # Todas las tareas del build, para saber qué salidas conservar al sincronizar
+            planned = tasks
+            manifest = None
+            unchanged_count = 0
+            if incremental:
+                with self._phase(result, "incremental"):
+                    manifest = self._open_manifest(
+                        output_path, template, exclude_patterns, copy_faithful_patterns
+                    )
+                    pending = [
+                        task
+                        for task in tasks
+                        if not manifest.is_unchanged(
+                            task.relative_path, task.source, output_path
                         )
-                        module = importlib.util.module_from_spec(spec)
-                        spec.loader.exec_module(module)
-                        patterns = getattr(module, "COPY_FAITHFUL_PATTERNS", [])
-                        if isinstance(patterns, list):
-                            copy_faithful_patterns.extend(patterns)
-                    else:
-                        # Cargar como texto plano
-                        with open(copy_faithful_file, "r", encoding="utf-8") as f:
-                            for line in f:
-                                line = line.strip()
-                                if line and not line.startswith("#"):
-                                    copy_faithful_patterns.append(line)
-                else:
-                    # Tratar como patrón directo o lista separada por comas
-                    for pattern in copy_faithful_file.split(","):
-                        pattern = pattern.strip()
-                        if pattern:
-                            copy_faithful_patterns.append(pattern)
+                    ]
+                unchanged_count = len(tasks) - len(pending)
+                tasks = pending
+
+            extra_stats: Dict[str, int] = {}
+            journal = None
+            if staged_output is not None:
+                pending = self._resume_staged(
+                    tasks,
+                    staged_output,
+                    source_path,
+                    template,
+                    exclude_patterns,
+                    copy_faithful_patterns,
+                )
+                extra_stats["resumed"] = len(tasks) - len(pending)
+                tasks = pending
+                journal = self._journal_recorder(staged_output, output_path)
+
+            synced_count = 0
+            if output_sync is not None:
+                with self._phase(result, "sincronizar"):
+                    pending = self._skip_synced(tasks, output_sync, output_path, manifest)
+                synced_count = len(tasks) - len(pending)
+                tasks = pending
+
+            context = TaskContext(
+                self.compiler_service, self.file_manager, remove_py, self.compile_cache
+            )
+            errors = ErrorCollector()
+            on_done = self._failure_recorder(result, errors, journal)
+            package_logger = logging.getLogger(__name__.split(".")[0])
+            package_logger.addHandler(errors)
+            worker_cpu_ns = self._worker_cpu_ns
+            try:
+                with self._phase(result, "compilar y copiar", tareas=len(tasks)):
+                    outcomes = self._execute_tasks(tasks, jobs, context, on_done)
+            finally:
+                package_logger.removeHandler(errors)
+            result.worker_cpu_s = (self._worker_cpu_ns - worker_cpu_ns) / 1e9
+
+            if output_sync is not None:
+                extra_stats["synced"] = synced_count
+                with self._phase(result, "podar salida"):
+                    extra_stats["pruned"] = self._prune_unsynced(
+                        output_sync, planned, tasks, outcomes, source_path, output_path
+                    )
+            if staged_output is not None:
+                with self._phase(result, "publicar"):
+                    staged_output.commit()
+                output_path = staged_output.output_dir
+            with self._phase(result, "finalizar"):
+                self._finish_build(
+                    tasks,
+                    outcomes,
+                    output_path,
+                    excluded_count,
+                    unchanged_count,
+                    manifest,
+                    remove_py,
+                    extra_stats,
+                    result,
+                )
+            result.output_dir = str(output_path)
+            return result.finish(True)
+
+        except Exception as e:
+            logger.error(f"Error durante la compilación: {e}")
+            return result.finish(False, str(e))
+        finally:
+            if staged_output is not None:
+                staged_output.close()
+
+    def compile_project_to_archive(
+        self,
+        source_dir: str,
+        archive_file: str,
+        password: str,
+        method: str = "compress",
+        template: str = "basic",
+        exclude_file: Optional[str] = None,
+        copy_faithful_file: Optional[str] = None,
+        jobs: Optional[int] = 1,
+        walk_threads: int = 1,
+        crypto_threads: int = 1,
+        kdf: Optional[KdfParams] = None,
+        keyring: Optional[Path] = None,
+    ) -> BuildResult:
+        """
+        Compila un proyecto directamente dentro de un archivo protegido
+
+        Mismas reglas que compile_project, pero cada .pyc (compilado en memoria) y
+        cada asset se agregan al ZIP o .enc a medida que se producen, sin árbol de
+        salida intermedio. La escritura del archivo corre en un hilo propio,
+        solapada con la compilación.
+
+        Args:
+            archive_file: Archivo protegido a crear (la extensión se ajusta a .zip
+                o .enc según el método)
+            password: Contraseña/licencia del archivo
+            method: 'compress' o 'encrypt'
+            crypto_threads: Hilos que encriptan bloques en paralelo (0 = todos)
+            kdf: KDF y costo del .enc (default: PBKDF2-SHA256, 100k iteraciones)
+            keyring: Archivo donde persistir las claves derivadas
+
+        Returns:
+            BuildResult; bytes_written es el tamaño del archivo protegido
+        """
+        from .archive_build import write_archive
+        from .security_manager import SecurityManager
+
+        result = BuildResult(str(source_dir), str(archive_file))
+        source_path = Path(source_dir).resolve()
+        if not source_path.exists():
+            logger.error(f"Directorio fuente no existe: {source_path}")
+            return result.finish(False, f"Directorio fuente no existe: {source_path}")
+
+        try:
+            with self._phase(result, "preparar"):
+                exclude_patterns, copy_faithful_patterns = self._load_patterns(
+                    template, exclude_file, copy_faithful_file, source_path
+                )
             logger.info(f"Usando template: {template}")
-            logger.info(f"Patrones de exclusión: {len(exclude_patterns)}")
-            logger.info(f"Patrones de copia fiel: {len(copy_faithful_patterns)}")
-
-            compiled_count = 0
-            copied_count = 0
-            excluded_count = 0
-
-            # Recorrer todos los archivos
-            for root, dirs, files in os.walk(source_path):
-                # Filtrar directorios excluidos
-                dirs[:] = [
-                    d
-                    for d in dirs
-                    if not self.compiler_service.should_exclude(
-                        Path(root) / d, exclude_patterns
+
+            with self._phase(result, "recorrer") as walk_args:
+                tasks, excluded_count = self._plan_tasks(
+                    source_path,
+                    Path(archive_file).resolve(),
+                    exclude_patterns,
+                    copy_faithful_patterns,
+                    walk_threads,
+                )
+                walk_args.update(archivos=len(tasks), excluidos=excluded_count)
+
+            writer = SecurityManager(self.tracer, crypto_threads, kdf, keyring).open_archive(
+                Path(archive_file).resolve(), password, method
+            )
+            archive_path = writer.output_file
+            result.output_dir = str(archive_path)
+            logger.info(f"Compilando directo a {archive_path} ({method})")
+
+            if self._pool is not None and jobs != 1:
+                workers = min(jobs or self._pool_size, self._pool_size, len(tasks))
+            else:
+                workers = min(jobs or os.cpu_count() or 1, len(tasks))
+            context = TaskContext(self.compiler_service, self.file_manager)
+            errors = ErrorCollector()
+            package_logger = logging.getLogger(__name__.split(".")[0])
+            package_logger.addHandler(errors)
+            try:
+                with self._phase(result, "compilar y archivar", tareas=len(tasks)):
+                    archived = write_archive(
+                        tasks,
+                        context,
+                        writer,
+                        workers,
+                        self._pool,
+                        self._failure_recorder(result, errors),
                     )
-                ]
+            except BaseException:
+                writer.abort()
+                raise
+            finally:
+                package_logger.removeHandler(errors)
+            # Cerrar escribe la metadata (y con encrypt deriva la clave y cifra)
+            with self._phase(result, "cerrar archivo"):
+                writer.close()
+
+            outcomes = [outcome for outcome, _ in archived]
+            for task, (outcome, pyc_size) in zip(tasks, archived):
+                self._measure_archived(result, task, outcome, pyc_size)
+            result.bytes_written = archive_path.stat().st_size
+            self.last_build_stats = {
+                "compiled": outcomes.count("compiled"),
+                "copied": outcomes.count("copied"),
+                "excluded": excluded_count,
+                # Sin salida; las que no compilan se archivan como fuente ("copied")
+                "failed": sum(1 for failed in result.failed_files if failed.stage == "copy"),
+            }
+            result.counts = self.last_build_stats
+        except Exception as e:
+            logger.error(f"Error durante la compilación: {e}")
+            return result.finish(False, str(e))
+
+        logger.info(f"✅ Compilación completada en {archive_path}:")
+        logger.info(f"   📦 Archivos compilados: {result.counts['compiled']}")
+        logger.info(f"   📋 Archivos copiados: {result.counts['copied']}")
+        logger.info(f"   🚫 Archivos excluidos: {excluded_count}")
+        return result.finish(True)
+
+    async def compile_project_async(
+        self,
+        source_dir: str,
+        output_dir: str,
+        template: str = "basic",
+        exclude_file: Optional[str] = None,
+        remove_py: bool = False,
+        copy_faithful_file: Optional[str] = None,
+        jobs: Optional[int] = 1,
+        incremental: bool = False,
+        archive_file: Optional[str] = None,
+        password: Optional[str] = None,
+        method: str = "compress",
+    ) -> BuildResult:
+        """
+        Compila un proyecto como pipeline asíncrono por etapas
 
-                for file in files:
-                    file_path = Path(root) / file
-                    relative_path = file_path.relative_to(source_path)
-
-                    # Copia fiel: si coincide, copiar tal cual y continuar
-                    if self.compiler_service.should_copy_faithful(
-                        file_path, copy_faithful_patterns
-                    ):
-                        output_file_path = output_path / relative_path
-                        if self.file_manager.copy_file(file_path, output_file_path):
-                            copied_count += 1
-                        continue
-
-                    # Verificar si debe excluirse
-                    if self.compiler_service.should_exclude(file_path, exclude_patterns):
-                        excluded_count += 1
-                        continue
-
-                    output_file_path = output_path / relative_path
-
-                    if file.endswith(".py"):
-                        # Compilar archivo Python
-                        pyc_path = output_file_path.with_suffix(".pyc")
-                        if self.compiler_service.compile_python_file(file_path, pyc_path):
-                            compiled_count += 1
-
-                            # Eliminar .py original si se solicita
-                            if remove_py and output_file_path != file_path:
-                                try:
-                                    file_path.unlink()
-                                except Exception as e:
-                                    logger.warning(f"No se pudo eliminar {file_path}: {e}")
-                        else:
-                            # Si falla la compilación, copiar el archivo original
-                            if self.file_manager.copy_file(file_path, output_file_path):
-                                copied_count += 1
-                    else:
-                        # Copiar archivo tal como está
-                        if self.file_manager.copy_file(file_path, output_file_path):
-                            copied_count += 1
-
-            logger.info(f"✅ Compilación completada:")
-            logger.info(f"   📦 Archivos compilados: {compiled_count}")
-            logger.info(f"   📋 Archivos copiados: {copied_count}")
-            logger.info(f"   🚫 Archivos excluidos: {excluded_count}")
-            logger.info(f"   📁 Salida: {output_path}")
-
-            return True
+        Mismas reglas y resultado que compile_project, pero el recorrido, la
+        clasificación, la compilación y las copias avanzan a la vez, conectadas por
+        colas acotadas, sin bloquear el event loop del llamador.
 
+        Args:
+            archive_file: Si se indica, protege la salida en este archivo como
+                última etapa (ver SecurityManager)
+            password: Contraseña para archive_file
+            method: 'compress' o 'encrypt'
+
+        Returns:
+            BuildResult como el de compile_project; se evalúa como True si la
+            compilación (y la protección, si se pidió) fue exitosa
+        """
+        from .async_pipeline import AsyncBuildPipeline
+
+        result = BuildResult(str(source_dir), str(output_dir))
+        loop = asyncio.get_running_loop()
+        try:
+            prepared = await loop.run_in_executor(
+                None,
+                self._prepare_build,
+                source_dir,
+                output_dir,
+                template,
+                exclude_file,
+                copy_faithful_file,
+            )
+            if prepared is None:
+                return result.finish(False, "Directorio fuente o de salida inválido")
+            source_path, output_path, exclude_patterns, copy_faithful_patterns = prepared
+
+            manifest = None
+            if incremental:
+                manifest = await loop.run_in_executor(
+                    None,
+                    self._open_manifest,
+                    output_path,
+                    template,
+                    exclude_patterns,
+                    copy_faithful_patterns,
+                )
+
+            pipeline = AsyncBuildPipeline(
+                self,
+                source_path,
+                output_path,
+                exclude_patterns,
+                copy_faithful_patterns,
+                TaskContext(
+                    self.compiler_service, self.file_manager, remove_py, self.compile_cache
+                ),
+                jobs=jobs,
+                manifest=manifest,
+            )
+            tasks, outcomes = await pipeline.run()
+            await loop.run_in_executor(
+                None,
+                self._finish_build,
+                tasks,
+                outcomes,
+                output_path,
+                pipeline.excluded_count,
+                pipeline.unchanged_count,
+                manifest,
+                remove_py,
+                None,
+                result,
+            )
+            result.output_dir = str(output_path)
         except Exception as e:
             logger.error(f"Error durante la compilación: {e}")
+            return result.finish(False, str(e))
+
+        if archive_file is None:
+            return result.finish(True)
+
+        from .security_manager import SecurityManager
+
+        protected = await loop.run_in_executor(
+            None,
+            SecurityManager().protect_compiled_code,
+            output_path,
+            Path(archive_file),
+            password or "",
+            method,
+        )
+        if not protected:
+            return result.finish(False, f"No se pudo proteger la salida en {archive_file}")
+        return result.finish(True)
+
+    def _prepare_build(
+        self,
+        source_dir: str,
+        output_dir: str,
+        template: str,
+        exclude_file: Optional[str],
+        copy_faithful_file: Optional[str],
+    ) -> Optional[Tuple[Path, Path, PatternMatcher, PatternMatcher]]:
+        """
+        Valida las rutas, crea la salida y carga los patrones del build
+
+        Returns:
+            (fuente, salida, patrones de exclusión, patrones de copia fiel), o None
+            si el build no puede empezar
+        """
+        source_path = Path(source_dir).resolve()
+        output_path = Path(output_dir).resolve()
+
+        if not source_path.exists():
+            logger.error(f"Directorio fuente no existe: {source_path}")
+            return None
+
+        # Crear directorio de salida
+        if not self.file_manager.create_directory(output_path):
+            return None
+
+        # Obtener patrones de exclusión y copia fiel
+        exclude_patterns, copy_faithful_patterns = self._load_patterns(
+            template, exclude_file, copy_faithful_file, source_path
+        )
+        logger.info(f"Usando template: {template}")
+        logger.info(f"Patrones de exclusión: {len(exclude_patterns)}")
+        logger.info(f"Patrones de copia fiel: {len(copy_faithful_patterns)}")
+        return source_path, output_path, exclude_patterns, copy_faithful_patterns
+
+    def _plan_tasks(
+        self,
+        source_path: Path,
+        output_path: Path,
+        exclude_patterns: PatternMatcher,
+        copy_faithful_patterns: PatternMatcher,
+        walk_threads: int = 1,
+        skip_dir: Optional[Path] = None,
+    ) -> Tuple[List[BuildTask], int]:
+        """
+        Recorre el árbol fuente y planifica una tarea por archivo no excluido
+
+        El recorrido es en orden estable (resultados deterministas) y poda los
+        directorios excluidos, el propio directorio de salida y skip_dir.
+
+        Returns:
+            (tareas, archivos excluidos)
+        """
+        tracer = self.tracer
+
+        def include_dir(directory: WalkEntry) -> bool:
+            if skip_dir is not None and directory.path == str(skip_dir):
+                return False
+            return self._include_dir(
+                Path(directory.path),
+                source_path,
+                output_path,
+                exclude_patterns,
+                copy_faithful_patterns,
+            )
+
+        walk_filter = tracer.timed("patrones", include_dir)
+        classify_file = tracer.timed("patrones", self._classify_file)
+        excluded_count = 0
+        tasks: List[BuildTask] = []
+        for entry in iter_files(source_path, walk_filter, threads=walk_threads):
+            task = classify_file(
+                Path(entry.path),
+                source_path,
+                output_path,
+                exclude_patterns,
+                copy_faithful_patterns,
+                entry.relative_path,
+            )
+            if task is None:
+                excluded_count += 1
+            else:
+                tasks.append(task)
+        return tasks, excluded_count
+
+    def _include_dir(
+        self,
+        directory: Path,
+        source_path: Path,
+        output_path: Path,
+        exclude_patterns: PatternMatcher,
+        copy_faithful_patterns: PatternMatcher,
+    ) -> bool:
+        """
+        Indica si el recorrido debe entrar en un directorio fuente
+
+        Un directorio excluido se poda completo, salvo que sea de copia fiel.
+        """
+        if directory == output_path:
             return False
+        service = self.compiler_service
+        return not service.should_exclude(
+            directory, exclude_patterns, root=source_path, is_dir=True
+        ) or service.should_copy_faithful(
+            directory, copy_faithful_patterns, root=source_path, is_dir=True
+        )
+
+    def _open_manifest(
+        self,
+        output_path: Path,
+        template: str,
+        exclude_patterns: PatternMatcher,
+        copy_faithful_patterns: PatternMatcher,
+    ) -> BuildManifest:
+        """Carga el manifiesto del build anterior para un build incremental"""
+        manifest = BuildManifest(
+            output_path,
+            build_settings(
+                template,
+                exclude_patterns,
+                copy_faithful_patterns,
+                {"bytecode": self.compiler_service.bytecode_variant()},
+            ),
+        )
+        manifest.load()
+        return manifest
+
+    def _finish_build(
+        self,
+        tasks: List[BuildTask],
+        outcomes: List[str],
+        output_path: Path,
+        excluded_count: int,
+        unchanged_count: int,
+        manifest: Optional[BuildManifest],
+        remove_py: bool,
+        extra_stats: Optional[Dict[str, int]] = None,
+        result: Optional[BuildResult] = None,
+    ) -> None:
+        """Registra el manifiesto, guarda los contadores y muestra el resumen del build"""
+        cache_hits = outcomes.count("cached")
+        compiled_count = outcomes.count("compiled") + cache_hits
+        copied_count = sum(outcomes.count(outcome) for outcome in COPY_OUTCOMES)
+        reflinked_count = outcomes.count("reflinked")
+        hardlinked_count = outcomes.count("hardlinked")
+
+        removed_count = 0
+        if manifest is not None:
+            for task, outcome in zip(tasks, outcomes):
+                if outcome != "failed" and task.source.exists():
+                    manifest.record(
+                        task.relative_path,
+                        task.source,
+                        task.output_for(outcome).relative_to(output_path).as_posix(),
+                    )
+            # Con remove_py las fuentes desaparecen a propósito: no son obsoletas
+            removed_count = 0 if remove_py else manifest.remove_stale_outputs(output_path)
+            manifest.save()
+
+        self.last_build_stats = {
+            "compiled": compiled_count,
+            "copied": copied_count,
+            "excluded": excluded_count,
+            "failed": outcomes.count("failed"),
+            "cached": cache_hits,
+            "reflinked": reflinked_count,
+            "hardlinked": hardlinked_count,
+        }
+        if manifest is not None:
+            self.last_build_stats["unchanged"] = unchanged_count
+            self.last_build_stats["removed"] = removed_count
+        if extra_stats:
+            self.last_build_stats.update(extra_stats)
+        if result is not None:
+            result.counts = self.last_build_stats
+            for task, outcome in zip(tasks, outcomes):
+                self._measure_output(result, task, outcome)
+
+        logger.info(f"✅ Compilación completada:")
+        logger.info(f"   📦 Archivos compilados: {compiled_count}")
+        logger.info(f"   📋 Archivos copiados: {copied_count}")
+        if reflinked_count or hardlinked_count:
+            logger.info(
+                f"   🔗 Sin copia de datos: {reflinked_count} reflink, "
+                f"{hardlinked_count} hardlink"
+            )
+        logger.info(f"   🚫 Archivos excluidos: {excluded_count}")
+        if self.compile_cache is not None:
+            lookups = sum(1 for task in tasks if task.action == "compile")
+            hit_rate = 100.0 * cache_hits / lookups if lookups else 0.0
+            logger.info(f"   ⚡ Aciertos de caché: {cache_hits}/{lookups} ({hit_rate:.1f}%)")
+            self.compile_cache.prune()
+        if manifest is not None:
+            logger.info(f"   ♻️  Archivos sin cambios: {unchanged_count}")
+            logger.info(f"   🗑️  Salidas obsoletas eliminadas: {removed_count}")
+        if extra_stats and "synced" in extra_stats:
+            logger.info(f"   🔄 Archivos ya sincronizados: {extra_stats['synced']}")
+            logger.info(f"   🧹 Archivos sin fuente eliminados: {extra_stats['pruned']}")
+        if extra_stats and "resumed" in extra_stats:
+            logger.info(f"   ⏯️  Reanudados del build interrumpido: {extra_stats['resumed']}")
+        logger.info(f"   📁 Salida: {output_path}")
+
+    def _resume_staged(
+        self,
+        tasks: List[BuildTask],
+        staged_output: StagedOutput,
+        source_path: Path,
+        template: str,
+        exclude_patterns: PatternMatcher,
+        copy_faithful_patterns: PatternMatcher,
+    ) -> List[BuildTask]:
+        """Abre el staging y descarta las tareas que el journal da por terminadas"""
+        settings = build_settings(
+            template,
+            exclude_patterns,
+            copy_faithful_patterns,
+            {
+                "bytecode": self.compiler_service.bytecode_variant(),
+                "source": str(source_path),
+            },
+        )
+        if not staged_output.open(settings):
+            return tasks
+        pending = [
+            task
+            for task in tasks
+            if not staged_output.is_done(task.relative_path, task.source)
+        ]
+        logger.info(
+            f"Reanudando build interrumpido: {len(tasks) - len(pending)} archivos ya completados"
+        )
+        return pending
+
+    @staticmethod
+    def _journal_recorder(
+        staged_output: StagedOutput, output_path: Path
+    ) -> Callable[[BuildTask, str], None]:
+        """Callback que anota en el journal cada tarea terminada con éxito"""
+
+        def record(task: BuildTask, outcome: str) -> None:
+            if outcome != "failed" and task.source.exists():
+                staged_output.record(
+                    task.relative_path,
+                    task.source,
+                    task.output_for(outcome).relative_to(output_path).as_posix(),
+                )
+
+        return record
+
+    def _skip_synced(
+        self,
+        tasks: List[BuildTask],
+        output_sync: OutputSync,
+        output_path: Path,
+        manifest: Optional[BuildManifest],
+    ) -> List[BuildTask]:
+        """
+        Descarta las copias cuyo destino ya es idéntico a la fuente
+
+        Las compilaciones siempre se ejecutan (el .pyc no se puede comparar con la
+        fuente); para omitirlas está el build incremental.
+        """
+        pending = []
+        for task in tasks:
+            if task.action == "copy" and output_sync.is_synced(task.source, task.destination):
+                logger.debug(f"Sin cambios (sincronizado): {task.relative_path}")
+                if manifest is not None:
+                    # Sigue siendo una salida vigente para el próximo build incremental
+                    manifest.record(task.relative_path, task.source, task.relative_path)
+                continue
+            pending.append(task)
+        return pending
+
+    def _prune_unsynced(
+        self,
+        output_sync: OutputSync,
+        planned: List[BuildTask],
+        executed: List[BuildTask],
+        outcomes: List[str],
+        source_path: Path,
+        output_path: Path,
+    ) -> int:
+        """Elimina de la salida los archivos que no produce ninguna tarea del build"""
+        if output_path == source_path or output_path in source_path.parents:
+            logger.warning(
+                "La salida contiene las fuentes: no se eliminan archivos sobrantes"
+            )
+            return 0
+
+        expected: Set[str] = set()
+        results = {task.relative_path: outcome for task, outcome in zip(executed, outcomes)}
+        for task in planned:
+            outcome = results.get(task.relative_path)
+            if outcome is None or outcome == "failed":
+                # Omitida o fallida: se conserva la salida anterior, .pyc o copia
+                candidates = {task.destination, task.output_for("compiled")}
+            else:
+                candidates = {task.output_for(outcome)}
+            expected.update(path.relative_to(output_path).as_posix() for path in candidates)
+        return output_sync.prune(expected)
+
+    def watch_project(
+        self,
+        source_dir: str,
+        output_dir: str,
+        template: str = "basic",
+        exclude_file: Optional[str] = None,
+        copy_faithful_file: Optional[str] = None,
+        jobs: Optional[int] = 1,
+        incremental: bool = False,
+        walk_threads: int = 1,
+        sync: Optional[str] = None,
+        polling: bool = False,
+        poll_interval: float = 0.5,
+        stop_event: Optional[threading.Event] = None,
+    ) -> bool:
+        """
+        Compila el proyecto y luego recompila solo lo que cambia
+
+        Tras un build completo observa el árbol fuente (inotify o sondeo) y por cada
+        cambio compila, copia o elimina únicamente las salidas afectadas, con las
+        mismas reglas de exclusión y copia fiel que compile_project.
+
+        Args:
+            polling: Forzar el watcher por sondeo en lugar de inotify
+            poll_interval: Intervalo del sondeo en segundos
+            stop_event: Evento para detener la observación (default: Ctrl+C)
+
+        Returns:
+            False si el build inicial falla
+        """
+        build_args = dict(
+            source_dir=source_dir,
+            output_dir=output_dir,
+            template=template,
+            exclude_file=exclude_file,
+            copy_faithful_file=copy_faithful_file,
+            jobs=jobs,
+            incremental=incremental,
+            walk_threads=walk_threads,
+            sync=sync,
+        )
+        if not self.compile_project(**build_args):  # type: ignore[arg-type]
+            return False
+
+        source_path = Path(source_dir).resolve()
+        output_path = Path(output_dir).resolve()
+        exclude_patterns, copy_faithful_patterns = self._load_patterns(
+            template, exclude_file, copy_faithful_file, source_path
+        )
+        context = TaskContext(
+            self.compiler_service, self.file_manager, False, self.compile_cache
+        )
+
+        def watch_dir(directory: Path) -> bool:
+            return self._include_dir(
+                directory, source_path, output_path, exclude_patterns, copy_faithful_patterns
+            )
+
+        watcher = create_watcher(source_path, watch_dir, polling, poll_interval)
+        logger.info(f"👀 Observando cambios en {source_path} (Ctrl+C para salir)")
+        try:
+            while stop_event is None or not stop_event.is_set():
+                changes = watcher.wait(timeout=0.2)
+                if changes is None:
+                    logger.warning("Demasiados cambios simultáneos, reconstruyendo todo")
+                    self.compile_project(**build_args)  # type: ignore[arg-type]
+                    continue
+                if any(path.name == EXCLUDE_FILENAME for path in changes):
+                    # Las reglas cambiaron: recargarlas y volver a observar el árbol
+                    logger.info("Reglas de exclusión modificadas, reconstruyendo todo")
+                    exclude_patterns, copy_faithful_patterns = self._load_patterns(
+                        template, exclude_file, copy_faithful_file, source_path
+                    )
+                    watcher.close()
+                    watcher = create_watcher(source_path, watch_dir, polling, poll_interval)
+                    self.compile_project(**build_args)  # type: ignore[arg-type]
+                    continue
+                if changes:
+                    started = time.perf_counter()
+                    updated = self._apply_changes(
+                        changes,
+                        source_path,
+                        output_path,
+                        exclude_patterns,
+                        copy_faithful_patterns,
+                        context,
+                    )
+                    elapsed = (time.perf_counter() - started) * 1000
+                    logger.info(f"🔄 {updated} salidas actualizadas en {elapsed:.0f} ms")
+        except KeyboardInterrupt:
+            logger.info("Observación detenida")
+        finally:
+            watcher.close()
+        return True
+
+    def _apply_changes(
+        self,
+        changes: Set[Path],
+        source_path: Path,
+        output_path: Path,
+        exclude_patterns: PatternMatcher,
+        copy_faithful_patterns: PatternMatcher,
+        context: TaskContext,
+    ) -> int:
+        """Sincroniza la salida con un conjunto de rutas fuente modificadas"""
+        updated = 0
+        for path in sorted(changes):
+            if path == output_path or output_path in path.parents:
+                continue
+            try:
+                relative_path = path.relative_to(source_path)
+            except ValueError:
+                continue
+            # Respetar directorios excluidos en cualquier nivel, como el recorrido completo
+            if not all(
+                self._include_dir(
+                    source_path / parent,
+                    source_path,
+                    output_path,
+                    exclude_patterns,
+                    copy_faithful_patterns,
+                )
+                for parent in relative_path.parents
+                if parent != Path(".")
+            ):
+                continue
+
+            if path.is_dir():
+                continue  # Sus archivos llegan como cambios individuales
+            if not path.exists():
+                updated += self._remove_outputs(output_path / relative_path, output_path)
+                continue
+
+            task = self._classify_file(
+                path, source_path, output_path, exclude_patterns, copy_faithful_patterns
+            )
+            if task is None:
+                updated += self._remove_outputs(output_path / relative_path, output_path)
+                continue
+            outcome = execute_build_task(task, context)
+            if outcome == "failed":
+                continue
+            # Un .py puede alternar entre .pyc y copia fiel: quitar la salida anterior
+            if task.source.suffix == ".py":
+                for stale in {task.destination, task.output_for("compiled")}:
+                    if stale != task.output_for(outcome) and stale.exists():
+                        stale.unlink()
+            logger.debug(f"Actualizado: {relative_path}")
+            updated += 1
+        return updated
+
+    def _remove_outputs(self, output_file: Path, output_path: Path) -> int:
+        """Elimina las salidas de una fuente (o directorio fuente) que ya no existe"""
+        removed = 0
+        candidates = [output_file]
+        if output_file.suffix == ".py":
+            candidates.append(output_file.with_suffix(".pyc"))
+        for candidate in candidates:
+            if candidate.is_dir():
+                shutil.rmtree(candidate)
+                removed += 1
+            elif candidate.exists():
+                candidate.unlink()
+                removed += 1
+        if removed:
+            logger.debug(f"Eliminado: {output_file.relative_to(output_path)}")
+        return removed
+
+    def _load_patterns(
+        self,
+        template: str,
+        exclude_file: Optional[str] = None,
+        copy_faithful_file: Optional[str] = None,
+        source_path: Optional[Path] = None,
+    ) -> Tuple[PatternMatcher, PatternMatcher]:
+        """
+        Obtiene los patrones de exclusión y de copia fiel del build, ya compilados
+
+        Con source_path, las exclusiones incluyen los .sincpro_exclude del árbol.
+        """
+        exclude_patterns = self.compiler_service.get_exclude_patterns(template, exclude_file)
+        copy_faithful_patterns = list(
+            self.compiler_service.get_copy_faithful_patterns(template)
+        )
+        # Cargar patrones personalizados de copia fiel si se especifica
+        if copy_faithful_file:
+            if os.path.exists(copy_faithful_file):
+                if copy_faithful_file.endswith(".py"):
+                    # Cargar como módulo Python
+                    spec = importlib.util.spec_from_file_location(
+                        "copy_faithful_module", copy_faithful_file
+                    )
+                    module = importlib.util.module_from_spec(spec)
+                    spec.loader.exec_module(module)
+                    patterns = getattr(module, "COPY_FAITHFUL_PATTERNS", [])
+                    if isinstance(patterns, list):
+                        copy_faithful_patterns.extend(patterns)
+                else:
+                    # Cargar como texto plano
+                    with open(copy_faithful_file, "r", encoding="utf-8") as f:
+                        for line in f:
+                            line = line.strip()
+                            if line and not line.startswith("#"):
+                                copy_faithful_patterns.append(line)
+            else:
+                # Tratar como patrón directo o lista separada por comas
+                for pattern in copy_faithful_file.split(","):
+                    pattern = pattern.strip()
+                    if pattern:
+                        copy_faithful_patterns.append(pattern)
+        return (
+            self.compiler_service.compile_patterns(exclude_patterns, source_path),
+            self.compiler_service.compile_patterns(copy_faithful_patterns),
+        )
+
+    def _classify_file(
+        self,
+        file_path: Path,
+        source_path: Path,
+        output_path: Path,
+        exclude_patterns: PatternMatcher,
+        copy_faithful_patterns: PatternMatcher,
+        relative_posix: Optional[str] = None,
+    ) -> Optional[BuildTask]:
+        """
+        Decide qué hacer con un archivo del árbol fuente
+
+        Args:
+            relative_posix: Ruta relativa si el recorrido ya la conoce
+
+        Returns:
+            La tarea de compilación o copia, o None si el archivo se excluye
+        """
+        if relative_posix is None:
+            relative_posix = file_path.relative_to(source_path).as_posix()
+        output_file_path = output_path / relative_posix
+
+        # Copia fiel: si coincide, copiar tal cual
+        if self.compiler_service.should_copy_faithful(
+            file_path, copy_faithful_patterns, root=source_path
+        ):
+            return BuildTask("copy", file_path, output_file_path, relative_posix)
+
+        # Verificar si debe excluirse
+        if self.compiler_service.should_exclude(
+            file_path, exclude_patterns, root=source_path
+        ):
+            return None
+
+        action = "compile" if file_path.name.endswith(".py") else "copy"
+        return BuildTask(action, file_path, output_file_path, relative_posix)
+
+    def _compile_matrix(
+        self,
+        tasks: List[BuildTask],
+        python_targets: Sequence[Union[str, TargetInterpreter]],
+        output_path: Path,
+        jobs: Optional[int],
+        remove_py: bool,
+        result: BuildResult,
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Compila las tareas ya planificadas para cada intérprete destino
+
+        Las compilaciones corren en subprocesos worker de cada intérprete, todos en
+        paralelo; las copias (y los fallos de compilación) se copian por destino.
+
+        Returns:
+            Contadores (compiled, copied, failed) por cache tag del destino; los
+            bytes y los archivos con errores se suman a result, con la ruta
+            relativa precedida por el cache tag
+        """
+        targets = resolve_interpreters(python_targets)
+        engine = self.compiler_service.bytecode_compiler
+        workers = max(1, (jobs or os.cpu_count() or 1) // len(targets))
+        compile_tasks = [task for task in tasks if task.action == "compile"]
+        logger.info(
+            "Intérpretes destino: "
+            + ", ".join(f"{t.version} ({t.cache_tag})" for t in targets)
+        )
+
+        def retarget(task: BuildTask, target: TargetInterpreter) -> BuildTask:
+            relative_path = f"{target.cache_tag}/{task.relative_path}"
+            return BuildTask("copy", task.source, output_path / relative_path, relative_path)
+
+        results = MatrixCompiler(
+            # -1 es el nivel de este proceso, no el de los intérpretes destino
+            engine.effective_optimize,
+            engine.pyc_mode,
+        ).compile(
+            {
+                target: [
+                    MatrixTask(
+                        task.source,
+                        retarget(task, target).output_for("compiled"),
+                        task.relative_path,
+                    )
+                    for task in compile_tasks
+                ]
+                for target in targets
+            },
+            workers_per_target=workers,
+        )
+
+        context = TaskContext(self.compiler_service, self.file_manager)
+        errors = ErrorCollector()
+        package_logger = logging.getLogger(__name__.split(".")[0])
+        target_stats: Dict[str, Dict[str, int]] = {}
+        for target in targets:
+            copy_tasks = [retarget(task, target) for task in tasks if task.action == "copy"]
+            for task, error in zip(compile_tasks, results[target]):
+                compiled_task = retarget(task, target)
+                if error is None:
+                    self._measure_output(result, compiled_task, "compiled")
+                    continue
+                logger.error(f"Error compilando {task.source} ({target.cache_tag}): {error}")
+                result.failed_files.append(
+                    FailedFile(compiled_task.relative_path, "compile", error)
+                )
+                # Si falla la compilación, copiar el archivo original
+                copy_tasks.append(compiled_task)
+            package_logger.addHandler(errors)
+            try:
+                outcomes = self._execute_tasks(
+                    copy_tasks, jobs, context, self._failure_recorder(result, errors)
+                )
+            finally:
+                package_logger.removeHandler(errors)
+            for task, outcome in zip(copy_tasks, outcomes):
+                self._measure_output(result, task, outcome)
+
+            target_stats[target.cache_tag] = {
+                "compiled": results[target].count(None),
+                "copied": sum(outcomes.count(outcome) for outcome in COPY_OUTCOMES),
+                "failed": outcomes.count("failed"),
+            }
+            logger.info(f"✅ Compilación completada para Python {target.version}:")
+            logger.info(
+                f"   📦 Archivos compilados: {target_stats[target.cache_tag]['compiled']}"
+            )
+            logger.info(
+                f"   📋 Archivos copiados: {target_stats[target.cache_tag]['copied']}"
+            )
+            logger.info(f"   📁 Salida: {output_path / target.cache_tag}")
+
+        # Eliminar .py original si se solicita y compiló para todos los destinos
+        if remove_py:
+            for index, task in enumerate(compile_tasks):
+                if all(results[target][index] is None for target in targets):
+                    try:
+                        task.source.unlink()
+                    except Exception as e:
+                        logger.warning(f"No se pudo eliminar {task.source}: {e}")
+        return target_stats
+
+    def _execute_tasks(
+        self,
+        tasks: List[BuildTask],
+        jobs: Optional[int],
+        context: TaskContext,
+        on_done: Optional[Callable[[BuildTask, str], None]] = None,
+    ) -> List[str]:
+        """
+        Ejecuta las tareas planificadas, en serie o en un pool de procesos
+
+        Los resultados y los logs de error se devuelven en el orden de las tareas,
+        independientemente del orden en que terminen los workers. on_done se llama
+        con cada tarea y su resultado a medida que se recogen.
+        """
+        if self._pool is not None and jobs != 1:
+            workers = min(jobs or self._pool_size, self._pool_size, len(tasks))
+        else:
+            workers = min(jobs or os.cpu_count() or 1, len(tasks))
+
+        if workers <= 1:
+            outcomes = []
+            for task in tasks:
+                start_ns = time.perf_counter_ns()
+                outcomes.append(execute_build_task(task, context))
+                self._trace_task(task, outcomes[-1], TaskTiming.measure_from(start_ns))
+                if on_done is not None:
+                    on_done(task, outcomes[-1])
+            return outcomes
+
+        logger.info(f"Compilando en paralelo con {workers} procesos")
+        # El contexto viaja una vez por bloque, no una vez por tarea
+        chunksize = max(1, len(tasks) // (workers * 16))
+        chunks = [tasks[i : i + chunksize] for i in range(0, len(tasks), chunksize)]
+        executor = self._pool or ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker
+        )
+        outcomes = []
+        try:
+            futures = [executor.submit(_run_worker_chunk, context, chunk) for chunk in chunks]
+            for future in futures:
+                for outcome, records, timing in future.result():
+                    for record in records:
+                        logging.getLogger(record.name).handle(record)
+                    self._trace_task(tasks[len(outcomes)], outcome, timing)
+                    self._worker_cpu_ns += timing.cpu_ns
+                    if on_done is not None:
+                        on_done(tasks[len(outcomes)], outcome)
+                    outcomes.append(outcome)
+        finally:
+            if executor is not self._pool:
+                executor.shutdown()
+        return outcomes
+
+    @contextlib.contextmanager
+    def _phase(self, result: BuildResult, name: str, **args: Any) -> Iterator[Dict[str, Any]]:
+        """Fase del build: span de la traza y tiempos en el BuildResult"""
+        with self.tracer.span(name, **args) as span_args, result.phase(name):
+            yield span_args
+
+    @staticmethod
+    def _failure_recorder(
+        result: BuildResult,
+        errors: ErrorCollector,
+        then: Optional[Callable[[BuildTask, str], None]] = None,
+    ) -> Callable[[BuildTask, str], None]:
+        """Callback on_done que registra en el reporte las tareas con errores"""
+
+        def record(task: BuildTask, outcome: str) -> None:
+            messages = errors.take()
+            if outcome == "failed":
+                stage = "copy"
+            elif task.action == "compile" and outcome in COPY_OUTCOMES:
+                stage = "compile"
+            else:
+                stage = ""
+            if stage:
+                error = "; ".join(messages) or "error desconocido"
+                result.failed_files.append(FailedFile(task.relative_path, stage, error))
+            if then is not None:
+                then(task, outcome)
+
+        return record
+
+    @staticmethod
+    def _measure_output(result: BuildResult, task: BuildTask, outcome: str) -> None:
+        """Suma al reporte los bytes leídos y escritos por una tarea"""
+        if outcome == "failed":
+            return
+        if outcome in ("reflinked", "hardlinked"):
+            # Comparten los datos con la fuente: no se lee ni se escribe contenido
+            result.add_output(outcome, 0, 0)
+            return
+        try:
+            read = task.source.stat().st_size
+        except OSError:
+            read = 0  # p. ej. eliminada por remove_py
+        try:
+            written = task.output_for(outcome).stat().st_size
+        except OSError:
+            written = 0
+        result.add_output(outcome, read, written)
+
+    @staticmethod
+    def _measure_archived(
+        result: BuildResult, task: BuildTask, outcome: str, pyc_size: int
+    ) -> None:
+        """Suma los bytes de una entrada del archivo (sin comprimir) al reporte"""
+        try:
+            read = task.source.stat().st_size
+        except OSError:
+            read = 0
+        result.add_output(outcome, read, pyc_size if outcome == "compiled" else read)
+
+    def _trace_task(self, task: BuildTask, outcome: str, timing: TaskTiming) -> None:
+        """Registra la duración de un archivo en la traza del build"""
+        if outcome in ("compiled", "cached"):
+            category = "compile"
+        elif outcome == "failed":
+            category = "failed"
+        else:
+            category = "copy"
+        self.tracer.add_span(task.relative_path, category, timing, {"resultado": outcome})
+
+    def start_worker_pool(self, jobs: Optional[int] = None) -> None:
+        """
+        Mantiene un pool de procesos caliente para los siguientes builds
+
+        Los procesos se crean de inmediato; los builds con jobs != 1 lo reutilizan
+        en lugar de crear y destruir un pool cada vez. Con jobs=1 no se crea pool.
+        """
+        if self._pool is not None or jobs == 1:
+            return
+        self._pool_size = jobs or os.cpu_count() or 1
+        self._pool = ProcessPoolExecutor(
+            max_workers=self._pool_size, initializer=_init_worker
+        )
+        for future in [self._pool.submit(os.getpid) for _ in range(self._pool_size)]:
+            future.result()
+
+    def shutdown_worker_pool(self) -> None:
+        """Detiene el pool de procesos persistente, si existe"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
 
     def list_templates(self) -> None:
         """Lista los templates disponibles"""
@@ -4,11 +4,13 @@ Infraestructura - Manager de seguridad que orquesta compresión y encriptación
 
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 from ..domain.security_service import SecurityServiceProtocol
-from .compression_service import ZipCompressionService
-from .encryption_service import SimpleEncryptionService
+from .build_tracer import BuildTracer
+from .compression_service import ZipArchiveWriter, ZipCompressionService
+from .encryption_service import EncryptedArchiveWriter, SimpleEncryptionService
+from .key_derivation import KdfParams, shared_key_cache
 
 
 class SecurityManager(SecurityServiceProtocol):
@@ -16,13 +18,28 @@ class SecurityManager(SecurityServiceProtocol):
     Manager principal que orquesta los servicios de seguridad
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        tracer: Optional[BuildTracer] = None,
+        crypto_threads: int = 1,
+        kdf: Optional[KdfParams] = None,
+        keyring: Optional[Path] = None,
+    ):
         self.logger = logging.getLogger(__name__)
-        self.compression_service = ZipCompressionService()
+        # Spans de la protección (--trace-out), compartidos con los servicios
+        self.tracer = tracer or BuildTracer(enabled=False)
+        # Hilos para encriptar/desencriptar bloques en paralelo (0 = todos los CPUs)
+        self.crypto_threads = crypto_threads
+        # KDF de los .enc nuevos y keyring opcional de claves derivadas
+        self.kdf = kdf
+        self.keyring = keyring
+        self.compression_service = ZipCompressionService(self.tracer)
 
         # Inicializar servicio de encriptación con manejo de errores
         try:
-            self.encryption_service = SimpleEncryptionService()
+            self.encryption_service = SimpleEncryptionService(
+                self.tracer, crypto_threads, kdf, shared_key_cache(keyring)
+            )
             self.encryption_available = True
         except ImportError as e:
             self.logger.warning(f"Encriptación no disponible: {e}")
@@ -54,13 +71,44 @@ class SecurityManager(SecurityServiceProtocol):
 
         self.logger.info(f"Protegiendo código con método: {method}")
 
+        with self.tracer.span("proteger", "proteger", metodo=method):
+            if method == "compress":
+                return self._protect_with_compression(compiled_dir, output_file, password)
+            elif method == "encrypt":
+                return self._protect_with_encryption(compiled_dir, output_file, password)
+            else:
+                self.logger.error(f"Método de protección no válido: {method}")
+                return False
+
+    def open_archive(
+        self, output_file: Path, password: str, method: str = "compress"
+    ) -> Union[ZipArchiveWriter, EncryptedArchiveWriter]:
+        """
+        Abre un archivo protegido para escribirlo entrada por entrada
+
+        El writer acepta add_file / add_bytes y se usa como context manager; así el
+        build puede volcar cada .pyc al archivo sin un directorio intermedio.
+
+        Raises:
+            ValueError: contraseña vacía o método no válido
+            ImportError: encriptación pedida sin cryptography instalado
+        """
+        if not password or len(password.strip()) == 0:
+            raise ValueError("Contraseña requerida para protección")
         if method == "compress":
-            return self._protect_with_compression(compiled_dir, output_file, password)
-        elif method == "encrypt":
-            return self._protect_with_encryption(compiled_dir, output_file, password)
-        else:
-            self.logger.error(f"Método de protección no válido: {method}")
-            return False
+            return self.compression_service.open_writer(
+                output_file.with_suffix(".zip"), password
+            )
+        if method == "encrypt":
+            if self.encryption_service is None:
+                raise ImportError(
+                    "Servicio de encriptación no disponible. "
+                    "Instale cryptography: pip install cryptography"
+                )
+            return self.encryption_service.open_writer(
+                output_file.with_suffix(".enc"), password
+            )
+        raise ValueError(f"Método de protección no válido: {method}")
 
     def unprotect_code(self, protected_file: Path, output_dir: Path, password: str) -> bool:
         """
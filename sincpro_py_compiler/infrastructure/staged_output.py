@@ -0,0 +1,167 @@
+"""
+Infraestructura - Salida en staging con journal reanudable
+
+El build escribe en un directorio de staging junto a la salida y anota cada
+archivo terminado en un journal de solo-agregar. Si el proceso muere, el build
+siguiente reanuda desde el journal; al terminar, el staging reemplaza a la salida
+con un rename atómico, de modo que nunca se ve un árbol a medio construir.
+
+    dist/                   salida publicada (build anterior, intacta)
+    .dist.staging/          build en curso
+    .dist.journal           una línea JSON por archivo terminado
+"""
+
+import ctypes
+import errno
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import IO, Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_VERSION = 1
+
+# renameat2(2): intercambia dos rutas en una sola operación atómica
+_AT_FDCWD = -100
+_RENAME_EXCHANGE = 2
+
+
+class StagedOutput:
+    """Directorio de staging y journal de un build con publicación atómica"""
+
+    def __init__(self, output_dir: Path):
+        self.output_dir = output_dir
+        self.staging_dir = output_dir.with_name(f".{output_dir.name}.staging")
+        self.journal_path = output_dir.with_name(f".{output_dir.name}.journal")
+        self.completed: Dict[str, Dict[str, Any]] = {}
+        self._journal: Optional[IO[str]] = None
+        self._truncated = False
+
+    def open(self, settings: Dict[str, Any]) -> int:
+        """
+        Prepara el staging, reanudando el build interrumpido si es compatible
+
+        Args:
+            settings: Configuración del build; si difiere de la del journal, el
+                staging se descarta y el build empieza de cero
+
+        Returns:
+            int: Archivos ya completados que se reanudan
+        """
+        # Normalizado como JSON para compararlo con el que se lee del journal
+        header = json.loads(json.dumps({"version": JOURNAL_VERSION, "settings": settings}))
+        if self.staging_dir.is_dir() and self._load(header):
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+            if self._truncated:
+                self._journal.write("\n")
+            return len(self.completed)
+
+        if self.staging_dir.exists():
+            shutil.rmtree(self.staging_dir)
+        self.staging_dir.mkdir(parents=True)
+        self.completed = {}
+        self._journal = open(self.journal_path, "w", encoding="utf-8")
+        self._append(header)
+        return 0
+
+    def _load(self, header: Dict[str, Any]) -> bool:
+        """Lee el journal; False si no existe o es de otra configuración"""
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                content = f.read()
+        except (OSError, UnicodeDecodeError):
+            return False
+        lines = content.splitlines()
+        self._truncated = bool(content) and not content.endswith("\n")
+        if not lines or _parse(lines[0]) != header:
+            logger.info("El build interrumpido tenía otra configuración, se descarta")
+            return False
+        for line in lines[1:]:
+            entry = _parse(line)
+            # Una línea incompleta es la escritura que cortó la interrupción
+            if entry is not None and "source" in entry:
+                self.completed[entry["source"]] = entry
+        return True
+
+    def is_done(self, relative_source: str, source: Path) -> bool:
+        """Verifica si una fuente ya se procesó, sin cambios, en el build interrumpido"""
+        entry = self.completed.get(relative_source)
+        if entry is None or not (self.staging_dir / entry["output"]).exists():
+            return False
+        stat = source.stat()
+        return stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime_ns"]
+
+    def record(self, relative_source: str, source: Path, relative_output: str) -> None:
+        """Anota en el journal una fuente terminada y la salida que produjo"""
+        stat = source.stat()
+        self._append(
+            {
+                "source": relative_source,
+                "output": relative_output,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+            }
+        )
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        assert self._journal is not None
+        self._journal.write(json.dumps(entry) + "\n")
+        # A disco del sistema: sobrevive a la muerte del proceso (OOM, timeout)
+        self._journal.flush()
+
+    def close(self) -> None:
+        """Cierra el journal; el staging queda listo para reanudar"""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def commit(self) -> None:
+        """Publica el staging como salida con un rename atómico y limpia el journal"""
+        self.close()
+        if not self.output_dir.exists():
+            os.rename(self.staging_dir, self.output_dir)
+        elif _exchange(self.staging_dir, self.output_dir):
+            # El staging quedó con el árbol anterior
+            shutil.rmtree(self.staging_dir)
+        else:
+            # Sin renameat2: la salida desaparece un instante, pero nunca queda a medias
+            previous = self.output_dir.with_name(f".{self.output_dir.name}.previous")
+            if previous.exists():
+                shutil.rmtree(previous)
+            os.rename(self.output_dir, previous)
+            os.rename(self.staging_dir, self.output_dir)
+            shutil.rmtree(previous)
+        self.journal_path.unlink()
+
+
+def _parse(line: str) -> Optional[Dict[str, Any]]:
+    try:
+        value = json.loads(line)
+    except ValueError:
+        return None
+    return value if isinstance(value, dict) else None
+
+
+def _exchange(first: Path, second: Path) -> bool:
+    """Intercambia dos directorios con renameat2(RENAME_EXCHANGE); False si no hay soporte"""
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        renameat2 = libc.renameat2
+    except (OSError, AttributeError, TypeError):
+        return False
+    result = renameat2(
+        _AT_FDCWD,
+        os.fsencode(first),
+        _AT_FDCWD,
+        os.fsencode(second),
+        _RENAME_EXCHANGE,
+    )
+    if result == 0:
+        return True
+    error = ctypes.get_errno()
+    if error in (errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP):
+        return False
+    raise OSError(error, os.strerror(error), str(first))
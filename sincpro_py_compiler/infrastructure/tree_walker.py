@@ -0,0 +1,154 @@
+"""
+Infraestructura - Recorrido de árboles de directorios basado en os.scandir
+
+Un único recorrido compartido por el compilador y los servicios de compresión y
+encriptación. Es un generador: entrega archivos a medida que los encuentra, sin
+construir listas del árbol completo, reutiliza el tipo y el stat que cachea cada
+DirEntry y poda los directorios excluidos antes de abrirlos.
+
+En sistemas de archivos con latencia alta (NFS), cada readdir es un viaje de red:
+con threads > 1 los subdirectorios se listan en paralelo en un pool de hilos y el
+resultado se entrega en el mismo orden que el recorrido secuencial.
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterator, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class WalkEntry(NamedTuple):
+    """Archivo o directorio encontrado durante el recorrido"""
+
+    path: str  # Ruta completa
+    relative_path: str  # Ruta POSIX relativa a la raíz del recorrido
+    entry: os.DirEntry
+
+    @property
+    def name(self) -> str:
+        return self.entry.name
+
+    def stat(self) -> os.stat_result:
+        """Stat del archivo (cacheado por DirEntry: como mucho una llamada)"""
+        return self.entry.stat()
+
+
+# Decide si se entra en un directorio
+DirFilter = Callable[[WalkEntry], bool]
+
+# Listado de un directorio en el recorrido con hilos: archivos y el listado
+# (pendiente) de cada subdirectorio aceptado
+_Listing = Tuple[List[WalkEntry], List[Tuple[str, "Future[_Listing]"]]]
+
+
+def scan_directory(
+    directory: str, relative_dir: str = "", sort: bool = True
+) -> Tuple[List[WalkEntry], List[WalkEntry]]:
+    """
+    Lista un directorio con una sola llamada a scandir
+
+    Los enlaces simbólicos a directorios no se siguen (como os.walk) y solo se
+    devuelven archivos regulares, o enlaces a ellos.
+
+    Returns:
+        (subdirectorios, archivos), en orden por nombre si sort es True
+
+    Raises:
+        OSError: Si el directorio no se puede leer
+    """
+    prefix = relative_dir + "/" if relative_dir else ""
+    dirs: List[WalkEntry] = []
+    files: List[WalkEntry] = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.append(WalkEntry(entry.path, prefix + entry.name, entry))
+                elif entry.is_file():
+                    files.append(WalkEntry(entry.path, prefix + entry.name, entry))
+            except OSError:
+                continue  # Entrada que desapareció durante el recorrido
+    if sort:
+        dirs.sort(key=lambda item: item.entry.name)
+        files.sort(key=lambda item: item.entry.name)
+    return dirs, files
+
+
+def iter_files(
+    root: Path,
+    dir_filter: Optional[DirFilter] = None,
+    sort: bool = True,
+    threads: int = 1,
+) -> Iterator[WalkEntry]:
+    """
+    Recorre un árbol en profundidad y entrega sus archivos de forma incremental
+
+    Con sort=True el orden es determinista y coincide con os.walk ordenado: los
+    archivos de un directorio y luego cada subdirectorio por nombre.
+
+    Args:
+        root: Directorio raíz
+        dir_filter: Función que indica si entrar en un directorio (poda temprana)
+        sort: Ordenar las entradas de cada directorio por nombre
+        threads: Hilos que listan directorios en paralelo (1 = secuencial)
+    """
+    if threads > 1:
+        yield from _iter_files_threaded(root, dir_filter, sort, threads)
+        return
+
+    pending: List[Tuple[str, str]] = [(os.fspath(root), "")]
+    while pending:
+        directory, relative_dir = pending.pop()
+        try:
+            dirs, files = scan_directory(directory, relative_dir, sort)
+        except OSError as e:
+            logger.warning(f"No se pudo leer el directorio {directory}: {e}")
+            continue
+        yield from files
+        included = [d for d in dirs if dir_filter is None or dir_filter(d)]
+        pending.extend((d.path, d.relative_path) for d in reversed(included))
+
+
+def _iter_files_threaded(
+    root: Path, dir_filter: Optional[DirFilter], sort: bool, threads: int
+) -> Iterator[WalkEntry]:
+    """
+    Variante de iter_files que lista los directorios en un pool de hilos
+
+    Cada hilo, al terminar un listado, filtra sus subdirectorios y encola sus
+    listados, así el recorrido avanza por el árbol sin esperar al llamador; este
+    consume los resultados siguiendo la pila del recorrido secuencial, por lo que
+    el orden no cambia. dir_filter se llama desde los hilos: debe ser thread-safe.
+    """
+    executor = ThreadPoolExecutor(threads, thread_name_prefix="sincpro-walk")
+    stopped = threading.Event()
+
+    def scan(directory: str, relative_dir: str) -> _Listing:
+        dirs, files = scan_directory(directory, relative_dir, sort)
+        children = []
+        if not stopped.is_set():
+            for d in dirs:
+                if dir_filter is None or dir_filter(d):
+                    children.append((d.path, executor.submit(scan, d.path, d.relative_path)))
+        return files, children
+
+    try:
+        directory = os.fspath(root)
+        pending = [(directory, executor.submit(scan, directory, ""))]
+        while pending:
+            directory, future = pending.pop()
+            try:
+                files, children = future.result()
+            except OSError as e:
+                logger.warning(f"No se pudo leer el directorio {directory}: {e}")
+                continue
+            yield from files
+            pending.extend(reversed(children))
+    finally:
+        # Si el llamador abandona el recorrido, descartar los listados pendientes
+        stopped.set()
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,95 @@
+"""
+Tests para el build directo a archivo protegido (--stream)
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from sincpro_py_compiler.infrastructure.compression_service import ZipArchiveWriter
+from sincpro_py_compiler.infrastructure.encryption_service import CRYPTO_AVAILABLE
+from sincpro_py_compiler.infrastructure.python_compiler import PythonCompiler
+from sincpro_py_compiler.infrastructure.security_manager import SecurityManager
+
+METHODS = ["compress"] + (["encrypt"] if CRYPTO_AVAILABLE else [])
+
+
+class TestArchiveBuild:
+    """Tests de compile_project_to_archive"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.source_dir = self.temp_dir / "src"
+        (self.source_dir / "pkg").mkdir(parents=True)
+        for i in range(20):
+            (self.source_dir / "pkg" / f"mod_{i}.py").write_text(f"VALOR = {i}\n")
+        (self.source_dir / "roto.py").write_text("def (\n")
+        (self.source_dir / "datos.json").write_text("{}")
+        (self.source_dir / "__pycache__").mkdir()
+        (self.source_dir / "__pycache__" / "viejo.pyc").write_bytes(b"")
+        self.compiler = PythonCompiler()
+
+    def teardown_method(self):
+        self.compiler.shutdown_worker_pool()
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
+    def _extract(self, archive: Path) -> dict:
+        extracted = self.temp_dir / "extraido"
+        assert SecurityManager().unprotect_code(archive, extracted, "licencia")
+        return {
+            p.relative_to(extracted).as_posix(): p.read_bytes()
+            for p in extracted.rglob("*")
+            if p.is_file()
+        }
+
+    @pytest.mark.parametrize("method", METHODS)
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_mismo_contenido_que_el_build_en_disco(self, method, jobs):
+        """Test: el archivo contiene los mismos .pyc que compile_project + protección"""
+        result = self.compiler.compile_project_to_archive(
+            str(self.source_dir), str(self.temp_dir / "dist"), "licencia", method, jobs=jobs
+        )
+
+        assert result
+        archive = Path(result.output_dir)
+        assert archive.suffix == (".zip" if method == "compress" else ".enc")
+        assert not (self.temp_dir / "dist").exists()
+        assert result.counts == {"compiled": 20, "copied": 2, "excluded": 0, "failed": 0}
+        assert [f.path for f in result.failed_files] == ["roto.py"]
+        assert result.bytes_written == archive.stat().st_size
+
+        streamed = self._extract(archive)
+        shutil.rmtree(self.temp_dir / "extraido")
+        assert self.compiler.compile_project(
+            str(self.source_dir), str(self.temp_dir / "disco")
+        )
+        on_disk = {
+            p.relative_to(self.temp_dir / "disco").as_posix(): p.read_bytes()
+            for p in (self.temp_dir / "disco").rglob("*")
+            if p.is_file()
+        }
+        assert streamed == on_disk
+
+    def test_error_no_deja_archivo_incompleto(self):
+        """Test: si falla la escritura del archivo, no queda un ZIP a medias"""
+        with patch.object(ZipArchiveWriter, "add_file", side_effect=OSError("disco lleno")):
+            result = self.compiler.compile_project_to_archive(
+                str(self.source_dir), str(self.temp_dir / "dist"), "licencia"
+            )
+
+        assert not result
+        assert result.error is not None and "disco lleno" in result.error
+        assert not (self.temp_dir / "dist.zip").exists()
+
+    def test_contraseña_vacía(self):
+        """Test: sin contraseña el build falla sin crear el archivo"""
+        result = self.compiler.compile_project_to_archive(
+            str(self.source_dir), str(self.temp_dir / "dist"), ""
+        )
+
+        assert not result
+        assert not (self.temp_dir / "dist.zip").exists()
@@ -0,0 +1,115 @@
+"""
+Tests para importar módulos directamente desde un archivo protegido
+"""
+
+import importlib
+import pkgutil
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from sincpro_py_compiler.infrastructure.archive_importer import ArchiveFinder, install_archive
+from sincpro_py_compiler.infrastructure.encrypted_stream import ContainerError
+from sincpro_py_compiler.infrastructure.encryption_service import CRYPTO_AVAILABLE
+from sincpro_py_compiler.infrastructure.python_compiler import PythonCompiler
+
+METHODS = ["compress"] + (["encrypt"] if CRYPTO_AVAILABLE else [])
+PACKAGE = "app_archivada"
+
+
+class TestArchiveImporter:
+    """Tests de ArchiveFinder sobre archivos de compile_project_to_archive"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.source_dir = self.temp_dir / "src"
+        package = self.source_dir / PACKAGE
+        (package / "ventas").mkdir(parents=True)
+        (package / "__init__.py").write_text("NOMBRE = 'app'\n")
+        (package / "ventas" / "__init__.py").write_text("")
+        (package / "ventas" / "modelo.py").write_text(
+            "from .. import NOMBRE\n\ndef total(items):\n    return sum(items)\n"
+        )
+        for i in range(10):
+            (package / f"addon_{i}.py").write_text(f"VALOR = {i}\n")
+        (package / "datos.json").write_text('{"ok": true}')
+        (self.source_dir / "espacio" / "sub").mkdir(parents=True)
+        (self.source_dir / "espacio" / "sub" / "util.py").write_text("X = 1\n")
+        self.finder = None
+
+    def teardown_method(self):
+        if self.finder is not None:
+            self.finder.uninstall()
+        for name in list(sys.modules):
+            if name.split(".")[0] in (PACKAGE, "espacio"):
+                del sys.modules[name]
+        shutil.rmtree(self.temp_dir)
+
+    def _build(self, method: str) -> Path:
+        compiler = PythonCompiler()
+        try:
+            result = compiler.compile_project_to_archive(
+                str(self.source_dir), str(self.temp_dir / "dist"), "licencia", method
+            )
+        finally:
+            compiler.shutdown_worker_pool()
+        assert result
+        return Path(result.output_dir)
+
+    @pytest.mark.parametrize("method", METHODS)
+    def test_importa_paquetes_y_submodulos(self, method):
+        self.finder = install_archive(self._build(method), "licencia")
+        modelo = importlib.import_module(f"{PACKAGE}.ventas.modelo")
+
+        assert modelo.NOMBRE == "app"
+        assert modelo.total([1, 2, 3]) == 6
+        assert modelo.__file__ == f"{self.finder.archive}/{PACKAGE}/ventas/modelo.pyc"
+        assert modelo.__loader__ is self.finder
+        assert sys.modules[PACKAGE].__path__ == [f"{self.finder.archive}/{PACKAGE}"]
+
+    @pytest.mark.parametrize("method", METHODS)
+    def test_lee_solo_los_modulos_importados(self, method):
+        self.finder = install_archive(self._build(method), "licencia")
+        read = []
+        original = self.finder._source.read
+        self.finder._source.read = lambda member: read.append(member) or original(member)
+
+        importlib.import_module(f"{PACKAGE}.addon_3")
+
+        assert read == [f"{PACKAGE}/__init__.pyc", f"{PACKAGE}/addon_3.pyc"]
+
+    @pytest.mark.parametrize("method", METHODS)
+    def test_namespace_y_datos(self, method):
+        self.finder = install_archive(self._build(method), "licencia")
+        util = importlib.import_module("espacio.sub.util")
+
+        assert util.X == 1
+        assert pkgutil.get_data(PACKAGE, "datos.json") == b'{"ok": true}'
+        with pytest.raises(FileNotFoundError):
+            pkgutil.get_data(PACKAGE, "falta.json")
+
+    @pytest.mark.parametrize("method", METHODS)
+    def test_contraseña_incorrecta(self, method):
+        with pytest.raises(ContainerError):
+            ArchiveFinder(self._build(method), "otra")
+
+    def test_otra_version_de_python(self):
+        archive = self._build(METHODS[-1])
+        self.finder = install_archive(archive, "licencia")
+        original = self.finder._source.read
+        self.finder._source.read = lambda member: b"\x00\x00\r\n" + original(member)[4:]
+
+        with pytest.raises(ImportError, match="otra versión de Python"):
+            importlib.import_module(PACKAGE)
+
+    def test_uninstall(self):
+        self.finder = install_archive(self._build(METHODS[-1]), "licencia")
+        assert sys.meta_path[0] is self.finder
+        self.finder.uninstall()
+        assert self.finder not in sys.meta_path
+        with pytest.raises(ImportError):
+            importlib.import_module(PACKAGE)
+        self.finder = None
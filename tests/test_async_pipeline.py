@@ -0,0 +1,111 @@
+"""
+Tests para el pipeline asíncrono de compilación
+"""
+
+import asyncio
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from sincpro_py_compiler.infrastructure.python_compiler import PythonCompiler
+
+
+def _snapshot(directory: Path):
+    return sorted(p.relative_to(directory).as_posix() for p in directory.rglob("*"))
+
+
+class TestAsyncPipeline:
+    """Tests de compile_project_async"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.source_dir = self.temp_dir / "src"
+        for package in ("app", "app/core", "app/utils"):
+            (self.source_dir / package).mkdir(parents=True)
+            (self.source_dir / package / "__init__.py").write_text("")
+            for i in range(5):
+                (self.source_dir / package / f"mod_{i}.py").write_text(f"VALOR = {i}\n")
+            (self.source_dir / package / "datos.json").write_text("{}")
+        (self.source_dir / "app" / "roto.py").write_text("def roto(:\n")
+        (self.source_dir / "__pycache__").mkdir()
+        (self.source_dir / "__pycache__" / "viejo.pyc").write_bytes(b"")
+
+    def teardown_method(self):
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_misma_salida_que_el_build_síncrono(self, jobs):
+        """Test: el pipeline produce exactamente los mismos archivos que compile_project"""
+        sync_output = self.temp_dir / "sync"
+        async_output = self.temp_dir / "async"
+        compiler = PythonCompiler()
+
+        assert compiler.compile_project(str(self.source_dir), str(sync_output), jobs=jobs)
+        sync_stats = compiler.last_build_stats
+        result = asyncio.run(
+            compiler.compile_project_async(str(self.source_dir), str(async_output), jobs=jobs)
+        )
+
+        assert result
+        assert _snapshot(async_output) == _snapshot(sync_output)
+        assert compiler.last_build_stats == sync_stats
+        assert result.counts == sync_stats
+        assert result.output_dir == str(async_output.resolve())
+        assert (async_output / "app" / "roto.py").exists()
+
+    def test_incremental_omite_sin_cambios(self):
+        """Test: el pipeline respeta el manifiesto de builds incrementales"""
+        output_dir = self.temp_dir / "out"
+        compiler = PythonCompiler()
+        build = compiler.compile_project_async(
+            str(self.source_dir), str(output_dir), incremental=True
+        )
+        assert asyncio.run(build)
+
+        (self.source_dir / "app" / "mod_0.py").write_text("VALOR = 100\n")
+        build = compiler.compile_project_async(
+            str(self.source_dir), str(output_dir), incremental=True
+        )
+        assert asyncio.run(build)
+
+        assert compiler.last_build_stats["compiled"] == 1
+        assert compiler.last_build_stats["unchanged"] == 21
+
+    def test_etapa_de_archivo(self):
+        """Test: la última etapa protege la salida en un archivo"""
+        archive = self.temp_dir / "out.zip"
+
+        success = asyncio.run(
+            PythonCompiler().compile_project_async(
+                str(self.source_dir),
+                str(self.temp_dir / "out"),
+                archive_file=str(archive),
+                password="clave",
+            )
+        )
+
+        assert success
+        assert archive.exists()
+
+    def test_no_bloquea_el_event_loop(self):
+        """Test: otras corrutinas avanzan mientras se compila"""
+
+        async def main():
+            ticks = 0
+            build = asyncio.ensure_future(
+                PythonCompiler().compile_project_async(
+                    str(self.source_dir), str(self.temp_dir / "out")
+                )
+            )
+            while not build.done():
+                ticks += 1
+                await asyncio.sleep(0)
+            return build.result(), ticks
+
+        success, ticks = asyncio.run(main())
+
+        assert success
+        assert ticks > 1
@@ -0,0 +1,67 @@
+"""
+Tests del generador de proyectos y la comparación de baselines de los benchmarks
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from benchmarks.bench_build import find_regressions
+from benchmarks.project_generator import ProjectSpec, generate_project
+from sincpro_py_compiler.infrastructure.python_compiler import PythonCompiler
+
+
+class TestProjectGenerator:
+    """Tests de generate_project"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def teardown_method(self):
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
+    @pytest.mark.parametrize("layout", ["generic", "odoo", "django"])
+    def test_layout_compila(self, layout):
+        """Test: cada layout genera módulos válidos que se compilan sin errores"""
+        source = self.temp_dir / "src"
+        stats = generate_project(source, ProjectSpec(files=60, layout=layout))
+
+        assert stats.modules > 0 and stats.assets > 0
+        assert sum(1 for p in source.rglob("*") if p.is_file()) == stats.files
+        compiler = PythonCompiler()
+        assert compiler.compile_project(str(source), str(self.temp_dir / "out"))
+        assert compiler.last_build_stats["failed"] == 0
+
+    def test_forma_del_layout(self):
+        """Test: odoo genera addons con manifest y django un manage.py"""
+        generate_project(self.temp_dir / "odoo", ProjectSpec(files=60, layout="odoo"))
+        generate_project(self.temp_dir / "django", ProjectSpec(files=60, layout="django"))
+
+        assert list((self.temp_dir / "odoo" / "addons").glob("*/__manifest__.py"))
+        assert (self.temp_dir / "django" / "manage.py").exists()
+
+    def test_determinista(self):
+        """Test: la misma semilla produce el mismo árbol"""
+        spec = ProjectSpec(files=40, asset_ratio=0.5)
+        first = generate_project(self.temp_dir / "a", spec)
+        second = generate_project(self.temp_dir / "b", spec)
+
+        assert first == second
+        for path in (self.temp_dir / "a").rglob("*.py"):
+            twin = self.temp_dir / "b" / path.relative_to(self.temp_dir / "a")
+            assert twin.read_bytes() == path.read_bytes()
+
+
+def test_regresiones_respetan_el_umbral():
+    """Test: solo se reportan caídas de throughput mayores al umbral"""
+    baseline = {"metrics": {"compile": {"files_per_sec": 100.0, "mb_per_sec": 10.0}}}
+    current = {"metrics": {"compile": {"files_per_sec": 95.0, "mb_per_sec": 8.0}}}
+
+    regressions = find_regressions(baseline, current, threshold=10)
+
+    assert [(r.operation, r.metric) for r in regressions] == [("compile", "mb_per_sec")]
+    assert regressions[0].change == pytest.approx(-20.0)
+    assert find_regressions(baseline, current, threshold=25) == []
@@ -0,0 +1,99 @@
+"""
+Tests para el reporte estructurado del build (BuildResult)
+"""
+
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+from sincpro_py_compiler.infrastructure.build_report import BuildResult, format_summary
+from sincpro_py_compiler.infrastructure.compile_cache import CompileCache
+from sincpro_py_compiler.infrastructure.python_compiler import PythonCompiler
+
+
+class TestBuildReport:
+    """Tests del BuildResult que devuelve compile_project"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.source_dir = self.temp_dir / "src"
+        (self.source_dir / "pkg").mkdir(parents=True)
+        for i in range(3):
+            (self.source_dir / "pkg" / f"mod_{i}.py").write_text(f"VALOR = {i}\n")
+        (self.source_dir / "roto.py").write_text("def (\n")
+        (self.source_dir / "datos.json").write_text('{"a": 1}')
+        self.output_dir = self.temp_dir / "dist"
+        self.compiler = PythonCompiler()
+
+    def teardown_method(self):
+        self.compiler.shutdown_worker_pool()
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
+    def test_contadores_bytes_y_fases(self):
+        """Test: el resultado reúne contadores, bytes y tiempos por fase"""
+        result = self.compiler.compile_project(str(self.source_dir), str(self.output_dir))
+
+        assert result
+        assert isinstance(result, BuildResult)
+        assert result.counts == self.compiler.last_build_stats
+        assert result.counts["compiled"] == 3
+        assert result.files_processed == 5
+        assert result.bytes["copied"] == len('{"a": 1}') + len("def (\n")
+        assert result.bytes_read == sum(
+            p.stat().st_size for p in self.source_dir.rglob("*") if p.is_file()
+        )
+        assert result.bytes_written == sum(
+            p.stat().st_size for p in self.output_dir.rglob("*") if p.is_file()
+        )
+        assert {"preparar", "recorrer", "compilar y copiar", "finalizar"} <= set(
+            result.phases
+        )
+        assert result.wall_s >= result.phases["compilar y copiar"].wall_s
+        assert result.files_per_sec > 0
+
+    def test_errores_por_archivo(self):
+        """Test: los fallos de compilación llevan el archivo y el error, también con workers"""
+        for jobs in (1, 2):
+            result = self.compiler.compile_project(
+                str(self.source_dir), str(self.output_dir), jobs=jobs
+            )
+
+            assert [(f.path, f.stage) for f in result.failed_files] == [
+                ("roto.py", "compile")
+            ]
+            assert "invalid syntax" in result.failed_files[0].error
+
+    def test_aciertos_de_caché(self):
+        """Test: un segundo build con caché reporta los aciertos"""
+        compiler = PythonCompiler(compile_cache=CompileCache(self.temp_dir / "cache"))
+        compiler.compile_project(str(self.source_dir), str(self.output_dir))
+        shutil.rmtree(self.output_dir)
+
+        result = compiler.compile_project(str(self.source_dir), str(self.output_dir))
+
+        assert result.cache_hits == 3
+
+    def test_fallo_es_falso(self):
+        """Test: un directorio fuente inexistente devuelve un resultado falso con error"""
+        result = self.compiler.compile_project(
+            str(self.temp_dir / "no_existe"), str(self.output_dir)
+        )
+
+        assert not result
+        assert result.error
+
+    def test_json_y_resumen(self):
+        """Test: el reporte se escribe como JSON y el resumen sale del mismo dict"""
+        result = self.compiler.compile_project(str(self.source_dir), str(self.output_dir))
+        report_path = self.temp_dir / "reportes" / "build.json"
+
+        result.write(report_path)
+        report = json.loads(report_path.read_text())
+
+        assert report["success"] is True
+        assert report["counts"]["compiled"] == 3
+        assert report["failed_files"][0]["path"] == "roto.py"
+        assert format_summary(report) == result.summary()
+        assert "5 archivos" in result.summary()
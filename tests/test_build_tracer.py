@@ -0,0 +1,94 @@
+"""
+Tests para las trazas de build (--trace-out)
+"""
+
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+from sincpro_py_compiler.infrastructure.build_tracer import BuildTracer
+from sincpro_py_compiler.infrastructure.python_compiler import PythonCompiler
+from sincpro_py_compiler.infrastructure.security_manager import SecurityManager
+
+
+class TestBuildTracer:
+    """Tests de BuildTracer integrado con el compilador y la protección"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.source_dir = self.temp_dir / "src"
+        (self.source_dir / "pkg").mkdir(parents=True)
+        for i in range(4):
+            (self.source_dir / "pkg" / f"mod_{i}.py").write_text(f"VALOR = {i}\n")
+        (self.source_dir / "datos.json").write_text("{}")
+        self.output_dir = self.temp_dir / "dist"
+        self.tracer = BuildTracer()
+        self.compiler = PythonCompiler(tracer=self.tracer)
+
+    def teardown_method(self):
+        self.compiler.shutdown_worker_pool()
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
+    def _spans(self, category):
+        return [event for event in self.tracer.events if event["cat"] == category]
+
+    def test_fases_y_archivos(self):
+        """Test: cada fase y cada archivo quedan como span"""
+        assert self.compiler.compile_project(str(self.source_dir), str(self.output_dir))
+
+        phases = {event["name"] for event in self._spans("fase")}
+        assert {"preparar", "recorrer", "compilar y copiar", "finalizar"} <= phases
+        compiled = {event["name"] for event in self._spans("compile")}
+        assert compiled == {f"pkg/mod_{i}.py" for i in range(4)}
+        assert [event["name"] for event in self._spans("copy")] == ["datos.json"]
+
+        walk = next(e for e in self._spans("fase") if e["name"] == "recorrer")
+        assert walk["args"]["archivos"] == 5
+
+    def test_workers_en_su_proceso(self):
+        """Test: con --jobs cada archivo lleva el pid del worker que lo procesó"""
+        assert self.compiler.compile_project(
+            str(self.source_dir), str(self.output_dir), jobs=2
+        )
+
+        main_pid = self._spans("fase")[0]["pid"]
+        pids = {event["pid"] for event in self._spans("compile") + self._spans("copy")}
+        assert main_pid not in pids
+        process_names = [e for e in self.tracer.to_dict()["traceEvents"] if e["ph"] == "M"]
+        assert {event["pid"] for event in process_names} == pids | {main_pid}
+
+    def test_proteger(self):
+        """Test: la protección registra sus propios spans"""
+        assert self.compiler.compile_project(str(self.source_dir), str(self.output_dir))
+        manager = SecurityManager(tracer=self.tracer)
+
+        assert manager.protect_compiled_code(
+            self.output_dir, self.temp_dir / "dist.zip", "clave", "compress"
+        )
+
+        names = {event["name"] for event in self._spans("proteger")}
+        assert {"proteger", "zip"} <= names
+
+    def test_archivos_más_lentos_y_json(self):
+        """Test: slowest_files ordena por duración y la traza es JSON válido"""
+        assert self.compiler.compile_project(str(self.source_dir), str(self.output_dir))
+
+        slowest = self.tracer.slowest_files(3)
+        assert len(slowest) == 3
+        assert [s.duration_ms for s in slowest] == sorted(
+            (s.duration_ms for s in slowest), reverse=True
+        )
+
+        trace_path = self.temp_dir / "trazas" / "trace.json"
+        self.tracer.write(trace_path)
+        trace = json.loads(trace_path.read_text())
+        assert trace["traceEvents"]
+        assert all(event["ph"] in ("X", "M") for event in trace["traceEvents"])
+
+    def test_deshabilitado_no_registra(self):
+        """Test: el tracer por defecto no acumula eventos"""
+        compiler = PythonCompiler()
+        assert compiler.compile_project(str(self.source_dir), str(self.output_dir))
+        assert compiler.tracer.events == []
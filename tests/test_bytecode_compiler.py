@@ -0,0 +1,127 @@
+"""
+Tests para el motor de compilación a bytecode en memoria
+"""
+
+import importlib.util
+import marshal
+import py_compile
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from sincpro_py_compiler.infrastructure.bytecode_compiler import BytecodeCompiler
+
+
+class TestBytecodeCompiler:
+    """Tests de BytecodeCompiler"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.engine = BytecodeCompiler()
+        self.source = self.temp_dir / "modulo.py"
+        self.source.write_text("# -*- coding: utf-8 -*-\nSALUDO = 'año'\n", encoding="utf-8")
+
+    def teardown_method(self):
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
+    def test_salida_identica_a_py_compile(self):
+        """Test: el .pyc generado es idéntico byte a byte al de py_compile"""
+        expected = self.temp_dir / "expected.pyc"
+        py_compile.compile(str(self.source), str(expected), doraise=True)
+
+        output = self.temp_dir / "out" / "modulo.pyc"
+        self.engine.compile_file(self.source, output)
+
+        assert output.read_bytes() == expected.read_bytes()
+
+    def test_acepta_bytes_ya_cargados(self):
+        """Test: compila el contenido recibido sin releer el archivo"""
+        output = self.temp_dir / "modulo.pyc"
+        data = self.engine.compile_file(
+            self.source, output, dfile="modulo.py", source=b"VALOR = 7\n"
+        )
+
+        assert data[:4] == importlib.util.MAGIC_NUMBER
+        namespace: dict = {}
+        exec(marshal.loads(data[16:]), namespace)
+        assert namespace["VALOR"] == 7
+
+    def test_error_de_sintaxis(self):
+        """Test: un error de sintaxis se propaga sin dejar salida"""
+        self.source.write_text("def roto(:\n")
+        output = self.temp_dir / "roto.pyc"
+
+        with pytest.raises(SyntaxError):
+            self.engine.compile_file(self.source, output)
+        assert not output.exists()
+
+    def test_no_modifica_hardlinks_existentes(self):
+        """Test: reescribir una salida enlazada no altera el otro enlace"""
+        shared = self.temp_dir / "shared.pyc"
+        shared.write_bytes(b"contenido de cache")
+        output = self.temp_dir / "modulo.pyc"
+        output.hardlink_to(shared)
+
+        self.engine.compile_file(self.source, output)
+
+        assert shared.read_bytes() == b"contenido de cache"
+        assert output.read_bytes() != b"contenido de cache"
+
+    @pytest.mark.parametrize(
+        "pyc_mode,invalidation_mode",
+        [
+            ("checked-hash", py_compile.PycInvalidationMode.CHECKED_HASH),
+            ("unchecked-hash", py_compile.PycInvalidationMode.UNCHECKED_HASH),
+        ],
+    )
+    def test_pyc_basado_en_hash(self, pyc_mode, invalidation_mode):
+        """Test: los modos PEP 552 coinciden con py_compile"""
+        expected = self.temp_dir / "expected.pyc"
+        py_compile.compile(
+            str(self.source), str(expected), doraise=True, invalidation_mode=invalidation_mode
+        )
+
+        output = self.temp_dir / "modulo.pyc"
+        BytecodeCompiler(pyc_mode=pyc_mode).compile_file(self.source, output)
+
+        assert output.read_bytes() == expected.read_bytes()
+
+    def test_optimize_2_elimina_docstrings_y_asserts(self):
+        """Test: -OO produce bytecode sin docstrings ni asserts"""
+        self.source.write_text('"""Docstring del módulo"""\nassert False\nX = 1\n')
+        output = self.temp_dir / "modulo.pyc"
+
+        data = BytecodeCompiler(optimize=2).compile_file(self.source, output)
+
+        namespace: dict = {}
+        exec(marshal.loads(data[16:]), namespace)
+        assert namespace["X"] == 1
+        assert namespace.get("__doc__") is None
+
+    def test_optimize_del_intérprete_en_la_variante(self):
+        """Test: -1 se resuelve al nivel de python -O, así caché y manifiesto lo distinguen"""
+        code = (
+            "from sincpro_py_compiler.infrastructure.bytecode_compiler import "
+            "BytecodeCompiler; print(BytecodeCompiler().variant)"
+        )
+        variants = [
+            subprocess.run(
+                [sys.executable, *flags, "-c", code], capture_output=True, text=True
+            ).stdout.strip()
+            for flags in ([], ["-O"])
+        ]
+
+        assert variants[0].startswith("optimize=0;")
+        assert variants[1].startswith("optimize=1;")
+
+    def test_opciones_invalidas(self):
+        """Test: modos y niveles desconocidos se rechazan"""
+        with pytest.raises(ValueError):
+            BytecodeCompiler(pyc_mode="otro")
+        with pytest.raises(ValueError):
+            BytecodeCompiler(optimize=3)
@@ -0,0 +1,119 @@
+"""
+Tests para la caché de bytecode compartida entre builds
+"""
+
+import marshal
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from sincpro_py_compiler.infrastructure.compile_cache import CompileCache
+from sincpro_py_compiler.infrastructure.compiler_service import CompilerService
+from sincpro_py_compiler.infrastructure.file_manager import FileManager
+from sincpro_py_compiler.infrastructure.python_compiler import (
+    BuildTask,
+    PythonCompiler,
+    TaskContext,
+    execute_build_task,
+)
+
+
+class TestCompileCache:
+    """Tests de CompileCache y su integración con compile_project"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.cache = CompileCache(cache_dir=self.temp_dir / "cache")
+
+    def teardown_method(self):
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
+    def make_checkout(self, name: str) -> Path:
+        checkout = self.temp_dir / name
+        (checkout / "pkg").mkdir(parents=True)
+        (checkout / "main.py").write_text("VALUE = 1\n")
+        (checkout / "pkg" / "__init__.py").write_text("")
+        (checkout / "pkg" / "mod.py").write_text("def f():\n    return 42\n")
+        return checkout
+
+    def build(self, checkout: Path, output: str) -> Path:
+        output_dir = self.temp_dir / output
+        compiler = PythonCompiler(compile_cache=self.cache)
+        assert compiler.compile_project(source_dir=str(checkout), output_dir=str(output_dir))
+        return output_dir
+
+    def test_checkouts_distintos_comparten_cache(self, caplog):
+        """Test: un segundo checkout idéntico obtiene todo desde la caché"""
+        first = self.build(self.make_checkout("ws1"), "out1")
+        with caplog.at_level("INFO"):
+            second = self.build(self.make_checkout("ws2"), "out2")
+
+        assert any("Aciertos de caché: 3/3" in r.getMessage() for r in caplog.records)
+        assert (second / "pkg" / "mod.pyc").read_bytes()[16:] == (
+            first / "pkg" / "mod.pyc"
+        ).read_bytes()[16:]
+
+    def test_fuente_ilegible_cuenta_como_fallo(self, caplog):
+        """Test: una fuente que desaparece durante el build no rompe el worker"""
+        missing = self.temp_dir / "ws" / "borrado.py"
+        task = BuildTask(
+            "compile", missing, self.temp_dir / "out" / "borrado.py", "borrado.py"
+        )
+        context = TaskContext(CompilerService(), FileManager(), compile_cache=self.cache)
+
+        with caplog.at_level("ERROR"):
+            assert execute_build_task(task, context) == "failed"
+        assert any("Error leyendo" in r.getMessage() for r in caplog.records)
+
+    def test_bytecode_registra_ruta_relativa(self):
+        """Test: con y sin caché el co_filename es la ruta relativa al proyecto"""
+        checkout = self.make_checkout("ws")
+        output = self.build(checkout, "out")
+        uncached = self.temp_dir / "sin_cache"
+        assert PythonCompiler().compile_project(str(checkout), str(uncached))
+
+        pyc = (output / "pkg" / "mod.pyc").read_bytes()
+        assert marshal.loads(pyc[16:]).co_filename == "pkg/mod.py"
+        assert (uncached / "pkg" / "mod.pyc").read_bytes() == pyc
+
+    def test_cabecera_timestamp_se_ajusta_a_la_fuente(self):
+        """Test: un acierto reescribe mtime y tamaño de la fuente en la cabecera"""
+        self.build(self.make_checkout("ws1"), "out1")
+        checkout = self.make_checkout("ws2")
+        main = checkout / "main.py"
+        os.utime(main, (1_700_000_000, 1_700_000_000))
+
+        output = self.build(checkout, "out2")
+
+        header = (output / "main.pyc").read_bytes()[:16]
+        assert int.from_bytes(header[8:12], "little") == 1_700_000_000
+        assert int.from_bytes(header[12:16], "little") == main.stat().st_size
+
+    def test_fuente_modificada_no_acierta(self):
+        """Test: cambiar el contenido de la fuente cambia la clave"""
+        key_a = self.cache.key_for(b"A = 1\n", "a.py")
+        key_b = self.cache.key_for(b"A = 2\n", "a.py")
+        key_opt = self.cache.key_for(b"A = 1\n", "a.py", "optimize=2;pyc_mode=timestamp")
+
+        assert len({key_a, key_b, key_opt}) == 3
+
+    def test_prune_elimina_entradas_menos_usadas(self):
+        """Test: la limpieza LRU respeta el tamaño máximo"""
+        compiled = self.temp_dir / "x.pyc"
+        compiled.write_bytes(b"\0" * 1000)
+        keys = [self.cache.key_for(str(i).encode(), "x.py") for i in range(5)]
+        for age, key in enumerate(keys):
+            self.cache.store(key, compiled)
+            entry = self.cache._entry_path(key)
+            os.utime(entry, (1_000_000 + age, 1_000_000 + age))
+
+        self.cache.max_size = 2500
+        removed = self.cache.prune()
+
+        assert removed == 3
+        assert self.cache.size() == 2000
+        # Sobreviven las dos entradas usadas más recientemente
+        assert self.cache._entry_path(keys[3]).exists()
+        assert self.cache._entry_path(keys[4]).exists()
@@ -0,0 +1,151 @@
+"""
+Tests para el daemon de compilación persistente
+"""
+
+import logging
+import shutil
+import socket
+import stat
+import tempfile
+import threading
+from pathlib import Path
+
+from sincpro_py_compiler.infrastructure.build_report import BuildResult
+from sincpro_py_compiler.infrastructure.compile_daemon import CompileDaemon, DaemonClient
+from sincpro_py_compiler.infrastructure.python_compiler import PythonCompiler
+
+
+class TestCompileDaemon:
+    """Tests del daemon y su cliente"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.source_dir = self.temp_dir / "src"
+        (self.source_dir / "pkg").mkdir(parents=True)
+        (self.source_dir / "main.py").write_text("print('hola')\n")
+        (self.source_dir / "pkg" / "__init__.py").write_text("")
+        (self.source_dir / "pkg" / "mod.py").write_text("VALOR = 1\n")
+        (self.source_dir / "config.json").write_text("{}")
+        self.socket_path = self.temp_dir / "daemon.sock"
+
+        self.previous_level = logging.getLogger().level
+        logging.getLogger().setLevel(logging.INFO)
+        self.daemon = CompileDaemon(self.socket_path, PythonCompiler(), jobs=2)
+        ready = threading.Event()
+        self.thread = threading.Thread(target=self.daemon.serve_forever, args=(ready,))
+        self.thread.start()
+        assert ready.wait(10)
+        self.client = DaemonClient(self.socket_path, timeout=30)
+
+    def teardown_method(self):
+        if self.thread.is_alive():
+            self.client.request("shutdown")
+            self.thread.join(10)
+        logging.getLogger().setLevel(self.previous_level)
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
+    def test_ping_y_permisos_del_socket(self):
+        """Test: el daemon responde y el socket solo es accesible por el usuario"""
+        result = self.client.request("ping")
+
+        assert result["success"]
+        assert stat.S_IMODE(self.socket_path.stat().st_mode) == 0o600
+
+    def test_compilación_transmite_logs_y_contadores(self):
+        """Test: los builds sucesivos reutilizan el daemon y devuelven los contadores"""
+        output_dir = self.temp_dir / "out"
+        messages = []
+
+        for _ in range(2):
+            result = self.client.request(
+                "compile",
+                {
+                    "source_dir": str(self.source_dir),
+                    "output_dir": str(output_dir),
+                    "jobs": 2,
+                },
+                on_log=lambda level, message: messages.append(message),
+            )
+            assert result["success"]
+            assert result["stats"]["compiled"] == 3
+            assert result["stats"]["copied"] == 1
+
+        assert (output_dir / "pkg" / "mod.pyc").exists()
+        assert any("Compilación completada" in message for message in messages)
+
+    def test_transmite_logs_de_otros_hilos_del_build(self, monkeypatch):
+        """Test: los logs de hilos auxiliares del build (p. ej. walk_threads) llegan"""
+
+        def compile_project(**build_args):
+            worker = threading.Thread(
+                target=logging.getLogger("sincpro_py_compiler").warning,
+                args=("desde un hilo del build",),
+            )
+            worker.start()
+            worker.join()
+            return BuildResult().finish(True)
+
+        monkeypatch.setattr(self.daemon.compiler, "compile_project", compile_project)
+        messages = []
+        result = self.client.request(
+            "compile",
+            {"source_dir": str(self.source_dir), "output_dir": str(self.temp_dir / "out")},
+            on_log=lambda level, message: messages.append(message),
+        )
+
+        assert result["success"]
+        assert any("desde un hilo del build" in message for message in messages)
+
+    def test_protección_con_compresión(self):
+        """Test: el daemon aplica la protección sobre la salida compilada"""
+        output_dir = self.temp_dir / "out"
+        protected = self.temp_dir / "out.zip"
+        self.client.request(
+            "compile", {"source_dir": str(self.source_dir), "output_dir": str(output_dir)}
+        )
+
+        result = self.client.request(
+            "protect",
+            {
+                "compiled_dir": str(output_dir),
+                "output_file": str(protected),
+                "password": "clave",
+                "method": "compress",
+            },
+        )
+
+        assert result["success"]
+        assert protected.exists()
+
+    def test_peticiones_inválidas(self):
+        """Test: comandos y argumentos desconocidos devuelven error sin detener el daemon"""
+        assert not self.client.request("reiniciar")["success"]
+        assert not self.client.request("compile", {"origen": "x"})["success"]
+        assert self.client.request("ping")["success"]
+
+    def test_shutdown_elimina_el_socket(self):
+        """Test: tras shutdown el daemon termina y limpia su socket"""
+        assert self.client.request("shutdown")["success"]
+        self.thread.join(10)
+
+        assert not self.thread.is_alive()
+        assert not self.socket_path.exists()
+
+    def test_socket_huérfano_se_reemplaza(self):
+        """Test: un socket abandonado por un daemon anterior no impide iniciar otro"""
+        stale_path = self.temp_dir / "huerfano.sock"
+        orphan = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        orphan.bind(str(stale_path))
+        orphan.close()
+
+        daemon = CompileDaemon(stale_path, PythonCompiler(), jobs=1)
+        ready = threading.Event()
+        thread = threading.Thread(target=daemon.serve_forever, args=(ready,))
+        thread.start()
+        assert ready.wait(10)
+        try:
+            assert DaemonClient(stale_path, timeout=10).request("ping")["success"]
+        finally:
+            DaemonClient(stale_path).request("shutdown")
+            thread.join(10)
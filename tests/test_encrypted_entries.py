@@ -0,0 +1,210 @@
+"""
+Tests para el contenedor encriptado por archivo con índice (.enc versión 3)
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from sincpro_py_compiler.infrastructure.encrypted_entries import (
+    TRAILER,
+    EntryReader,
+    EntryWriter,
+)
+from sincpro_py_compiler.infrastructure.encrypted_stream import (
+    ContainerError,
+    read_header,
+)
+from sincpro_py_compiler.infrastructure.encryption_service import (
+    CRYPTO_AVAILABLE,
+    SimpleEncryptionService,
+)
+
+pytestmark = pytest.mark.skipif(
+    not CRYPTO_AVAILABLE, reason="cryptography package not available"
+)
+
+KEY = bytes(range(32))
+
+
+class TestEntryContainer:
+    """Tests de EntryWriter / EntryReader con bloques chicos"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.archive = self.temp_dir / "entries.enc"
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, files, chunk_size=256, threads=1):
+        with open(self.archive, "wb") as f:
+            writer = EntryWriter(f, KEY, {"method": "encrypt"}, chunk_size, threads)
+            for path, data in files.items():
+                if isinstance(data, Path):
+                    writer.add_file(path, data)
+                else:
+                    writer.add_bytes(path, data, mtime=1_700_000_000)
+            writer.close()
+
+    def _reader(self):
+        with open(self.archive, "rb") as f:
+            metadata, header = read_header(f)
+        return EntryReader(self.archive, KEY, metadata, header)
+
+    @pytest.mark.parametrize("threads", [1, 3])
+    def test_indice_y_lectura(self, threads):
+        """Test: el índice conserva el orden, tamaños y hashes de cada miembro"""
+        files = {f"pkg/mod_{i}.pyc": bytes([i]) * (i * 40) for i in range(12)}
+        self._write(files, threads=threads)
+
+        with self._reader() as reader:
+            assert [m.path for m in reader.members] == list(files)
+            for member in reader.members:
+                assert member.length == len(files[member.path])
+                assert member.sha256 == hashlib.sha256(files[member.path]).hexdigest()
+                assert member.mtime == 1_700_000_000
+                assert reader.read(member.path) == files[member.path]
+
+    def test_miembro_grande_en_stream(self):
+        """Test: un archivo de varios bloques se sella y extrae por partes"""
+        big = self.temp_dir / "asset.bin"
+        big.write_bytes(os.urandom(3000) + b"texto " * 500)
+        self._write({"chico.txt": b"hola", "static/asset.bin": big})
+
+        with self._reader() as reader:
+            member = reader.get("static/asset.bin")
+            assert member.length == big.stat().st_size
+            assert member.size > 256 * 3
+            assert reader.read(member) == big.read_bytes()
+            assert reader.extract(self.temp_dir / "out", ["static/asset.bin"]) == 1
+        assert (
+            self.temp_dir / "out" / "static" / "asset.bin"
+        ).read_bytes() == big.read_bytes()
+        assert not (self.temp_dir / "out" / "chico.txt").exists()
+
+    def test_datos_no_compresibles_sin_zlib(self):
+        self._write({"imagen.png": os.urandom(200), "datos.txt": b"a" * 200})
+        with self._reader() as reader:
+            assert reader.get("imagen.png").compression == "none"
+            assert reader.get("datos.txt").compression == "zlib"
+
+    def test_lectura_toca_solo_el_miembro(self):
+        """Test: un miembro dañado no impide leer los demás"""
+        self._write({"a.pyc": b"A" * 100, "b.pyc": b"B" * 100})
+        with self._reader() as reader:
+            damaged = reader.get("a.pyc")
+        content = bytearray(self.archive.read_bytes())
+        content[damaged.offset + 3] ^= 1
+        self.archive.write_bytes(bytes(content))
+
+        with self._reader() as reader:
+            assert reader.read("b.pyc") == b"B" * 100
+            with pytest.raises(ContainerError):
+                reader.read("a.pyc")
+
+    def test_indice_alterado(self):
+        self._write({"a.pyc": b"A" * 100})
+        content = bytearray(self.archive.read_bytes())
+        content[-TRAILER.size - 5] ^= 1
+        self.archive.write_bytes(bytes(content))
+        with pytest.raises(ContainerError):
+            self._reader()
+
+    def test_sin_trailer(self):
+        self._write({"a.pyc": b"A" * 100})
+        self.archive.write_bytes(self.archive.read_bytes()[: -TRAILER.size])
+        with pytest.raises(ContainerError):
+            self._reader()
+
+    def test_ruta_fuera_del_destino(self):
+        self._write({"../fuera.txt": b"x"})
+        with self._reader() as reader:
+            with pytest.raises(ContainerError):
+                reader.extract(self.temp_dir / "out")
+        assert not (self.temp_dir / "fuera.txt").exists()
+
+
+class TestEncryptionServiceMembers:
+    """Tests de list, read_member y extract selectivo en SimpleEncryptionService"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.source_dir = self.temp_dir / "src"
+        (self.source_dir / "addons" / "ventas").mkdir(parents=True)
+        (self.source_dir / "addons" / "ventas" / "modelo.pyc").write_bytes(b"pyc ventas")
+        (self.source_dir / "addons" / "ventas" / "vista.xml").write_text("<odoo/>")
+        (self.source_dir / "main.pyc").write_bytes(b"pyc main")
+        self.service = SimpleEncryptionService()
+        self.archive = self.temp_dir / "build.enc"
+        assert self.service.encrypt_directory(self.source_dir, self.archive, "clave")
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_list(self):
+        members = self.service.list(self.archive, "clave")
+        assert sorted(m.path for m in members) == [
+            "addons/ventas/modelo.pyc",
+            "addons/ventas/vista.xml",
+            "main.pyc",
+        ]
+        assert {m.path: m.length for m in members}["main.pyc"] == len(b"pyc main")
+
+    def test_read_member(self):
+        assert self.service.read_member(self.archive, "clave", "main.pyc") == b"pyc main"
+        with pytest.raises(KeyError):
+            self.service.read_member(self.archive, "clave", "no_existe.pyc")
+        with pytest.raises(ContainerError):
+            self.service.read_member(self.archive, "otra", "main.pyc")
+
+    @pytest.mark.parametrize("threads", [1, 4])
+    def test_extract_selectivo(self, threads):
+        service = SimpleEncryptionService(crypto_threads=threads)
+        output = self.temp_dir / "out"
+        assert service.extract(
+            self.archive, output, "clave", ["addons/ventas/modelo.pyc", "main.pyc"]
+        )
+        assert sorted(p.relative_to(output).as_posix() for p in output.rglob("*.*")) == [
+            "addons/ventas/modelo.pyc",
+            "main.pyc",
+        ]
+        assert not service.extract(self.archive, self.temp_dir / "x", "clave", ["falta.pyc"])
+
+    def test_extract_conserva_modo_y_mtime(self):
+        source = self.source_dir / "main.pyc"
+        os.chmod(source, 0o600)
+        os.utime(source, (1_600_000_000, 1_600_000_000))
+        assert self.service.encrypt_directory(self.source_dir, self.archive, "clave")
+
+        output = self.temp_dir / "out"
+        assert self.service.decrypt_file(self.archive, output, "clave")
+        extracted = (output / "main.pyc").stat()
+        assert extracted.st_mode & 0o777 == 0o600
+        assert int(extracted.st_mtime) == 1_600_000_000
+
+    def test_formato_sin_indice(self):
+        """Test: list sobre un .enc versión 2 explica que no tiene índice"""
+        from sincpro_py_compiler.infrastructure.encrypted_stream import ChunkEncryptor
+
+        legacy = self.temp_dir / "v2.enc"
+        with open(legacy, "wb") as f:
+            ChunkEncryptor(f, KEY, {"method": "encrypt", "salt": ""}).close()
+        with pytest.raises(ContainerError, match="sin índice"):
+            self.service.list(legacy, "clave")
+
+    def test_list_sin_leer_contenidos(self):
+        """Test: list solo necesita el header, el trailer y el índice"""
+        members = self.service.list(self.archive, "clave")
+        start = min(m.offset for m in members)
+        end = max(m.offset + m.size for m in members)
+        content = bytearray(self.archive.read_bytes())
+        content[start:end] = bytes(end - start)
+        self.archive.write_bytes(bytes(content))
+
+        assert self.service.list(self.archive, "clave") == members
+        assert not self.service.extract(self.archive, self.temp_dir / "out", "clave")
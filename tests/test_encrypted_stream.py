@@ -0,0 +1,255 @@
+"""
+Tests para el contenedor encriptado por bloques (.enc versión 2)
+"""
+
+import io
+import json
+import shutil
+import tarfile
+import tempfile
+from base64 import urlsafe_b64encode
+from pathlib import Path
+from typing import IO, cast
+
+import pytest
+
+from sincpro_py_compiler.infrastructure.encrypted_stream import (
+    TAG_SIZE,
+    ChunkDecryptor,
+    ChunkEncryptor,
+    ContainerError,
+    read_header,
+)
+from sincpro_py_compiler.infrastructure.encryption_service import (
+    CRYPTO_AVAILABLE,
+    LEGACY_SALT,
+    SimpleEncryptionService,
+)
+from sincpro_py_compiler.infrastructure.security_manager import SecurityManager
+
+pytestmark = pytest.mark.skipif(
+    not CRYPTO_AVAILABLE, reason="cryptography package not available"
+)
+
+KEY = bytes(range(32))
+CHUNK = 64
+
+
+def _seal(data: bytes, chunk_size: int = CHUNK, threads: int = 1) -> bytes:
+    stream = io.BytesIO()
+    encryptor = ChunkEncryptor(
+        stream, KEY, {"method": "encrypt"}, chunk_size=chunk_size, threads=threads
+    )
+    for i in range(0, len(data), 50):
+        encryptor.write(data[i : i + 50])
+    encryptor.close()
+    return stream.getvalue()
+
+
+def _open(sealed: bytes, key: bytes = KEY, threads: int = 1) -> bytes:
+    stream = io.BytesIO(sealed)
+    metadata, header = read_header(stream)
+    decryptor = ChunkDecryptor(stream, key, metadata, header, threads=threads)
+    try:
+        data = decryptor.read(7) + decryptor.read()
+        decryptor.verify_end()
+    finally:
+        decryptor.close()
+    return data
+
+
+def _split(sealed: bytes):
+    """Separa el prefijo del header y los bloques sellados"""
+    stream = io.BytesIO(sealed)
+    metadata, _ = read_header(stream)
+    prefix = sealed[: stream.tell()]
+    size = metadata["chunk_size"] + TAG_SIZE
+    body = sealed[stream.tell() :]
+    return prefix, [body[i : i + size] for i in range(0, len(body), size)]
+
+
+class TestChunkContainer:
+    """Tests del formato por bloques sin pasar por tarfile"""
+
+    @pytest.mark.parametrize("size", [0, 1, CHUNK - 1, CHUNK, CHUNK * 3, CHUNK * 3 + 5])
+    def test_roundtrip(self, size):
+        """Test: cualquier largo, incluidos los múltiplos exactos del bloque"""
+        data = bytes(i % 251 for i in range(size))
+        sealed = _seal(data)
+        assert _open(sealed) == data
+        _, chunks = _split(sealed)
+        assert len(chunks) == size // CHUNK + 1
+        assert len(chunks[-1]) - TAG_SIZE < CHUNK
+
+    def test_sin_sobrecosto_base64(self):
+        """Test: el tamaño es el del contenido más un tag por bloque"""
+        data = b"x" * (CHUNK * 10)
+        _, chunks = _split(_seal(data))
+        assert sum(len(c) for c in chunks) == len(data) + TAG_SIZE * len(chunks)
+
+    def test_clave_incorrecta(self):
+        with pytest.raises(ContainerError):
+            _open(_seal(b"datos"), key=bytes(32))
+
+    def test_bloques_reordenados(self):
+        prefix, chunks = _split(_seal(b"a" * CHUNK + b"b" * CHUNK + b"c"))
+        with pytest.raises(ContainerError):
+            _open(prefix + chunks[1] + chunks[0] + chunks[2])
+
+    def test_truncado_en_limite_de_bloque(self):
+        """Test: quitar el bloque final se detecta aunque el resto sea válido"""
+        prefix, chunks = _split(_seal(b"a" * CHUNK * 2 + b"b"))
+        with pytest.raises(ContainerError):
+            _open(prefix + b"".join(chunks[:-1]))
+
+    def test_header_alterado(self):
+        """Test: el header forma parte de los datos autenticados"""
+        sealed = _seal(b"datos")
+        with pytest.raises(ContainerError):
+            _open(sealed.replace(b'"method": "encrypt"', b'"method": "encrypX"'))
+
+    def test_bit_alterado(self):
+        sealed = bytearray(_seal(b"a" * CHUNK * 2))
+        sealed[-TAG_SIZE - 3] ^= 1
+        with pytest.raises(ContainerError):
+            _open(bytes(sealed))
+
+    def test_datos_extra(self):
+        with pytest.raises(ContainerError):
+            _open(_seal(b"datos") + b"basura")
+
+    @pytest.mark.parametrize("threads", [(1, 4), (4, 1), (3, 3)])
+    def test_hilos_mismo_formato(self, threads):
+        """Test: el número de hilos no cambia el formato ni el orden de los bloques"""
+        encrypt_threads, decrypt_threads = threads
+        data = bytes(i % 253 for i in range(CHUNK * 40 + 17))
+        sealed = _seal(data, threads=encrypt_threads)
+        assert len(_split(sealed)[1]) == 41
+        assert _open(sealed, threads=decrypt_threads) == data
+
+    def test_hilos_detectan_bloque_alterado(self):
+        sealed = bytearray(_seal(b"a" * CHUNK * 20, threads=4))
+        sealed[-CHUNK * 10] ^= 1
+        with pytest.raises(ContainerError):
+            _open(bytes(sealed), threads=4)
+
+
+class TestEncryptedArchive:
+    """Tests del servicio de encriptación con el contenedor por bloques"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.source_dir = self.temp_dir / "src"
+        (self.source_dir / "pkg").mkdir(parents=True)
+        (self.source_dir / "pkg" / "mod.pyc").write_bytes(b"bytecode")
+        (self.source_dir / "datos.bin").write_bytes(bytes(range(256)) * 4096)
+        self.service = SimpleEncryptionService()
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _files(self, root: Path):
+        return {
+            p.relative_to(root).as_posix(): p.read_bytes()
+            for p in sorted(root.rglob("*"))
+            if p.is_file()
+        }
+
+    def test_roundtrip_y_header(self):
+        """Test: el header lleva salt aleatorio y se detecta como encrypt"""
+        enc_file = self.temp_dir / "build.enc"
+        assert self.service.encrypt_directory(self.source_dir, enc_file, "clave")
+
+        with open(enc_file, "rb") as f:
+            metadata, _ = read_header(f)
+        assert metadata["cipher"] == "AES-256-GCM"
+        assert metadata["salt"] != urlsafe_b64encode(LEGACY_SALT).decode()
+        assert SecurityManager().detect_protection_method(enc_file) == "encrypt"
+
+        output = self.temp_dir / "out"
+        assert self.service.decrypt_file(enc_file, output, "clave")
+        assert self._files(output) == self._files(self.source_dir)
+
+    def test_formato_version_2(self):
+        """Test: los .enc de un único flujo por bloques se siguen desencriptando"""
+        salt = b"s" * 16
+        enc_file = self.temp_dir / "v2.enc"
+        with open(enc_file, "wb") as f:
+            encryptor = ChunkEncryptor(
+                f,
+                self.service._derive_key("clave", salt),
+                {"method": "encrypt", "salt": urlsafe_b64encode(salt).decode("utf-8")},
+                chunk_size=4096,
+            )
+            # En modo "w|" tarfile solo llama a write()
+            with tarfile.open(mode="w|gz", fileobj=cast(IO[bytes], encryptor)) as tar:
+                for path in sorted(self.source_dir.rglob("*")):
+                    if path.is_file():
+                        tar.add(
+                            str(path), arcname=path.relative_to(self.source_dir).as_posix()
+                        )
+            encryptor.close()
+
+        output = self.temp_dir / "out"
+        assert self.service.decrypt_file(enc_file, output, "clave")
+        assert self._files(output) == self._files(self.source_dir)
+        assert self.service.extract(
+            enc_file, self.temp_dir / "solo", "clave", ["pkg/mod.pyc"]
+        )
+        assert self._files(self.temp_dir / "solo") == {"pkg/mod.pyc": b"bytecode"}
+
+    def test_crypto_threads(self):
+        """Test: SecurityManager con varios hilos protege y desprotege igual"""
+        manager = SecurityManager(crypto_threads=3)
+        enc_file = self.temp_dir / "build.enc"
+        assert manager.protect_compiled_code(self.source_dir, enc_file, "clave", "encrypt")
+
+        output = self.temp_dir / "out"
+        assert SecurityManager(crypto_threads=0).unprotect_code(enc_file, output, "clave")
+        assert self._files(output) == self._files(self.source_dir)
+
+    def test_contraseña_incorrecta(self):
+        enc_file = self.temp_dir / "build.enc"
+        assert self.service.encrypt_directory(self.source_dir, enc_file, "clave")
+        assert not self.service.decrypt_file(enc_file, self.temp_dir / "out", "otra")
+
+    def test_archivo_truncado(self):
+        enc_file = self.temp_dir / "build.enc"
+        assert self.service.encrypt_directory(self.source_dir, enc_file, "clave")
+        enc_file.write_bytes(enc_file.read_bytes()[:-100])
+        assert not self.service.decrypt_file(enc_file, self.temp_dir / "out", "clave")
+
+    def test_formato_original(self):
+        """Test: los .enc de Fernet sobre el tar.gz completo se siguen desencriptando"""
+        buffer = io.BytesIO()
+        with tarfile.open(mode="w:gz", fileobj=buffer) as tar:
+            for path in sorted(self.source_dir.rglob("*")):
+                if path.is_file():
+                    tar.add(str(path), arcname=path.relative_to(self.source_dir).as_posix())
+        token = self.service._generate_fernet_key("clave", LEGACY_SALT).encrypt(
+            buffer.getvalue()
+        )
+        metadata = json.dumps(
+            {
+                "method": "encrypt",
+                "salt": urlsafe_b64encode(LEGACY_SALT).decode("utf-8"),
+                "files_count": 2,
+            }
+        ).encode("utf-8")
+        enc_file = self.temp_dir / "legacy.enc"
+        enc_file.write_bytes(
+            len(metadata).to_bytes(4, "big") + metadata + b"---SINCPRO_SEPARATOR---" + token
+        )
+
+        output = self.temp_dir / "out"
+        assert SecurityManager().unprotect_code(enc_file, output, "clave")
+        assert self._files(output) == self._files(self.source_dir)
+        assert not self.service.decrypt_file(enc_file, self.temp_dir / "otro", "mala")
+
+    def test_abort_borra_el_archivo(self):
+        enc_file = self.temp_dir / "build.enc"
+        with pytest.raises(RuntimeError):
+            with self.service.open_writer(enc_file, "clave") as writer:
+                writer.add_bytes("a.pyc", b"datos")
+                raise RuntimeError("fallo del build")
+        assert not enc_file.exists()
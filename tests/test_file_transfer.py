@@ -0,0 +1,91 @@
+"""
+Tests para la transferencia de archivos por modo de enlace
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from sincpro_py_compiler.infrastructure.file_manager import FileManager
+from sincpro_py_compiler.infrastructure.file_transfer import transfer_file
+from sincpro_py_compiler.infrastructure.python_compiler import PythonCompiler
+
+
+class TestFileTransfer:
+    """Tests de transfer_file y FileManager(link_mode=...)"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.source = self.temp_dir / "logo.png"
+        self.source.write_bytes(os.urandom(256 * 1024))
+        os.utime(self.source, (1_600_000_000, 1_600_000_000))
+
+    def teardown_method(self):
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
+    def test_copia_preserva_contenido_y_metadatos(self):
+        """Test: el modo copy copia en el kernel y preserva mtime como copy2"""
+        destination = self.temp_dir / "out" / "logo.png"
+
+        method = transfer_file(self.source, destination, "copy")
+
+        assert method in ("copy_file_range", "sendfile", "copy")
+        assert destination.read_bytes() == self.source.read_bytes()
+        assert destination.stat().st_mtime == self.source.stat().st_mtime
+        assert not os.path.samefile(self.source, destination)
+
+    def test_hardlink_comparte_inodo(self):
+        """Test: hardlink enlaza el destino a la fuente en el mismo sistema de archivos"""
+        destination = self.temp_dir / "out" / "logo.png"
+
+        assert transfer_file(self.source, destination, "hardlink") == "hardlink"
+        assert os.path.samefile(self.source, destination)
+
+    def test_reflink_recurre_a_copia_si_no_hay_soporte(self):
+        """Test: reflink y auto informan el método realmente usado"""
+        for mode in ("reflink", "auto"):
+            destination = self.temp_dir / mode / "logo.png"
+
+            method = transfer_file(self.source, destination, mode)
+
+            assert method in ("reflink", "copy_file_range", "sendfile", "copy")
+            assert destination.read_bytes() == self.source.read_bytes()
+
+    def test_copiar_sobre_un_hardlink_no_modifica_la_fuente(self):
+        """Test: un build en modo copy tras uno con hardlink no escribe en la fuente"""
+        destination = self.temp_dir / "out" / "logo.png"
+        transfer_file(self.source, destination, "hardlink")
+        original = self.source.read_bytes()
+        replacement = self.temp_dir / "nuevo.png"
+        replacement.write_bytes(b"otro contenido")
+
+        transfer_file(replacement, destination, "copy")
+
+        assert self.source.read_bytes() == original
+        assert destination.read_bytes() == b"otro contenido"
+
+    def test_modo_invalido(self):
+        """Test: un modo desconocido se rechaza"""
+        with pytest.raises(ValueError):
+            FileManager(link_mode="symlink")
+
+    def test_build_informa_archivos_enlazados(self):
+        """Test: las estadísticas del build cuentan los archivos por método"""
+        source_dir = self.temp_dir / "src"
+        (source_dir / "static").mkdir(parents=True)
+        shutil.copy2(self.source, source_dir / "static" / "logo.png")
+        (source_dir / "main.py").write_text("print('hola')\n")
+        output_dir = self.temp_dir / "dist"
+
+        compiler = PythonCompiler(file_manager=FileManager(link_mode="hardlink"))
+        assert compiler.compile_project(str(source_dir), str(output_dir))
+
+        assert compiler.last_build_stats["copied"] == 1
+        assert compiler.last_build_stats["hardlinked"] == 1
+        assert os.path.samefile(
+            source_dir / "static" / "logo.png", output_dir / "static" / "logo.png"
+        )
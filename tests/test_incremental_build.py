@@ -0,0 +1,121 @@
+"""
+Tests para compilaciones incrementales basadas en el manifiesto de build
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from sincpro_py_compiler.infrastructure.build_manifest import MANIFEST_FILENAME
+from sincpro_py_compiler.infrastructure.python_compiler import PythonCompiler
+
+
+class CountingCompilerService:
+    """Envuelve CompilerService contando las compilaciones realizadas"""
+
+    def __init__(self, compiler):
+        self.wrapped = compiler.compiler_service
+        self.compiled = []
+
+    def __getattr__(self, name):
+        return getattr(self.wrapped, name)
+
+    def compile_python_file(self, source_file, output_file, dfile=None, source=None):
+        self.compiled.append(source_file.name)
+        return self.wrapped.compile_python_file(source_file, output_file, dfile, source)
+
+
+class TestIncrementalBuild:
+    """Tests del modo incremental de compile_project"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.source_dir = self.temp_dir / "src"
+        self.output_dir = self.temp_dir / "out"
+        (self.source_dir / "pkg").mkdir(parents=True)
+        (self.source_dir / "main.py").write_text("print('main')")
+        (self.source_dir / "pkg" / "__init__.py").write_text("")
+        (self.source_dir / "pkg" / "helper.py").write_text("def helper(): return 1")
+        (self.source_dir / "pkg" / "data.json").write_text('{"a": 1}')
+
+        self.compiler = PythonCompiler()
+        self.counter = CountingCompilerService(self.compiler)
+        self.compiler.compiler_service = self.counter  # type: ignore
+
+    def teardown_method(self):
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
+    def build(self, **kwargs):
+        self.counter.compiled.clear()
+        return self.compiler.compile_project(
+            source_dir=str(self.source_dir),
+            output_dir=str(self.output_dir),
+            incremental=True,
+            **kwargs,
+        )
+
+    def test_manifiesto_registra_fuentes(self):
+        """Test: el manifiesto guarda tamaño, mtime, hash y configuración"""
+        assert self.build()
+
+        manifest = json.loads((self.output_dir / MANIFEST_FILENAME).read_text())
+        entry = manifest["files"]["pkg/helper.py"]
+        assert entry["output"] == "pkg/helper.pyc"
+        assert entry["size"] == len("def helper(): return 1")
+        assert len(entry["sha256"]) == 64
+        assert manifest["settings"]["template"] == "basic"
+        assert "magic" in manifest["settings"]
+
+    def test_rebuild_sin_cambios_no_recompila(self):
+        """Test: un segundo build sin cambios no compila ni copia nada"""
+        assert self.build()
+        assert len(self.counter.compiled) == 3
+
+        data_output = self.output_dir / "pkg" / "data.json"
+        copied_mtime = data_output.stat().st_mtime_ns
+
+        assert self.build()
+        assert self.counter.compiled == []
+        assert data_output.stat().st_mtime_ns == copied_mtime
+
+    def test_rebuild_solo_compila_archivos_modificados(self):
+        """Test: solo se recompila lo que cambió de contenido"""
+        assert self.build()
+
+        helper = self.source_dir / "pkg" / "helper.py"
+        helper.write_text("def helper(): return 2222")
+        # Mismo contenido con mtime nuevo: el hash evita recompilar
+        main = self.source_dir / "main.py"
+        os.utime(main, ns=(main.stat().st_atime_ns, main.stat().st_mtime_ns + 10**9))
+
+        assert self.build()
+        assert self.counter.compiled == ["helper.py"]
+
+    def test_elimina_salidas_de_fuentes_borradas(self):
+        """Test: las salidas de fuentes eliminadas desaparecen del output"""
+        assert self.build()
+        assert (self.output_dir / "pkg" / "helper.pyc").exists()
+
+        shutil.rmtree(self.source_dir / "pkg")
+
+        assert self.build()
+        assert not (self.output_dir / "pkg").exists()
+        assert (self.output_dir / "main.pyc").exists()
+
+    def test_cambio_de_configuracion_recompila_todo(self):
+        """Test: cambiar el template invalida el manifiesto"""
+        assert self.build()
+        assert self.build(template="django")
+        assert len(self.counter.compiled) == 3
+
+    def test_salida_borrada_se_regenera(self):
+        """Test: si falta una salida se vuelve a producir aunque la fuente no cambió"""
+        assert self.build()
+        (self.output_dir / "main.pyc").unlink()
+
+        assert self.build()
+        assert self.counter.compiled == ["main.py"]
+        assert (self.output_dir / "main.pyc").exists()
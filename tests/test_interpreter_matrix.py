@@ -0,0 +1,107 @@
+"""
+Tests para la compilación con varios intérpretes destino
+"""
+
+import importlib.util
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from sincpro_py_compiler.infrastructure.interpreter_matrix import (
+    probe_interpreter,
+    resolve_interpreters,
+)
+from sincpro_py_compiler.infrastructure.python_compiler import PythonCompiler
+
+
+class TestInterpreterMatrix:
+    """Tests de la matriz de intérpretes"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.source_dir = self.temp_dir / "src"
+        (self.source_dir / "pkg").mkdir(parents=True)
+        (self.source_dir / "main.py").write_text("from pkg.mod import f\nprint(f())\n")
+        (self.source_dir / "pkg" / "__init__.py").write_text("")
+        (self.source_dir / "pkg" / "mod.py").write_text("def f():\n    return 'ok'\n")
+        (self.source_dir / "pkg" / "roto.py").write_text("def roto(:\n")
+        (self.source_dir / "config.json").write_text("{}")
+        self.tag = sys.implementation.cache_tag
+
+    def teardown_method(self):
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
+    def test_probe_interpreter_actual(self):
+        """Test: el sondeo reporta versión, cache tag y número mágico"""
+        target = probe_interpreter(sys.executable)
+
+        assert target.version == "%d.%d" % sys.version_info[:2]
+        assert target.cache_tag == self.tag
+        assert target.magic == importlib.util.MAGIC_NUMBER.hex()
+
+    def test_probe_interpreter_inexistente(self):
+        """Test: un ejecutable inexistente produce ValueError"""
+        with pytest.raises(ValueError):
+            probe_interpreter(str(self.temp_dir / "no-python"))
+
+    def test_intérpretes_duplicados_se_omiten(self):
+        """Test: dos rutas al mismo intérprete producen un solo destino"""
+        targets = resolve_interpreters([sys.executable, sys.executable])
+
+        assert len(targets) == 1
+
+    def test_compila_en_subdirectorio_por_version(self, caplog):
+        """Test: la salida queda en output/<cache_tag> y es ejecutable"""
+        output_dir = self.temp_dir / "out"
+
+        with caplog.at_level("INFO"):
+            success = PythonCompiler().compile_project(
+                source_dir=str(self.source_dir),
+                output_dir=str(output_dir),
+                jobs=2,
+                python_targets=[sys.executable],
+            )
+
+        assert success
+        target_dir = output_dir / self.tag
+        assert (target_dir / "pkg" / "mod.pyc").exists()
+        assert (target_dir / "config.json").exists()
+        # El archivo con error de sintaxis se copia tal cual
+        assert (target_dir / "pkg" / "roto.py").exists()
+        assert any(
+            "roto.py" in r.getMessage() for r in caplog.records if r.levelname == "ERROR"
+        )
+
+        result = subprocess.run(
+            [sys.executable, "main.pyc"], cwd=target_dir, capture_output=True, text=True
+        )
+        assert result.stdout.strip() == "ok"
+
+    def test_reporte_del_build(self):
+        """Test: el BuildResult y last_build_stats cuentan las salidas de cada destino"""
+        compiler = PythonCompiler()
+
+        result = compiler.compile_project(
+            source_dir=str(self.source_dir),
+            output_dir=str(self.temp_dir / "out"),
+            python_targets=[sys.executable],
+        )
+
+        assert result
+        assert compiler.last_build_stats == {
+            "compiled": 3,
+            "copied": 2,
+            "failed": 0,
+            "excluded": 0,
+            "targets": 1,
+        }
+        assert result.counts == compiler.last_build_stats
+        assert result.files_processed == 5
+        assert result.bytes["compiled"] > 0 and result.bytes_written > 0
+        assert result.failed_files[0].path == f"{self.tag}/pkg/roto.py"
+        assert result.failed_files[0].stage == "compile"
@@ -0,0 +1,235 @@
+"""
+Tests para la derivación de claves: caché, keyring y KDF en el header
+"""
+
+import json
+import shutil
+import stat
+import tempfile
+from base64 import urlsafe_b64encode
+from pathlib import Path
+
+import pytest
+
+from sincpro_py_compiler.infrastructure.encrypted_entries import EntryWriter
+from sincpro_py_compiler.infrastructure.encrypted_stream import ContainerError, read_header
+from sincpro_py_compiler.infrastructure.encryption_service import (
+    CRYPTO_AVAILABLE,
+    SimpleEncryptionService,
+)
+from sincpro_py_compiler.infrastructure.key_derivation import (
+    DEFAULT_KDF,
+    KdfParams,
+    KeyCache,
+    KeyRing,
+    calibrate,
+    derive_key,
+)
+
+pytestmark = pytest.mark.skipif(
+    not CRYPTO_AVAILABLE, reason="cryptography package not available"
+)
+
+FAST_SCRYPT = KdfParams("scrypt", 2**10)
+
+
+class TestKdfParams:
+    """Tests de los parámetros de KDF guardados en el header"""
+
+    @pytest.mark.parametrize("params", [DEFAULT_KDF, KdfParams("scrypt", 2**15, 8, 2)])
+    def test_roundtrip_dict(self, params):
+        assert KdfParams.from_dict(params.to_dict()) == params
+
+    def test_sin_kdf_es_el_formato_original(self):
+        assert KdfParams.from_dict(None) == KdfParams("pbkdf2-sha256", 100_000)
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            {"name": "argon2", "iterations": 3},
+            {"name": "pbkdf2-sha256", "iterations": 10**9},
+            {"name": "scrypt", "n": 1000, "r": 8, "p": 1},
+            {"name": "scrypt", "n": 2**22, "r": 8, "p": 1},
+            {"name": "scrypt", "r": 8},
+        ],
+    )
+    def test_header_invalido(self, data):
+        """Test: KDF desconocido o costo fuera de rango no llega a derivar"""
+        with pytest.raises(ContainerError):
+            KdfParams.from_dict(data)
+
+
+class TestKeyCache:
+    """Tests de KeyCache y KeyRing"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_deriva_una_vez_por_salt(self):
+        cache = KeyCache()
+        key = cache.derive("licencia", b"s" * 16, FAST_SCRYPT)
+
+        assert cache.derive("licencia", b"s" * 16, FAST_SCRYPT) == key
+        assert key == derive_key("licencia", b"s" * 16, FAST_SCRYPT)
+        assert cache.derivations == 1
+        assert cache.derive("otra", b"s" * 16, FAST_SCRYPT) != key
+        assert cache.derive("licencia", b"t" * 16, FAST_SCRYPT) != key
+        assert cache.derivations == 3
+
+    def test_lru(self):
+        cache = KeyCache(max_entries=2)
+        for salt in (b"a" * 16, b"b" * 16, b"c" * 16, b"a" * 16):
+            cache.derive("licencia", salt, FAST_SCRYPT)
+        assert cache.derivations == 4
+
+    def test_keyring_persiste_entre_procesos(self):
+        path = self.temp_dir / "keys" / "keyring.json"
+        key = KeyCache(KeyRing(path)).derive("licencia", b"s" * 16, FAST_SCRYPT)
+
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600
+        assert "licencia" not in path.read_text()
+        restarted = KeyCache(KeyRing(path))
+        assert restarted.derive("licencia", b"s" * 16, FAST_SCRYPT) == key
+        assert restarted.derivations == 0
+
+    def test_keyring_no_acepta_otra_contraseña(self):
+        """Test: una contraseña incorrecta no recibe la clave guardada"""
+        path = self.temp_dir / "keyring.json"
+        key = KeyCache(KeyRing(path)).derive("licencia", b"s" * 16, FAST_SCRYPT)
+
+        restarted = KeyCache(KeyRing(path))
+        assert restarted.derive("otra", b"s" * 16, FAST_SCRYPT) != key
+        assert restarted.derivations == 1
+
+    def test_keyring_reutiliza_el_salt_de_escritura(self):
+        """Test: procesos sucesivos protegen con el mismo salt y la misma entrada"""
+        path = self.temp_dir / "keyring.json"
+        for _ in range(3):
+            cache = KeyCache(KeyRing(path))
+            cache.derive("licencia", cache.writer_salt("licencia", FAST_SCRYPT), FAST_SCRYPT)
+
+        data = json.loads(path.read_text())
+        assert len(data["keys"]) == 1
+        assert len(data["writer_salts"]) == 1
+        restarted = KeyCache(KeyRing(path))
+        salt = restarted.writer_salt("licencia", FAST_SCRYPT)
+        assert restarted.writer_salt("otra", FAST_SCRYPT) != salt
+
+    def test_keyring_acotado(self):
+        path = self.temp_dir / "keyring.json"
+        keyring = KeyRing(path, max_entries=2)
+        for salt in (b"a" * 16, b"b" * 16, b"c" * 16):
+            keyring.put("licencia", salt, FAST_SCRYPT, b"k" * 32)
+
+        assert keyring.get("licencia", b"a" * 16, FAST_SCRYPT) is None
+        assert keyring.get("licencia", b"c" * 16, FAST_SCRYPT) == b"k" * 32
+        assert len(json.loads(path.read_text())["keys"]) == 2
+
+    def test_keyring_version_1_se_descarta(self):
+        """Test: las entradas sin ligar a la contraseña no se usan"""
+        path = self.temp_dir / "keyring.json"
+        salt_id = urlsafe_b64encode(b"s" * 16).decode("utf-8")
+        params_json = json.dumps(FAST_SCRYPT.to_dict(), sort_keys=True)
+        entries = {f"{salt_id}:{params_json}": urlsafe_b64encode(b"k" * 32).decode("utf-8")}
+        path.write_text(json.dumps({"version": 1, "keys": entries}))
+
+        cache = KeyCache(KeyRing(path))
+        assert cache.derive("licencia", b"s" * 16, FAST_SCRYPT) != b"k" * 32
+        assert json.loads(path.read_text())["version"] == 2
+
+    def test_calibrate_pbkdf2(self):
+        params = calibrate("pbkdf2-sha256", 20)
+        assert params.name == "pbkdf2-sha256"
+        assert params.cost >= 1000 and params.cost % 1000 == 0
+
+
+class TestEncryptionServiceKdf:
+    """Tests de SimpleEncryptionService con caché y KDF configurable"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.source_dir = self.temp_dir / "src"
+        self.source_dir.mkdir()
+        (self.source_dir / "main.pyc").write_bytes(b"pyc main")
+        self.cache = KeyCache()
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _header(self, archive: Path) -> dict:
+        with open(archive, "rb") as f:
+            return read_header(f)[0]
+
+    def test_lote_deriva_una_vez(self):
+        """Test: proteger y verificar varios archivos con la misma licencia"""
+        service = SimpleEncryptionService(kdf=FAST_SCRYPT, key_cache=self.cache)
+        archives = [self.temp_dir / f"build_{i}.enc" for i in range(5)]
+        for archive in archives:
+            assert service.encrypt_directory(self.source_dir, archive, "licencia")
+        for archive in archives:
+            assert service.read_member(archive, "licencia", "main.pyc") == b"pyc main"
+
+        assert self.cache.derivations == 1
+        headers = [self._header(archive) for archive in archives]
+        assert len({h["salt"] for h in headers}) == 1
+        assert len({h["key_salt"] for h in headers}) == 5
+        assert headers[0]["kdf"] == FAST_SCRYPT.to_dict()
+
+    def test_kdf_del_header(self):
+        """Test: se abre con el KDF del archivo, no con el del servicio que lee"""
+        archive = self.temp_dir / "build.enc"
+        assert SimpleEncryptionService(kdf=FAST_SCRYPT).encrypt_directory(
+            self.source_dir, archive, "licencia"
+        )
+
+        reader = SimpleEncryptionService(key_cache=self.cache)
+        assert reader.decrypt_file(archive, self.temp_dir / "out", "licencia")
+        assert (self.temp_dir / "out" / "main.pyc").read_bytes() == b"pyc main"
+        assert not reader.decrypt_file(archive, self.temp_dir / "otro", "otra")
+
+    def test_costo_excesivo_en_el_header(self):
+        archive = self.temp_dir / "build.enc"
+        assert SimpleEncryptionService(kdf=FAST_SCRYPT).encrypt_directory(
+            self.source_dir, archive, "licencia"
+        )
+        content = archive.read_bytes().replace(b'"n": 1024', b'"n": 4194304')
+        archive.write_bytes(content)
+
+        service = SimpleEncryptionService(key_cache=self.cache)
+        assert not service.decrypt_file(archive, self.temp_dir / "out", "licencia")
+        assert self.cache.derivations == 0
+
+    def test_keyring_con_contraseña_incorrecta(self):
+        """Test: con --keyring una contraseña incorrecta no abre el archivo"""
+        keyring = self.temp_dir / "keyring.json"
+        archive = self.temp_dir / "build.enc"
+        writer = SimpleEncryptionService(
+            kdf=FAST_SCRYPT, key_cache=KeyCache(KeyRing(keyring))
+        )
+        assert writer.encrypt_directory(self.source_dir, archive, "licencia")
+
+        reader = SimpleEncryptionService(key_cache=KeyCache(KeyRing(keyring)))
+        assert not reader.decrypt_file(archive, self.temp_dir / "otro", "otra")
+        assert not (self.temp_dir / "otro" / "main.pyc").exists()
+        assert reader.decrypt_file(archive, self.temp_dir / "out", "licencia")
+        assert reader.key_cache.derivations == 1
+
+    def test_version_3_sin_kdf(self):
+        """Test: los .enc v3 sin "kdf" ni "key_salt" usan la clave PBKDF2 directa"""
+        salt = b"s" * 16
+        archive = self.temp_dir / "v3.enc"
+        with open(archive, "wb") as f:
+            writer = EntryWriter(
+                f,
+                derive_key("licencia", salt),
+                {"method": "encrypt", "salt": urlsafe_b64encode(salt).decode("utf-8")},
+            )
+            writer.add_bytes("main.pyc", b"pyc main")
+            writer.close()
+
+        service = SimpleEncryptionService(key_cache=self.cache)
+        assert service.read_member(archive, "licencia", "main.pyc") == b"pyc main"
+        assert "kdf" not in self._header(archive)
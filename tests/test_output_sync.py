@@ -0,0 +1,109 @@
+"""
+Tests para la sincronización de la salida al estilo rsync
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from sincpro_py_compiler.infrastructure.output_sync import OutputSync
+from sincpro_py_compiler.infrastructure.python_compiler import PythonCompiler
+
+
+class TestOutputSync:
+    """Tests del modo sync de compile_project"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.source_dir = self.temp_dir / "src"
+        (self.source_dir / "static").mkdir(parents=True)
+        (self.source_dir / "main.py").write_text("print('hola')\n")
+        for i in range(5):
+            (self.source_dir / "static" / f"img_{i}.png").write_bytes(os.urandom(1024))
+        self.output_dir = self.temp_dir / "dist"
+        self.compiler = PythonCompiler()
+
+    def teardown_method(self):
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
+    def _build(self, sync="mtime"):
+        assert self.compiler.compile_project(
+            str(self.source_dir), str(self.output_dir), sync=sync
+        )
+        return self.compiler.last_build_stats
+
+    def test_omite_archivos_idénticos(self):
+        """Test: un segundo build no vuelve a copiar los assets idénticos"""
+        first = self._build()
+        second = self._build()
+
+        assert first["copied"] == 5 and first["synced"] == 0
+        assert second["copied"] == 0 and second["synced"] == 5
+        assert second["compiled"] == 1
+
+    def test_copia_lo_que_cambió(self):
+        """Test: un asset modificado se vuelve a copiar"""
+        self._build()
+        changed = self.source_dir / "static" / "img_0.png"
+        changed.write_bytes(b"nuevo contenido")
+
+        stats = self._build()
+
+        assert stats["copied"] == 1
+        assert (self.output_dir / "static" / "img_0.png").read_bytes() == b"nuevo contenido"
+
+    def test_checksum_detecta_cambios_con_mismo_tamaño_y_mtime(self):
+        """Test: con checksum se compara el contenido, no solo tamaño y mtime"""
+        self._build()
+        destination = self.output_dir / "static" / "img_1.png"
+        stat = destination.stat()
+        destination.write_bytes(os.urandom(1024))
+        os.utime(destination, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        assert self._build("mtime")["copied"] == 0
+        assert self._build("checksum")["copied"] == 1
+        assert (
+            destination.read_bytes()
+            == (self.source_dir / "static" / "img_1.png").read_bytes()
+        )
+
+    def test_elimina_salidas_sin_fuente(self):
+        """Test: se eliminan los archivos de la salida que ya no tienen fuente"""
+        self._build()
+        (self.source_dir / "static" / "img_2.png").unlink()
+        (self.output_dir / "viejo").mkdir()
+        (self.output_dir / "viejo" / "suelto.txt").write_text("")
+
+        stats = self._build()
+
+        assert stats["pruned"] == 2
+        assert not (self.output_dir / "static" / "img_2.png").exists()
+        assert not (self.output_dir / "viejo").exists()
+        assert (self.output_dir / "main.pyc").exists()
+
+    def test_incremental_y_sync_no_escriben_nada(self):
+        """Test: combinado con --incremental un build sin cambios no escribe"""
+        assert self.compiler.compile_project(
+            str(self.source_dir), str(self.output_dir), incremental=True, sync="mtime"
+        )
+        assert self.compiler.compile_project(
+            str(self.source_dir), str(self.output_dir), incremental=True, sync="mtime"
+        )
+
+        stats = self.compiler.last_build_stats
+        assert stats["compiled"] == stats["copied"] == stats["pruned"] == 0
+        assert stats["unchanged"] == 6
+
+    def test_is_synced_compara_tamaño(self):
+        """Test: un destino con otro tamaño no está sincronizado"""
+        source = self.source_dir / "static" / "img_3.png"
+        destination = self.temp_dir / "copia.png"
+        shutil.copy2(source, destination)
+        sync = OutputSync(self.temp_dir, "mtime")
+
+        assert sync.is_synced(source, destination)
+        destination.write_bytes(b"x")
+        assert not sync.is_synced(source, destination)
+        assert not sync.is_synced(source, self.temp_dir / "no_existe.png")
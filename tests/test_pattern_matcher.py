@@ -0,0 +1,147 @@
+"""
+Tests para el matcher precompilado de patrones
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from sincpro_py_compiler.infrastructure.compiler_service import CompilerService
+from sincpro_py_compiler.infrastructure.pattern_matcher import PatternMatcher
+from sincpro_py_compiler.infrastructure.python_compiler import PythonCompiler
+
+
+class TestPatternMatcher:
+    """Tests de las formas de patrón soportadas"""
+
+    @pytest.mark.parametrize(
+        "patterns, path, is_dir, expected",
+        [
+            (["*.pyc"], "pkg/mod.pyc", False, True),
+            (["*.pyc"], "pkg/mod.py", False, False),
+            (["*.gz"], "datos/backup.tar.gz", False, True),
+            ([".DS_Store"], "a/b/.DS_Store", False, True),
+            (["venv/"], "venv/lib/site.py", False, True),
+            (["venv/"], "app/venv", True, True),
+            (["venv/"], "app/venv", False, False),  # Archivo llamado venv
+            (["venv/"], "app/myvenv/x.py", False, False),
+            (["app/static/"], "app/static/logo.png", False, True),
+            (["app/static/"], "otro/static/logo.png", False, False),
+            (["config/secret.py"], "config/secret.py", False, True),
+            (["config/secret.py"], "src/config/secret.py", False, False),  # Anclado
+            (["**/config/secret.py"], "src/config/secret.py", False, True),
+            (["**/config/secret.py"], "src/myconfig/secret.py", False, False),
+            (["/build"], "build/x.py", False, True),
+            (["/build"], "app/build/x.py", False, False),
+            (["**/tests/"], "a/b/tests/test_x.py", False, True),
+            (["**/tests/"], "tests/test_x.py", False, True),
+            (["a/**/b.py"], "a/b.py", False, True),
+            (["a/**/b.py"], "a/x/y/b.py", False, True),
+            (["logs/**"], "logs/2024/x.log", False, True),
+            (["logs/**"], "logs", True, False),
+            (["*.py", "!keep.py"], "pkg/keep.py", False, False),
+            (["*.py", "!keep.py"], "pkg/other.py", False, True),
+            (["!keep.py", "*.py"], "pkg/keep.py", False, True),  # Gana la última
+            (["dist/", "!dist/keep.py"], "dist/keep.py", False, True),  # Padre excluido
+            (["\\!importante.txt"], "!importante.txt", False, True),
+            (["test_*.py"], "tests/test_algo.py", False, True),
+            (["test_*.py"], "tests/algo_test.py", False, False),
+            (["build*/"], "build-x86/lib.py", False, True),
+            (["mod_?.py"], "pkg/mod_1.py", False, True),
+            (["mod_[!0].py"], "pkg/mod_0.py", False, False),
+        ],
+    )
+    def test_formas_de_patrón(self, patterns, path, is_dir, expected):
+        """Test: cada forma de patrón sigue la semántica de .gitignore"""
+        assert PatternMatcher(patterns).matches(path, is_dir) is expected
+
+    def test_ruta_relativa_evita_falsos_positivos_en_padres(self):
+        """Test: un directorio padre fuera del proyecto no dispara exclusiones"""
+        service = CompilerService()
+        root = Path("/home/x/env/proyecto")
+
+        assert not service.should_exclude(root / "main.py", ["env/"], root=root)
+        assert service.should_exclude(root / "env" / "main.py", ["env/"], root=root)
+
+    def test_se_comporta_como_colección(self):
+        """Test: el matcher conserva sus patrones (conteos y manifiestos)"""
+        matcher = PatternMatcher(["*.log", "tmp/"])
+
+        assert len(matcher) == 2
+        assert list(matcher) == ["*.log", "tmp/"]
+
+    def test_muchas_reglas_se_combinan_en_una_regex(self):
+        """Test: las reglas con comodines comparten una sola expresión compilada"""
+        patterns = [f"modulo_{i}/**/datos_*.json" for i in range(300)] + ["!modulo_7/**"]
+        matcher = PatternMatcher(patterns)
+
+        assert matcher.matches("modulo_250/x/datos_1.json")
+        assert not matcher.matches("modulo_7/datos_1.json")
+        assert len(matcher._buckets) == 300
+
+
+class TestPatternMatcherBuild:
+    """Tests de las reglas de patrones dentro de un build completo"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def teardown_method(self):
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
+    def test_proyecto_dentro_de_directorio_excluible(self):
+        """Test: un proyecto ubicado bajo .../env/ se compila normalmente"""
+        source_dir = self.temp_dir / "env" / "proyecto"
+        source_dir.mkdir(parents=True)
+        (source_dir / "main.py").write_text("print('hola')\n")
+        output_dir = self.temp_dir / "out"
+
+        assert PythonCompiler().compile_project(str(source_dir), str(output_dir))
+        assert (output_dir / "main.pyc").exists()
+
+    def test_directorio_de_copia_fiel_no_se_poda(self):
+        """Test: la copia fiel tiene prioridad sobre un directorio excluido"""
+        source_dir = self.temp_dir / "src"
+        (source_dir / "static").mkdir(parents=True)
+        (source_dir / "migrations").mkdir()
+        (source_dir / "static" / "app.js").write_text("")
+        (source_dir / "migrations" / "0001.py").write_text("")
+        output_dir = self.temp_dir / "out"
+
+        compiler = PythonCompiler()
+        assert compiler.compile_project(
+            str(source_dir),
+            str(output_dir),
+            template="django",
+            copy_faithful_file="static/",
+        )
+
+        assert (output_dir / "static" / "app.js").exists()
+        assert not (output_dir / "migrations").exists()
+
+    def test_reglas_por_directorio(self):
+        """Test: cada .sincpro_exclude aplica a su directorio y tiene prioridad"""
+        source_dir = self.temp_dir / "src"
+        (source_dir / "app" / "fixtures").mkdir(parents=True)
+        (source_dir / "lib").mkdir()
+        (source_dir / ".sincpro_exclude").write_text("*.txt\n")
+        (source_dir / "app" / ".sincpro_exclude").write_text("/fixtures/\n!leeme.txt\n")
+        (source_dir / "app" / "leeme.txt").write_text("")
+        (source_dir / "app" / "fixtures" / "datos.py").write_text("")
+        (source_dir / "app" / "main.py").write_text("")
+        (source_dir / "lib" / "leeme.txt").write_text("")
+        (source_dir / "lib" / "fixtures").mkdir()
+        (source_dir / "lib" / "fixtures" / "datos.py").write_text("")
+        output_dir = self.temp_dir / "out"
+
+        assert PythonCompiler().compile_project(str(source_dir), str(output_dir))
+
+        assert (output_dir / "app" / "main.pyc").exists()
+        assert (output_dir / "app" / "leeme.txt").exists()
+        assert not (output_dir / "app" / "fixtures").exists()
+        assert not (output_dir / "lib" / "leeme.txt").exists()
+        assert (output_dir / "lib" / "fixtures" / "datos.pyc").exists()
+        assert not list(output_dir.rglob(".sincpro_exclude"))
@@ -414,3 +414,47 @@ COPY_FAITHFUL_PATTERNS = [
         assert (output_dir / "assets" / "file.txt").read_text() == "contenido asset"
         # Verificar que el archivo Python fue compilado
         assert (output_dir / "main.pyc").exists()
+
+    def test_compilacion_paralela_mismo_resultado_que_serial(self):
+        """Test: --jobs produce la misma salida y contadores que la compilación serial"""
+        for i in range(12):
+            pkg = self.temp_dir / "src" / f"pkg{i % 3}"
+            pkg.mkdir(parents=True, exist_ok=True)
+            (pkg / f"mod{i}.py").write_text(f"VALUE = {i}")
+            (pkg / f"data{i}.txt").write_text(f"data {i}")
+        (self.temp_dir / "src" / "roto.py").write_text("def roto(:\n")
+
+        serial_dir = self.temp_dir / "serial"
+        parallel_dir = self.temp_dir / "parallel"
+        assert self.compiler.compile_project(
+            source_dir=str(self.temp_dir / "src"), output_dir=str(serial_dir)
+        )
+        assert self.compiler.compile_project(
+            source_dir=str(self.temp_dir / "src"), output_dir=str(parallel_dir), jobs=2
+        )
+
+        def listado(directorio):
+            return sorted(str(p.relative_to(directorio)) for p in directorio.rglob("*"))
+
+        assert listado(serial_dir) == listado(parallel_dir)
+        assert (parallel_dir / "pkg0" / "mod0.pyc").exists()
+        # El archivo con error de sintaxis se copia tal cual
+        assert (parallel_dir / "roto.py").exists()
+
+    def test_compilacion_paralela_reporta_errores(self, caplog):
+        """Test: los errores de los workers se reportan en el proceso principal"""
+        (self.temp_dir / "a_roto.py").write_text("def roto(:\n")
+        (self.temp_dir / "b_ok.py").write_text("OK = True")
+
+        with caplog.at_level("INFO"):
+            success = self.compiler.compile_project(
+                source_dir=str(self.temp_dir),
+                output_dir=str(self.temp_dir / "out"),
+                jobs=2,
+            )
+
+        assert success
+        errores = [r.getMessage() for r in caplog.records if r.levelname == "ERROR"]
+        assert any("a_roto.py" in mensaje for mensaje in errores)
+        assert any("Archivos compilados: 1" in r.getMessage() for r in caplog.records)
+        assert any("Archivos copiados: 1" in r.getMessage() for r in caplog.records)
@@ -0,0 +1,124 @@
+"""
+Tests para el build en staging con journal reanudable
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from sincpro_py_compiler.infrastructure.python_compiler import PythonCompiler
+from sincpro_py_compiler.infrastructure.staged_output import StagedOutput
+
+
+class TestStagedOutput:
+    """Tests de compile_project(staged=True)"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.source_dir = self.temp_dir / "src"
+        (self.source_dir / "pkg").mkdir(parents=True)
+        for i in range(6):
+            (self.source_dir / "pkg" / f"mod_{i}.py").write_text(f"VALOR = {i}\n")
+        (self.source_dir / "datos.json").write_text("{}")
+        self.output_dir = self.temp_dir / "dist"
+        self.staged = StagedOutput(self.output_dir)
+        self.compiler = PythonCompiler()
+
+    def teardown_method(self):
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
+    def _build(self):
+        return self.compiler.compile_project(
+            str(self.source_dir), str(self.output_dir), staged=True
+        )
+
+    def _interrupted_build(self):
+        """Build que muere justo antes de publicar"""
+        with patch.object(StagedOutput, "commit", side_effect=MemoryError):
+            assert not self._build()
+
+    def test_publica_y_limpia(self):
+        """Test: al terminar solo queda la salida, sin staging ni journal"""
+        assert self._build()
+
+        assert (self.output_dir / "pkg" / "mod_0.pyc").exists()
+        assert (self.output_dir / "datos.json").exists()
+        assert not self.staged.staging_dir.exists()
+        assert not self.staged.journal_path.exists()
+
+    def test_interrupción_no_toca_la_salida_publicada(self):
+        """Test: un build interrumpido deja intacta la salida anterior"""
+        assert self._build()
+        (self.source_dir / "nuevo.py").write_text("")
+
+        self._interrupted_build()
+
+        assert not (self.output_dir / "nuevo.pyc").exists()
+        assert (self.staged.staging_dir / "nuevo.pyc").exists()
+
+    def test_reanuda_desde_el_journal(self):
+        """Test: el build siguiente no rehace lo que ya terminó"""
+        self._interrupted_build()
+
+        assert self._build()
+
+        stats = self.compiler.last_build_stats
+        assert stats["resumed"] == 7
+        assert stats["compiled"] == stats["copied"] == 0
+        assert (self.output_dir / "pkg" / "mod_5.pyc").exists()
+
+    def test_journal_cortado_a_la_mitad(self):
+        """Test: una línea incompleta del journal se ignora y el resto se reanuda"""
+        self._interrupted_build()
+        lines = self.staged.journal_path.read_text().splitlines()
+        self.staged.journal_path.write_text("\n".join(lines[:3]) + "\n" + lines[3][:10])
+
+        assert self._build()
+
+        stats = self.compiler.last_build_stats
+        assert stats["resumed"] == 2
+        assert stats["compiled"] + stats["copied"] == 5
+
+    def test_fuente_modificada_se_rehace(self):
+        """Test: una fuente que cambió desde la interrupción se vuelve a compilar"""
+        self._interrupted_build()
+        (self.source_dir / "pkg" / "mod_0.py").write_text("VALOR = 'cambiado'\n")
+
+        assert self._build()
+
+        assert self.compiler.last_build_stats["compiled"] == 1
+
+    def test_otra_configuración_empieza_de_cero(self):
+        """Test: un staging de otro template se descarta"""
+        self._interrupted_build()
+
+        assert self.compiler.compile_project(
+            str(self.source_dir), str(self.output_dir), template="django", staged=True
+        )
+
+        assert self.compiler.last_build_stats["resumed"] == 0
+
+    def test_reemplaza_la_salida_anterior(self):
+        """Test: la publicación reemplaza el árbol anterior completo"""
+        self.output_dir.mkdir()
+        (self.output_dir / "viejo.txt").write_text("")
+
+        assert self._build()
+
+        assert not (self.output_dir / "viejo.txt").exists()
+        assert (self.output_dir / "pkg" / "mod_1.pyc").exists()
+
+    @pytest.mark.parametrize(
+        "option", [{"incremental": True}, {"sync": "mtime"}, {"python_targets": ["python3"]}]
+    )
+    def test_rechaza_opciones_de_build_parcial(self, option):
+        """Test: staged no reescribe en silencio las opciones incompatibles"""
+        with pytest.raises(ValueError, match="staging"):
+            self.compiler.compile_project(
+                str(self.source_dir), str(self.output_dir), staged=True, **option
+            )
+        assert not self.output_dir.exists()
@@ -0,0 +1,115 @@
+"""
+Tests para el recorrido de directorios basado en scandir
+"""
+
+import os
+import shutil
+import tempfile
+import types
+from pathlib import Path
+
+from sincpro_py_compiler.infrastructure.python_compiler import PythonCompiler
+from sincpro_py_compiler.infrastructure.tree_walker import iter_files
+
+
+class TestTreeWalker:
+    """Tests del generador iter_files"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        for relative in ["b.py", "a.txt", "pkg/z.py", "pkg/sub/m.py", "otro/x.py"]:
+            path = self.temp_dir / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("")
+
+    def teardown_method(self):
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
+    def _os_walk_order(self):
+        result = []
+        for root, dirs, files in os.walk(self.temp_dir):
+            dirs.sort()
+            relative_root = Path(root).relative_to(self.temp_dir).as_posix()
+            for name in sorted(files):
+                result.append(name if relative_root == "." else f"{relative_root}/{name}")
+        return result
+
+    def test_orden_igual_a_os_walk_ordenado(self):
+        """Test: el orden es determinista y coincide con os.walk ordenado"""
+        relative = [entry.relative_path for entry in iter_files(self.temp_dir)]
+
+        assert relative == self._os_walk_order()
+        assert relative[:2] == ["a.txt", "b.py"]
+
+    def test_es_un_generador(self):
+        """Test: los archivos se entregan de forma incremental"""
+        walker = iter_files(self.temp_dir)
+
+        assert isinstance(walker, types.GeneratorType)
+        assert next(walker).relative_path == "a.txt"
+
+    def test_poda_directorios(self):
+        """Test: un directorio rechazado por el filtro no se recorre"""
+        visited = []
+
+        def dir_filter(directory):
+            visited.append(directory.relative_path)
+            return directory.name != "pkg"
+
+        relative = [entry.relative_path for entry in iter_files(self.temp_dir, dir_filter)]
+
+        assert relative == ["a.txt", "b.py", "otro/x.py"]
+        assert "pkg/sub" not in visited
+
+    def test_no_sigue_enlaces_a_directorios(self):
+        """Test: los enlaces simbólicos a directorios no se recorren"""
+        (self.temp_dir / "enlace").symlink_to(self.temp_dir / "pkg", target_is_directory=True)
+
+        relative = [entry.relative_path for entry in iter_files(self.temp_dir)]
+
+        assert not any(path.startswith("enlace/") for path in relative)
+
+    def test_stat_cacheado(self):
+        """Test: cada entrada expone su ruta completa y su stat"""
+        entry = next(iter_files(self.temp_dir))
+
+        assert entry.path == str(self.temp_dir / "a.txt")
+        assert entry.stat().st_size == 0
+
+    def test_con_hilos_mantiene_el_orden(self):
+        """Test: el recorrido con hilos entrega lo mismo y en el mismo orden"""
+        for i in range(20):
+            (self.temp_dir / "pkg" / f"d{i}" / "e").mkdir(parents=True)
+            (self.temp_dir / "pkg" / f"d{i}" / "e" / "f.py").write_text("")
+
+        serial = [entry.relative_path for entry in iter_files(self.temp_dir)]
+        threaded = [entry.relative_path for entry in iter_files(self.temp_dir, threads=8)]
+
+        assert threaded == serial
+
+    def test_con_hilos_poda_directorios(self):
+        """Test: el filtro también poda en el recorrido con hilos"""
+        walker = iter_files(self.temp_dir, lambda d: d.name != "sub", threads=4)
+
+        relative = [entry.relative_path for entry in walker]
+
+        assert relative == ["a.txt", "b.py", "otro/x.py", "pkg/z.py"]
+
+    def test_compile_project_con_hilos_de_recorrido(self):
+        """Test: compile_project produce la misma salida con walk_threads"""
+        (self.temp_dir / "venv").mkdir()
+        (self.temp_dir / "venv" / "site.py").write_text("")
+        output_dir = self.temp_dir.parent / (self.temp_dir.name + "_out")
+
+        try:
+            assert PythonCompiler().compile_project(
+                str(self.temp_dir), str(output_dir), walk_threads=4
+            )
+            produced = sorted(
+                p.relative_to(output_dir).as_posix() for p in output_dir.rglob("*.*")
+            )
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+        assert produced == ["a.txt", "b.pyc", "otro/x.pyc", "pkg/sub/m.pyc", "pkg/z.pyc"]
@@ -0,0 +1,92 @@
+"""
+Tests para el modo observación (--watch)
+"""
+
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from sincpro_py_compiler.infrastructure.python_compiler import PythonCompiler
+
+
+def wait_until(condition, timeout: float = 5.0) -> bool:
+    """Espera a que se cumpla una condición"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+@pytest.mark.parametrize("polling", [False, True], ids=["inotify", "sondeo"])
+class TestWatchMode:
+    """Tests de PythonCompiler.watch_project"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.source_dir = self.temp_dir / "addon"
+        self.output_dir = self.temp_dir / "out"
+        (self.source_dir / "models").mkdir(parents=True)
+        (self.source_dir / "models" / "partner.py").write_text("class Partner: pass\n")
+        (self.source_dir / "__manifest__.py").write_text("{'name': 'Addon'}\n")
+        self.stop = threading.Event()
+        self.thread = None
+
+    def teardown_method(self):
+        self.stop.set()
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
+    def start(self, polling: bool) -> None:
+        compiler = PythonCompiler()
+        self.thread = threading.Thread(
+            target=compiler.watch_project,
+            kwargs=dict(
+                source_dir=str(self.source_dir),
+                output_dir=str(self.output_dir),
+                template="odoo",
+                polling=polling,
+                poll_interval=0.1,
+                stop_event=self.stop,
+            ),
+            daemon=True,
+        )
+        self.thread.start()
+        assert wait_until(lambda: (self.output_dir / "models" / "partner.pyc").exists())
+        time.sleep(0.2)  # Dar tiempo a que el watcher quede activo
+
+    def test_archivo_nuevo_se_compila(self, polling):
+        """Test: un módulo nuevo aparece compilado en la salida"""
+        self.start(polling)
+        (self.source_dir / "models" / "sale.py").write_text("class Sale: pass\n")
+
+        assert wait_until(lambda: (self.output_dir / "models" / "sale.pyc").exists())
+
+    def test_archivo_eliminado_borra_salida(self, polling):
+        """Test: borrar una fuente elimina su .pyc"""
+        self.start(polling)
+        (self.source_dir / "models" / "partner.py").unlink()
+
+        assert wait_until(lambda: not (self.output_dir / "models" / "partner.pyc").exists())
+
+    def test_respeta_copia_fiel_y_exclusiones(self, polling):
+        """Test: las reglas del template se aplican a los cambios"""
+        self.start(polling)
+        (self.source_dir / "__manifest__.py").write_text("{'name': 'Addon v2'}\n")
+        (self.source_dir / "debug.log").write_text("log")
+        static = self.source_dir / "static"
+        static.mkdir()
+        (static / "app.js").write_text("console.log(1)")
+
+        manifest = self.output_dir / "__manifest__.py"
+        assert wait_until(lambda: manifest.read_text() == "{'name': 'Addon v2'}\n")
+        assert wait_until(lambda: (self.output_dir / "static" / "app.js").exists())
+        assert not (self.output_dir / "__manifest__.pyc").exists()
+        assert not (self.output_dir / "debug.log").exists()